@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor único de análise: um parse do output do analyzer alimenta vários relatórios.
+
+Substitui a família analyze*.py (cada um com seu regex e suas próprias
+contagens). O output é lido uma vez, em streaming, pelo AnalyzerParser; o
+AnalysisModel acumula os agregados e cada sink (console, JSON, markdown,
+CSV) escreve seu relatório a partir desse mesmo modelo.
+
+Uso:
+    python analysis_engine.py analyze_v3.txt
+    python analysis_engine.py analyze_v3.txt --json RELATORIO_ISSUES_DETALHADO.json \\
+        --markdown RELATORIO_ISSUES_DETALHADO.md --csv issues.csv --top 15
+"""
+
+import csv
+import json
+import argparse
+from datetime import datetime
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from fix_flutter_issues import (
+    AnalyzerParser, DartIssue, FileStats, IssueType, open_analyzer_output, normalize_path
+)
+
+
+class AnalysisModel:
+    """Agregados de um snapshot, preenchidos issue a issue em uma passada."""
+
+    def __init__(self, parser: AnalyzerParser, source: str = ''):
+        self.parser = parser
+        self.source = source
+        # Extras que o parser não mantém: tipo por regra e exemplo por regra
+        self.rule_type_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.rule_examples: Dict[str, DartIssue] = {}
+
+    def add(self, issue: DartIssue):
+        self.rule_type_counts[issue.rule][issue.issue_type] += 1
+        self.rule_examples.setdefault(issue.rule, issue)
+
+    @property
+    def summary(self) -> Dict:
+        return self.parser.get_summary()
+
+    @property
+    def total(self) -> int:
+        return self.parser.total_issues
+
+    def percent(self, count: int) -> float:
+        return count / self.total * 100 if self.total else 0.0
+
+    def top_files(self, limit: int) -> List[Tuple[str, FileStats]]:
+        return sorted(self.parser.stats.items(),
+                      key=lambda item: item[1].total_issues, reverse=True)[:limit]
+
+    def top_rules(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self.parser.rule_counts.most_common(limit)
+
+    def top_directories(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return self.parser.directory_counts.most_common(limit)
+
+    def top_rules_in_file(self, file_path: str, limit: int = 5) -> List[Tuple[str, int]]:
+        return self.parser.rule_counts_by_file[file_path].most_common(limit)
+
+
+# ==================== SINKS ====================
+
+class ReportSink:
+    """Destino de relatório. on_issue recebe cada issue; finish, o modelo pronto."""
+
+    def on_issue(self, issue: DartIssue):
+        pass
+
+    def finish(self, model: AnalysisModel):
+        pass
+
+
+class ConsoleSink(ReportSink):
+    """Top-N arquivos, padrões e diretórios no terminal."""
+
+    def __init__(self, top: int = 15):
+        self.top = top
+
+    def finish(self, model: AnalysisModel):
+        summary = model.summary
+        print(f"Total issues encontrados: {summary['total']}")
+        print(f"Errors: {summary['errors']} | Warnings: {summary['warnings']} | Infos: {summary['infos']}")
+        if not model.total:
+            return
+
+        print(f"\nTOP {self.top} ARQUIVOS COM MAIS ISSUES:")
+        for idx, (file_path, stats) in enumerate(model.top_files(self.top), 1):
+            print(f"{idx:2}. [{stats.total_issues:3} issues] E{stats.errors:3} W{stats.warnings:3} "
+                  f"I{stats.infos:3} - {normalize_path(file_path)[-75:]}")
+
+        print(f"\nTOP {self.top} PADRÕES MAIS FREQUENTES:")
+        for idx, (rule, count) in enumerate(model.top_rules(self.top), 1):
+            print(f"{idx:2}. [{count:4}] {model.percent(count):5.1f}% - {rule}")
+
+        print("\nDIRETÓRIOS COM MAIS ISSUES:")
+        for idx, (directory, count) in enumerate(model.top_directories(10), 1):
+            print(f"{idx:2}. [{count:4}] {model.percent(count):5.1f}% - {directory}")
+
+
+class JsonReportSink(ReportSink):
+    """Relatório no formato do RELATORIO_ISSUES_DETALHADO.json."""
+
+    def __init__(self, path: str, top: int = 15):
+        self.path = path
+        self.top = top
+
+    def build(self, model: AnalysisModel) -> Dict:
+        summary = model.summary
+        top_rules = model.top_rules(self.top)
+        top_dirs = model.top_directories()
+
+        def short(file_path: str) -> str:
+            return normalize_path(file_path).replace('lib/', '', 1)
+
+        recommendations = [
+            f"CRÍTICO: {summary['errors']} erros impedem compilação "
+            f"({model.percent(summary['errors']):.1f}% de {summary['total']})",
+            f"MEDIUM: {summary['warnings']} warnings degradam qualidade "
+            f"({model.percent(summary['warnings']):.1f}%)",
+            f"LOW: {summary['infos']} infos sobre deprecações/boas práticas "
+            f"({model.percent(summary['infos']):.1f}%)",
+            "",
+            "CONCENTRAÇÃO GEOGRÁFICA:",
+        ]
+        recommendations += [
+            f"  {directory} com {count} issues ({model.percent(count):.1f}%)"
+            for directory, count in top_dirs[:3]
+        ]
+        recommendations += ["", "PADRÕES CRÍTICOS DETECTADOS:"]
+        recommendations += [
+            f"  {idx}. '{rule}' = {count} ({model.percent(count):.1f}%)"
+            for idx, (rule, count) in enumerate(top_rules[:3], 1)
+        ]
+        recommendations += [
+            "",
+            "AÇÕES IMEDIATAS (Ordem de Impacto):",
+            "  1. TIPAGEM: 'argument_type_not_assignable' → Converter dynamic em tipos específicos",
+            "  2. UNDEFINED: Resolver undefined_identifier em widgets → Check imports & scope",
+            "  3. ENCODING: Caracteres especiais em nomes → UTF-8 validation",
+            "  4. CONST: const_eval_method_invocation → Late init ou refactoring",
+            "  5. IMPORTS: Circular dependencies → Restructure arquitetura",
+            "",
+            "PLANO DE LONGO PRAZO:",
+            "  • Implementar Riverpod/Provider com type-safety",
+            "  • Adicionar strict linting rules (analysis_options.yaml)",
+            "  • Refatorar models com freezed/json_serializable",
+            "  • Code generation para eliminar boilerplate",
+            "  • Testes unitários para type safety",
+            "  • CI/CD com análise automática antes do merge",
+        ]
+
+        return {
+            'resumoGeral': {
+                'totalIssues': summary['total'],
+                'errors': summary['errors'],
+                'warnings': summary['warnings'],
+                'info': summary['infos'],
+                'percentualErrors': f"{model.percent(summary['errors']):.1f}%",
+                'percentualWarnings': f"{model.percent(summary['warnings']):.1f}%",
+                'percentualInfo': f"{model.percent(summary['infos']):.1f}%",
+            },
+            f'top{self.top}ArquivosComIssues': [
+                {
+                    'arquivo': short(file_path),
+                    'totalIssues': stats.total_issues,
+                    'distribuicao': {
+                        'errors': stats.errors,
+                        'warnings': stats.warnings,
+                        'infos': stats.infos,
+                    },
+                    'topCodigos': [
+                        {'codigo': rule, 'ocorrencias': count}
+                        for rule, count in model.top_rules_in_file(file_path)
+                    ],
+                }
+                for file_path, stats in model.top_files(self.top)
+            ],
+            'padroesMaisComuns': [
+                {
+                    'padrao': rule,
+                    'totalOcorrencias': count,
+                    'percentual': f"{model.percent(count):.1f}%",
+                    'distribuicao': {
+                        'errors': model.rule_type_counts[rule][IssueType.ERROR],
+                        'warnings': model.rule_type_counts[rule][IssueType.WARNING],
+                        'infos': model.rule_type_counts[rule][IssueType.INFO],
+                    },
+                    'exemplo': (f"  {short(model.rule_examples[rule].file_path)}:"
+                                f"{model.rule_examples[rule].line}:{model.rule_examples[rule].column}"
+                                f" | {model.rule_examples[rule].message[:70]}"),
+                }
+                for rule, count in top_rules
+            ],
+            'diretoriosComMaisIssues': [
+                {
+                    'diretorio': directory,
+                    'totalIssues': count,
+                    'percentual': f"{model.percent(count):.1f}%",
+                }
+                for directory, count in top_dirs
+            ],
+            'recomendacoes': recommendations,
+        }
+
+    def finish(self, model: AnalysisModel):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.build(model), f, ensure_ascii=False, indent=2)
+        print(f"JSON: {self.path}")
+
+
+class MarkdownSink(ReportSink):
+    """Resumo em markdown (antigo RELATORIO_ISSUES_DETALHADO.md)."""
+
+    def __init__(self, path: str, top: int = 15):
+        self.path = path
+        self.top = top
+
+    def finish(self, model: AnalysisModel):
+        summary = model.summary
+        lines = [
+            "# Relatório Detalhado de Issues - Flutter Project",
+            "",
+            f"**Data**: {datetime.now().strftime('%Y-%m-%d')}  ",
+            f"**Origem**: {model.source}  ",
+            f"**Total de Issues**: {summary['total']}",
+            "",
+            "## Resumo Geral",
+            "",
+            "| Métrica | Valor | Percentual |",
+            "|---------|-------|-----------|",
+            f"| **Total de Issues** | {summary['total']} | 100% |",
+            f"| **Erros** | {summary['errors']} | {model.percent(summary['errors']):.1f}% |",
+            f"| **Warnings** | {summary['warnings']} | {model.percent(summary['warnings']):.1f}% |",
+            f"| **Infos** | {summary['infos']} | {model.percent(summary['infos']):.1f}% |",
+            "",
+            f"## Top {self.top} Arquivos com Mais Issues",
+            "",
+        ]
+        for idx, (file_path, stats) in enumerate(model.top_files(self.top), 1):
+            lines.append(f"{idx}. **{normalize_path(file_path)}** - {stats.total_issues} issues")
+            lines.append(f"   - Errors: {stats.errors} | Warnings: {stats.warnings} | Infos: {stats.infos}")
+
+        lines += ["", "## Padrões Mais Frequentes", ""]
+        for idx, (rule, count) in enumerate(model.top_rules(self.top), 1):
+            lines.append(f"{idx}. **{rule}** - {count} ocorrências ({model.percent(count):.1f}%)")
+
+        lines += ["", "## Distribuição por Diretório", ""]
+        for idx, (directory, count) in enumerate(model.top_directories(10), 1):
+            bar = "█" * int(model.percent(count) / 5)
+            lines.append(f"{idx}. `{directory}` - {count} issues ({model.percent(count):.1f}%) {bar}")
+
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        print(f"MD: {self.path}")
+
+
+class CsvSink(ReportSink):
+    """Um issue por linha, gravado à medida que é parseado."""
+
+    FIELDS = ['severity', 'rule', 'file', 'line', 'column', 'message']
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.FIELDS)
+
+    def on_issue(self, issue: DartIssue):
+        self._writer.writerow([issue.issue_type.value, issue.rule, normalize_path(issue.file_path),
+                               issue.line, issue.column, issue.message])
+
+    def finish(self, model: AnalysisModel):
+        self._file.close()
+        print(f"CSV: {self.path}")
+
+
+# ==================== ENGINE ====================
+
+class AnalysisEngine:
+    """Faz um único parse e distribui issues e modelo final para os sinks."""
+
+    def __init__(self, sinks: List[ReportSink], output_format: str = 'auto'):
+        self.sinks = sinks
+        self.output_format = output_format
+
+    def run(self, file_path: str) -> AnalysisModel:
+        parser = AnalyzerParser(self.output_format)
+        model = AnalysisModel(parser, source=file_path)
+
+        # keep=False: os agregados bastam, issues não ficam em memória
+        with open_analyzer_output(file_path) as f:
+            for issue in parser.parse_stream(f, keep=False):
+                model.add(issue)
+                for sink in self.sinks:
+                    sink.on_issue(issue)
+
+        for sink in self.sinks:
+            sink.finish(model)
+        return model
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Relatórios de issues a partir de um único parse')
+    parser.add_argument('analyze_file', help='Arquivo com output do analyzer')
+    parser.add_argument('--format', choices=AnalyzerParser.OUTPUT_FORMATS, default='auto')
+    parser.add_argument('--top', type=int, default=15, help='Tamanho dos rankings (default: 15)')
+    parser.add_argument('--json', help='Grava relatório JSON (formato RELATORIO_ISSUES_DETALHADO)')
+    parser.add_argument('--markdown', help='Grava relatório markdown')
+    parser.add_argument('--csv', help='Grava CSV com um issue por linha')
+    parser.add_argument('--quiet', action='store_true', help='Não imprime o resumo no console')
+    args = parser.parse_args(argv)
+
+    sinks: List[ReportSink] = []
+    if not args.quiet:
+        sinks.append(ConsoleSink(args.top))
+    if args.json:
+        sinks.append(JsonReportSink(args.json, args.top))
+    if args.markdown:
+        sinks.append(MarkdownSink(args.markdown, args.top))
+    if args.csv:
+        sinks.append(CsvSink(args.csv))
+
+    return AnalysisEngine(sinks, args.format).run(args.analyze_file)
+
+
+if __name__ == '__main__':
+    main()
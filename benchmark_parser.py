@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark do AnalyzerParser._parse_line nos snapshots analyze_*.txt.
+
+Compara o parse antigo (três PATTERNS tentados em sequência) com o regex
+combinado + pré-checagem de prefixo, e confere que os campos são idênticos.
+
+Uso:
+    python benchmark_parser.py
+    python benchmark_parser.py analyze_v3.txt full_analyze.txt --repeat 5
+"""
+
+import sys
+import glob
+import time
+import argparse
+
+from fix_flutter_issues import (
+    AnalyzerParser, DartIssue, IssueType, IssueSeverity, read_analyzer_output
+)
+
+
+def legacy_parse_line(line):
+    """Parse antigo: tenta cada pattern da lista até um casar."""
+    for pattern in AnalyzerParser.PATTERNS:
+        match = pattern.match(line)
+        if match:
+            issue_type_str, message, file_path, line_num, col, rule = match.groups()
+            try:
+                issue_type = IssueType(issue_type_str.lower())
+            except ValueError:
+                issue_type = IssueType.INFO
+            return DartIssue(
+                issue_type=issue_type,
+                message=message.strip(),
+                file_path=file_path.strip(),
+                line=int(line_num),
+                column=int(col),
+                rule=rule.strip(),
+                raw_line=line,
+                severity=AnalyzerParser.SEVERITY_MAP.get(rule, IssueSeverity.MEDIUM)
+            )
+    return None
+
+
+def fields(issue):
+    if issue is None:
+        return None
+    return (issue.issue_type, issue.message, issue.file_path,
+            issue.line, issue.column, issue.rule, issue.severity)
+
+
+def time_it(func, lines, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark do parser de issues')
+    arg_parser.add_argument('files', nargs='*', help='Snapshots (default: analyze_*.txt)')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Repetições (usa a melhor)')
+    args = arg_parser.parse_args()
+
+    files = args.files or sorted(glob.glob('analyze_*.txt'))
+    parser = AnalyzerParser()
+
+    total_lines = 0
+    total_before = 0.0
+    total_after = 0.0
+
+    print(f"{'arquivo':32s} {'linhas':>7s} {'issues':>6s} {'antes l/s':>12s} {'depois l/s':>12s} {'ganho':>6s}")
+    for file_path in files:
+        lines = [l for l in read_analyzer_output(file_path).split('\n') if l and not l.isspace()]
+        if not lines:
+            continue
+
+        # Sanidade: o parse novo precisa devolver exatamente os mesmos campos
+        for line in lines:
+            if fields(legacy_parse_line(line)) != fields(parser._parse_line(line)):
+                print(f"DIVERGENCIA em {file_path}: {line!r}")
+                sys.exit(1)
+
+        issues = sum(1 for l in lines if legacy_parse_line(l))
+        before = time_it(legacy_parse_line, lines, args.repeat)
+        after = time_it(parser._parse_line, lines, args.repeat)
+
+        total_lines += len(lines)
+        total_before += before
+        total_after += after
+        print(f"{file_path[:32]:32s} {len(lines):>7d} {issues:>6d} "
+              f"{len(lines) / before:>12,.0f} {len(lines) / after:>12,.0f} {before / after:>5.1f}x")
+
+    if total_lines:
+        print(f"{'TOTAL':32s} {total_lines:>7d} {'':>6s} "
+              f"{total_lines / total_before:>12,.0f} {total_lines / total_after:>12,.0f} "
+              f"{total_before / total_after:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 import re
 
+from fix_flutter_issues import open_analyzer_output
+
 # O padrão usado no script
 pattern = r'^\s*(error|warning|info)\s+-\s+(.+?)\s+-\s+(.+?):(\d+):(\d+)\s+-\s+(\w+)'
 
 issues = []
-with open('analyze_with_deps.txt', 'r', encoding='utf-8') as f:
+with open_analyzer_output('analyze_with_deps.txt') as f:
     for i, line in enumerate(f, 1):
         match = re.match(pattern, line)
         if match:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Analysis server falso: responde o protocolo do `dart language-server
+--protocol=analyzer` reproduzindo diagnósticos gravados em arquivos de
+output do analyzer (texto, machine ou json).
+
+O primeiro snapshot é servido na análise inicial; cada lote de
+`analysis.updateContent` avança para o próximo, simulando o efeito de uma
+rodada de correções. Serve para exercitar o AnalysisServerClient e a
+validação sem SDK do Flutter.
+
+Uso:
+    python fake_analysis_server.py analyze_v2.txt analyze_v3.txt
+    python fix_flutter_issues.py --analyze-file analyze_v2.txt --server \\
+        --server-command "python fake_analysis_server.py analyze_v2.txt analyze_v3.txt"
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import defaultdict
+from typing import Dict, List
+
+from fix_flutter_issues import AnalyzerParser, DartIssue
+
+# Tipo do erro no protocolo do servidor, pela severidade
+SERVER_TYPES = {
+    'error': 'COMPILE_TIME_ERROR',
+    'warning': 'STATIC_WARNING',
+    'info': 'LINT',
+}
+
+
+def to_server_error(issue: DartIssue, file_path: str) -> dict:
+    """DartIssue -> objeto AnalysisError do protocolo."""
+    error = {
+        'severity': issue.issue_type.value.upper(),
+        'type': SERVER_TYPES.get(issue.issue_type.value, 'LINT'),
+        'location': {
+            'file': file_path,
+            'offset': issue.offset or 0,
+            'length': issue.length or 0,
+            'startLine': issue.line,
+            'startColumn': issue.column,
+            'endLine': issue.end_line or issue.line,
+            'endColumn': issue.end_column or issue.column,
+        },
+        'message': issue.message,
+        'code': issue.rule,
+        'hasFix': False,
+    }
+    if issue.correction:
+        error['correction'] = issue.correction
+    return error
+
+
+def load_snapshot(path: str, root: str) -> Dict[str, List[dict]]:
+    """Arquivo de output do analyzer -> {arquivo absoluto: [erros]}."""
+    errors: Dict[str, List[dict]] = defaultdict(list)
+    for issue in AnalyzerParser().parse_file(path):
+        file_path = os.path.join(root, issue.file_path)
+        errors[file_path].append(to_server_error(issue, file_path))
+    return dict(errors)
+
+
+class FakeAnalysisServer:
+    """Responde requests do stdin e emite eventos no stdout."""
+
+    def __init__(self, snapshots: List[Dict[str, List[dict]]]):
+        self.snapshots = snapshots
+        self.current = 0
+
+    @property
+    def errors(self) -> Dict[str, List[dict]]:
+        return self.snapshots[self.current]
+
+    def send(self, message: dict):
+        sys.stdout.write(json.dumps(message) + '\n')
+        sys.stdout.flush()
+
+    def event(self, name: str, params: dict):
+        self.send({'event': name, 'params': params})
+
+    def publish(self, files):
+        """Uma 'rodada de análise': status, erros dos arquivos, status."""
+        self.event('server.status', {'analysis': {'isAnalyzing': True}})
+        for file_path in sorted(files):
+            self.event('analysis.errors', {'file': file_path,
+                                           'errors': self.errors.get(file_path, [])})
+        self.event('server.status', {'analysis': {'isAnalyzing': False}})
+
+    def handle(self, request: dict) -> bool:
+        """Trata um request; retorna False no shutdown."""
+        method = request.get('method')
+        params = request.get('params', {})
+        response = {'id': request.get('id')}
+
+        if method == 'analysis.getErrors':
+            response['result'] = {'errors': self.errors.get(params.get('file'), [])}
+        elif method in ('server.setSubscriptions', 'analysis.setAnalysisRoots',
+                        'analysis.updateContent', 'server.shutdown'):
+            response['result'] = {}
+        else:
+            response['error'] = {'code': 'UNKNOWN_REQUEST', 'message': f'Não suportado: {method}'}
+        self.send(response)
+
+        if method == 'analysis.setAnalysisRoots':
+            self.publish(self.errors)
+        elif method == 'analysis.updateContent':
+            previous = self.errors
+            self.current = min(self.current + 1, len(self.snapshots) - 1)
+            # Como no servidor real: arquivos sem erros recebem lista vazia
+            self.publish(set(previous) | set(self.errors))
+        return method != 'server.shutdown'
+
+    def serve(self):
+        self.event('server.connected', {'version': 'fake', 'pid': os.getpid()})
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            if not self.handle(json.loads(line)):
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analysis server falso com diagnósticos gravados')
+    parser.add_argument('snapshots', nargs='+', help='Outputs do analyzer, na ordem das rodadas')
+    parser.add_argument('--root', default='.', help='Raiz do projeto (default: diretório atual)')
+    args = parser.parse_args()
+
+    root = os.path.abspath(args.root)
+    FakeAnalysisServer([load_snapshot(path, root) for path in args.snapshots]).serve()
+
+
+if __name__ == '__main__':
+    main()
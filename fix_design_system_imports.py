@@ -3,61 +3,83 @@ import os
 import re
 from pathlib import Path
 
-# Arquivos que precisam de import corrigido
-files_to_fix = [
-    'lib/core/widgets/app_button.dart',
-    'lib/core/widgets/app_card.dart',
-    'lib/core/widgets/app_loading.dart',
-    'lib/core/widgets/app_text_field.dart',
+from import_graph import DIRECTIVE_PATTERN, ImportGraph
+
+# Grafo de imports (lib/ e test/, salvo em .import_graph.json)
+graph = ImportGraph.load('.')
+
+# Classes do design system que os widgets usam
+design_system_classes = [
+    "AppColors",
+    "AppTypography",
+    "AppSpacing",
+    "AppShadows",
+    "AppIcons",
+    "AppBorders",
 ]
 
-# Mapeamento de imports errados para corretos
-import_fixes = {
-    "package:tagbean/core/theme/app_colors.dart": "package:tagbean/design_system/theme/colors.dart",
-    "package:tagbean/core/theme/app_typography.dart": "package:tagbean/design_system/theme/typography.dart",
-    "package:tagbean/core/theme/app_spacing.dart": "package:tagbean/design_system/theme/spacing.dart",
-    "package:tagbean/core/theme/app_shadows.dart": "package:tagbean/design_system/theme/shadows.dart",
-    "package:tagbean/core/theme/app_icons.dart": "package:tagbean/design_system/theme/icons.dart",
-    "package:tagbean/core/theme/app_borders.dart": "package:tagbean/design_system/theme/borders.dart",
-}
+# Mapeamento de classe/função para import: o barrel mais amplo que a exporta
+class_to_import = {}
+for cls in design_system_classes:
+    # Só barrels de lib/ têm URI package:
+    uris = [uri for uri in map(graph.package_uri, graph.barrels_providing(cls)) if uri]
+    if uris:
+        class_to_import[cls] = uris[0]
 
-# Mapeamento de classe/função para import
-class_to_import = {
-    "AppColors": "package:tagbean/design_system/design_system.dart",
-    "AppTypography": "package:tagbean/design_system/design_system.dart",
-    "AppSpacing": "package:tagbean/design_system/design_system.dart",
-    "AppShadows": "package:tagbean/design_system/design_system.dart",
-    "AppIcons": "package:tagbean/design_system/design_system.dart",
-    "AppBorders": "package:tagbean/design_system/design_system.dart",
-}
+# Arquivos que precisam de import corrigido: os que importam algo inexistente
+missing = graph.missing_targets()
+files_to_fix = sorted({f for sources in missing.values() for f in sources if f.startswith('lib/')})
 
 for file_path in files_to_fix:
     full_path = Path(file_path)
     if full_path.exists():
         print(f"Processando {file_path}...")
         with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Fazer substituições
-        for old_import, new_import in import_fixes.items():
-            content = content.replace(f"import '{old_import}';", f"import '{new_import}';")
-        
+            original = f.read()
+
+        # Fazer substituições: URI quebrada -> arquivo que existe (um só candidato).
+        # Troca só o trecho da URI: vale para import/export/part, aspas simples
+        # ou duplas e diretivas com as/show/hide
+        replacements = []
+        for match in DIRECTIVE_PATTERN.finditer(original):
+            uri = match.group(2)
+            if graph.resolve(uri, file_path) not in missing:
+                continue
+            candidates = graph.replacement_candidates(uri, file_path)
+            new_uri = graph.package_uri(candidates.pop()) if len(candidates) == 1 else None
+            if new_uri:
+                replacements.append((match.start(2), match.end(2), new_uri))
+                print(f"  {uri} -> {new_uri}")
+            else:
+                print(f"  ? {uri}: {len(candidates)} candidatos, verificar manualmente")
+        content = original
+        for start, end, new_uri in reversed(replacements):
+            content = content[:start] + new_uri + content[end:]
+
         # Adicionar imports necessários se faltarem
-        has_design_system_import = "import 'package:tagbean/design_system/design_system.dart';" in content
-        if not has_design_system_import and any(cls in content for cls in class_to_import.keys()):
+        imported = {graph.resolve(m.group(2), file_path)
+                    for m in DIRECTIVE_PATTERN.finditer(content) if m.group(1) == 'import'}
+        needed = {uri for cls, uri in class_to_import.items()
+                  if re.search(r'\b' + cls + r'\b', content)
+                  and not graph.providers_of(cls) & imported}
+        if needed:
             # Adicionar import no início após outros imports
             lines = content.split('\n')
             import_idx = 0
             for i, line in enumerate(lines):
                 if line.startswith('import '):
                     import_idx = i + 1
-            
-            lines.insert(import_idx, "import 'package:tagbean/design_system/design_system.dart';")
+
+            for uri in sorted(needed):
+                lines.insert(import_idx, f"import '{uri}';")
             content = '\n'.join(lines)
-        
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"  ✓ Atualizado")
+
+        if content != original:
+            with open(full_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            print(f"  ✓ Atualizado")
+        else:
+            print(f"  - Nada alterado")
     else:
         print(f"  ✗ Arquivo não encontrado: {file_path}")
 
@@ -6,24 +6,48 @@ Analisa output do `flutter analyze` e aplica correções automáticas.
 Uso:
     python fix_flutter_issues.py --analyze-file analyze_complete.txt
     python fix_flutter_issues.py --run-analyze --project-path /path/to/project
-    python fix_flutter_issues.py --dry-run  # Mostra correções sem aplicar
+    python fix_flutter_issues.py --dry-run  # Mostra correções sem aplicar (diff unificado por arquivo)
+    python fix_flutter_issues.py --analyze-file analyze.txt --dry-run --save-plan plano.jsonl --diff-output plano.diff
+    python fix_flutter_issues.py --apply-plan plano.jsonl  # aplica o plano revisado, sem reanalisar
+    python fix_flutter_issues.py --run-analyze --format machine  # dart analyze --format=machine
+    python fix_flutter_issues.py --server --project-path .  # analysis server quente (sem cold starts)
+    python fix_flutter_issues.py --run-analyze --cache  # reanalisa só arquivos alterados desde a última vez
+    python fix_flutter_issues.py --list-rules  # regras registradas (--disable-rules a,b desliga)
+    python fix_flutter_issues.py --analyze-file analyze.txt --benchmark-rules
+    python fix_flutter_issues.py --analyze-file analyze.txt --flutter-path C:\\flutter\\bin\\flutter.bat --analyze-timeout 600
 """
 
+import io
 import os
 import re
+import codecs
 import sys
 import json
+import shlex
+import hashlib
+import time
+import bisect
 import shutil
+import difflib
+import tempfile
+import atexit
 import argparse
+import threading
 import subprocess
 from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Set, Callable
+from typing import List, Dict, Optional, Tuple, Set, Callable, Iterable, Iterator, TextIO
 from enum import Enum
-from collections import defaultdict
+from array import array
+from collections import defaultdict, Counter, deque
+from functools import partial
 import logging
 
+from import_graph import ImportGraph, graph_path, read_package_name
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -49,17 +73,57 @@ class IssueSeverity(Enum):
     LOW = 4       # Info e warnings menores
 
 
-@dataclass
+@dataclass(init=False, eq=False, slots=True)
 class DartIssue:
-    """Representa um issue encontrado pelo analyzer."""
+    """
+    Representa um issue encontrado pelo analyzer.
+    
+    Representação compacta para outputs grandes: __slots__, strings repetidas
+    (arquivo, regra, mensagem) compartilhadas via interning no parser e
+    raw_line guardada só quando pedida - senão é remontada sob demanda.
+    """
     issue_type: IssueType
     message: str
     file_path: str
     line:  int
     column: int
     rule:  str
-    raw_line: str
-    severity: IssueSeverity = IssueSeverity.MEDIUM
+    severity: IssueSeverity
+    # Preenchidos apenas pelos formatos estruturados (machine/json)
+    end_line: Optional[int]
+    end_column: Optional[int]
+    offset: Optional[int]
+    length: Optional[int]
+    correction: Optional[str]
+    _raw_line: Optional[str] = field(repr=False)
+    
+    def __init__(self, issue_type: IssueType, message: str, file_path: str,
+                 line: int, column: int, rule: str, raw_line: Optional[str] = None,
+                 severity: IssueSeverity = IssueSeverity.MEDIUM,
+                 end_line: Optional[int] = None, end_column: Optional[int] = None,
+                 offset: Optional[int] = None, length: Optional[int] = None,
+                 correction: Optional[str] = None):
+        self.issue_type = issue_type
+        self.message = message
+        self.file_path = file_path
+        self.line = line
+        self.column = column
+        self.rule = rule
+        self._raw_line = raw_line
+        self.severity = severity
+        self.end_line = end_line
+        self.end_column = end_column
+        self.offset = offset
+        self.length = length
+        self.correction = correction
+    
+    @property
+    def raw_line(self) -> str:
+        """Linha original do analyzer (ou equivalente no formato texto)."""
+        if self._raw_line is not None:
+            return self._raw_line
+        return (f"  {self.issue_type.value} - {self.message} - "
+                f"{self.file_path}:{self.line}:{self.column} - {self.rule}")
     
     def __hash__(self):
         return hash((self.file_path, self. line, self.rule))
@@ -72,6 +136,90 @@ class DartIssue:
                 self.rule == other.rule)
 
 
+class IssueTable:
+    """
+    Issues em colunas (struct-of-arrays) para volumes grandes.
+    
+    Arquivo, regra e mensagem viram ids numa tabela de strings; tipo,
+    severidade, linha e coluna ficam em arrays. Ocupa poucos bytes por issue
+    e serializa barato entre processos (arrays viram bytes no pickle).
+    Os campos só de formatos estruturados (end_line, correction...) não são
+    guardados.
+    """
+    
+    _TYPES = list(IssueType)
+    _SEVERITIES = {s.value: s for s in IssueSeverity}
+    
+    def __init__(self, issues: Iterable[DartIssue] = ()):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.types = array('B')
+        self.severities = array('B')
+        self.files = array('I')
+        self.rules = array('I')
+        self.messages = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        for issue in issues:
+            self.append(issue)
+    
+    def _string_id(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+    
+    def append(self, issue: DartIssue):
+        self.types.append(self._TYPES.index(issue.issue_type))
+        self.severities.append(issue.severity.value)
+        self.files.append(self._string_id(issue.file_path))
+        self.rules.append(self._string_id(issue.rule))
+        self.messages.append(self._string_id(issue.message))
+        self.lines.append(issue.line)
+        self.columns.append(issue.column)
+    
+    def extend(self, other: 'IssueTable'):
+        """Anexa outra tabela, remapeando os ids de string."""
+        remap = [self._string_id(value) for value in other.strings]
+        self.types.extend(other.types)
+        self.severities.extend(other.severities)
+        self.files.extend(array('I', (remap[i] for i in other.files)))
+        self.rules.extend(array('I', (remap[i] for i in other.rules)))
+        self.messages.extend(array('I', (remap[i] for i in other.messages)))
+        self.lines.extend(other.lines)
+        self.columns.extend(other.columns)
+    
+    def __len__(self) -> int:
+        return len(self.types)
+    
+    def __getitem__(self, idx: int) -> DartIssue:
+        strings = self.strings
+        return DartIssue(
+            issue_type=self._TYPES[self.types[idx]],
+            message=strings[self.messages[idx]],
+            file_path=strings[self.files[idx]],
+            line=self.lines[idx],
+            column=self.columns[idx],
+            rule=strings[self.rules[idx]],
+            severity=self._SEVERITIES[self.severities[idx]]
+        )
+    
+    def __iter__(self) -> Iterator[DartIssue]:
+        for idx in range(len(self)):
+            yield self[idx]
+    
+    def __getstate__(self):
+        # O índice reverso é reconstruído no destino, não precisa trafegar
+        state = self.__dict__.copy()
+        del state['_string_ids']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._string_ids = {value: i for i, value in enumerate(self.strings)}
+
+
 @dataclass
 class FixResult:
     """Resultado de uma tentativa de correção."""
@@ -80,6 +228,8 @@ class FixResult:
     description: str
     changes_made: List[str] = field(default_factory=list)
     backup_path: Optional[str] = None
+    # Edições no texto original do arquivo (aplicadas em lote por fix_all)
+    edits: List['TextEdit'] = field(default_factory=list)
 
 
 @dataclass 
@@ -144,10 +294,102 @@ class BackupManager:
                 logger.info(f"Restaurado: {original}")
 
 
+# Bytes iniciais usados para identificar o encoding
+SNIFF_BYTES = 4096
+
+
+def detect_encoding(head: bytes) -> str:
+    """
+    Identifica o encoding pelos primeiros bytes (BOM ou proporção de nulos).
+    
+    PowerShell grava UTF-16 LE com BOM; `flutter analyze > arquivo` no cmd
+    grava UTF-8; arquivos antigos podem estar em cp1252.
+    """
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    if not head:
+        return 'utf-8'
+    
+    # Texto ASCII em UTF-16 sem BOM: um byte nulo a cada dois
+    half = max(len(head) // 2, 1)
+    if head[1::2].count(0) / half > 0.3:
+        return 'utf-16-le'
+    if head[0::2].count(0) / half > 0.3:
+        return 'utf-16-be'
+    
+    # final=False: a amostra pode cortar um caractere multibyte no fim
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def open_analyzer_output(file_path: str) -> io.TextIOWrapper:
+    """
+    Abre output do analyzer já com o encoding correto.
+    
+    O encoding é decidido pelos bytes do buffer (peek, sem leitura extra) e o
+    conteúdo é decodificado uma única vez, em streaming, pelo TextIOWrapper.
+    """
+    raw = open(file_path, 'rb', buffering=max(SNIFF_BYTES, io.DEFAULT_BUFFER_SIZE))
+    encoding = detect_encoding(raw.peek(SNIFF_BYTES)[:SNIFF_BYTES])
+    logger.debug(f"Encoding detectado para {file_path}: {encoding}")
+    return io.TextIOWrapper(raw, encoding=encoding, errors='replace')
+
+
+def read_analyzer_output(file_path: str) -> str:
+    """Lê arquivo de output do analyzer inteiro (ver open_analyzer_output)."""
+    with open_analyzer_output(file_path) as f:
+        return f.read()
+
+
+def normalize_path(file_path: str) -> str:
+    """Caminho com '/' (o analyzer no Windows usa '\\')."""
+    return file_path.replace('\\', '/')
+
+
+def directory_key(file_path: str) -> str:
+    """
+    Agrupamento de diretório usado nos relatórios.
+    
+    lib/features/<x> e lib/modules/<x> contam separados; o resto de lib/
+    agrupa pelo primeiro nível (core, shared, design_system...).
+    """
+    parts = normalize_path(file_path).split('/')
+    if len(parts) >= 3 and parts[0] == 'lib':
+        if parts[1] in ('features', 'modules'):
+            return f"{parts[1]}/{parts[2]}"
+        return parts[1]
+    return 'root'
+
+
+def _split_machine_line(line: str) -> List[str]:
+    """Separa campos do formato machine, respeitando '\\|' e '\\\\' escapados."""
+    if '\\' not in line:
+        return line.split('|', 7)
+    
+    fields = []
+    current = []
+    chars = iter(line)
+    for ch in chars:
+        if ch == '\\':
+            current.append(next(chars, ''))
+        elif ch == '|' and len(fields) < 7:
+            fields.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    fields.append(''.join(current))
+    return fields
+
+
 class AnalyzerParser:
     """Parser para output do flutter analyze."""
     
-    # Regex para diferentes formatos de output
+    # Regex para diferentes formatos de output (referência - o parse usa ISSUE_PATTERN)
     PATTERNS = [
         # Formato:  type - message - file:line:col - rule
         re.compile(
@@ -166,6 +408,22 @@ class AnalyzerParser:
         ),
     ]
     
+    # Os formatos acima fundidos em um único regex ancorado. A alternação
+    # preserva a precedência (formato estrito antes do alternativo), então os
+    # grupos capturados são os mesmos da tentativa sequencial dos PATTERNS.
+    ISSUE_PATTERN = re.compile(
+        r'^\s*(error|warning|info)'
+        r'(?:\s+-\s+(.+?)\s+-\s+(.+?):(\d+):(\d+)\s+-\s+(\w+)'
+        r'|\s*-\s*(.+?)\s*-\s*(.+?):(\d+):(\d+)\s*-\s+(\w+))',
+        re.IGNORECASE
+    )
+    
+    # Pré-checagem barata: a linha precisa começar (após espaços) com um destes
+    ISSUE_PREFIXES = ('error', 'warning', 'info')
+    
+    # Lookup direto em vez de IssueType(str) + try/except por linha
+    ISSUE_TYPES = {t.value: t for t in IssueType}
+    
     # Mapeamento de severidade por regra
     SEVERITY_MAP = {
         # Erros críticos
@@ -204,74 +462,294 @@ class AnalyzerParser:
         'prefer_typing_uninitialized_variables': IssueSeverity.LOW,
     }
     
-    def __init__(self):
+    # Formatos de output suportados (ver parse_stream)
+    OUTPUT_FORMATS = ('auto', 'text', 'machine', 'json')
+    
+    # Linhas do `dart analyze --format=machine` começam com a severidade + '|'
+    MACHINE_PREFIXES = ('ERROR|', 'WARNING|', 'INFO|')
+    
+    def __init__(self, output_format: str = 'auto', project_root: Optional[str] = None,
+                 keep_raw_lines: bool = False):
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Formato desconhecido: {output_format}")
+        self.output_format = output_format
+        # raw_line só é guardada se pedida; senão DartIssue remonta sob demanda
+        self.keep_raw_lines = keep_raw_lines
+        # Formatos estruturados trazem caminhos absolutos; com project_root
+        # eles ficam relativos como no output texto
+        self.project_root = os.path.abspath(project_root) if project_root else None
+        self._reset_aggregates()
+        
+        # Backends por linha - 'json' é tratado por documento em parse_stream
+        self.line_parsers: Dict[str, Callable[[str], Optional[DartIssue]]] = {
+            'text': self._parse_line,
+            'machine': self._parse_machine_line,
+        }
+    
+    def _reset_aggregates(self):
+        """
+        Zera issues e agregados mantidos incrementalmente por _update_stats.
+        
+        Resumos e agrupamentos são lidos daqui em O(1)/O(grupos), sem
+        varrer `self.issues` de novo a cada relatório.
+        """
         self.issues: List[DartIssue] = []
         self.stats: Dict[str, FileStats] = defaultdict(FileStats)
+        self.issues_by_file: Dict[str, List[DartIssue]] = defaultdict(list)
+        self.issues_by_rule: Dict[str, List[DartIssue]] = defaultdict(list)
+        self.type_counts: Counter = Counter()
+        self.severity_counts: Counter = Counter()
+        self.rule_counts: Counter = Counter()
+        self.directory_counts: Counter = Counter()
+        # Matriz regra x arquivo: arquivo -> Counter(regra)
+        self.rule_counts_by_file: Dict[str, Counter] = defaultdict(Counter)
+        self.total_issues = 0
     
     def parse_file(self, file_path: str) -> List[DartIssue]: 
-        """Parse arquivo de output do analyzer."""
-        # Tentar diferentes encodings (PowerShell pode gerar UTF-16)
-        encodings = ['utf-16', 'utf-16-le', 'utf-8', 'cp1252', 'latin-1']
-        content = None
-        for enc in encodings:
-            try:
-                with open(file_path, 'r', encoding=enc) as f:
-                    content = f.read()
-                # Verificar se leu corretamente (sem caracteres nulos)
-                if '\x00' not in content:
-                    break
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-        if content is None:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        return self. parse_content(content)
+        """Parse arquivo de output do analyzer (linha a linha, sem ler tudo)."""
+        with open_analyzer_output(file_path) as f:
+            for _ in self.parse_stream(f):
+                pass
+        return self.issues
     
     def parse_content(self, content:  str) -> List[DartIssue]:
         """Parse conteúdo do output do analyzer."""
-        self.issues = []
+        for _ in self.parse_stream(io.StringIO(content)):
+            pass
+        return self.issues
+    
+    def parse_stream(self, lines: Iterable[str], keep: bool = True) -> Iterator[DartIssue]:
+        """
+        Parse incremental de um iterável de linhas (arquivo, pipe, lista).
         
-        for line in content.split('\n'):
-            # Não fazer strip() para manter os espaços iniciais que o regex precisa
-            if not line or line.isspace():
-                continue
-            
-            issue = self._parse_line(line)
+        Gera cada DartIssue assim que a linha é lida e atualiza `stats` na hora,
+        sem manter o texto completo em memória. Com keep=False os issues não
+        são acumulados em `self.issues` (consumidor processa e descarta).
+        """
+        self.begin(keep)
+        for line in lines:
+            issue = self.feed(line)
             if issue:
-                self.issues.append(issue)
-                self._update_stats(issue)
+                yield issue
+        yield from self.finish()
+    
+    def begin(self, keep: bool = True):
+        """
+        Inicia um parse em modo push (feed linha a linha, depois finish).
         
-        return self.issues
+        Para fontes que não são iteráveis síncronos, ex: pipes asyncio.
+        """
+        self._reset_aggregates()
+        self._keep = keep
+        self._backend = self.output_format
+        self._json_lines: List[str] = []
+    
+    def feed(self, line: str) -> Optional[DartIssue]:
+        """Processa uma linha; retorna o issue dela, se houver."""
+        line = line.rstrip('\n')
+        # Não fazer strip() para manter os espaços iniciais que o regex precisa
+        if not line or line.isspace():
+            return None
+        
+        if self._backend == 'auto':
+            self._backend = self._detect_format(line)
+        
+        if self._backend == 'json':
+            # JSON só é parseável com o documento completo
+            self._json_lines.append(line)
+            return None
+        
+        # Ainda indefinido: a linha é tratada como texto (ruído é descartado)
+        issue = self.line_parsers.get(self._backend, self._parse_line)(line)
+        if issue:
+            self._update_stats(issue, self._keep)
+        return issue
+    
+    def finish(self) -> List[DartIssue]:
+        """Fecha o parse; retorna os issues que dependiam do fim (JSON)."""
+        issues = []
+        if self._json_lines:
+            for issue in self._parse_json_document('\n'.join(self._json_lines)):
+                self._update_stats(issue, self._keep)
+                issues.append(issue)
+            self._json_lines = []
+        return issues
+    
+    def _detect_format(self, line: str) -> str:
+        """Identifica o formato pela linha; 'auto' enquanto não houver evidência."""
+        if line.startswith(self.MACHINE_PREFIXES):
+            return 'machine'
+        if line.lstrip().startswith('{'):
+            return 'json'
+        if self._parse_line(line):
+            return 'text'
+        return 'auto'
+    
+    def iter_issues(self, project_path: str, target: str = 'lib',
+                    tee_path: Optional[str] = None) -> Iterator[DartIssue]:
+        """
+        Executa `flutter analyze` e gera issues enquanto o analyzer ainda roda.
+        
+        Com output_format 'machine' ou 'json' executa `dart analyze --format=...`.
+        Se `tee_path` for informado, cada linha recebida também é gravada nesse
+        arquivo (substitui o antigo "salva output para referência").
+        """
+        lines = stream_flutter_analyze(project_path, target, self.output_format)
+        if tee_path:
+            lines = _tee_lines(lines, tee_path)
+        yield from self.parse_stream(lines)
     
     def _parse_line(self, line:  str) -> Optional[DartIssue]:
-        """Tenta parsear uma linha como issue."""
-        for pattern in self. PATTERNS:
-            match = pattern.match(line)
-            if match:
-                issue_type_str, message, file_path, line_num, col, rule = match.groups()
-                
-                try:
-                    issue_type = IssueType(issue_type_str. lower())
-                except ValueError: 
-                    issue_type = IssueType. INFO
-                
-                severity = self. SEVERITY_MAP.get(rule, IssueSeverity.MEDIUM)
-                
-                return DartIssue(
-                    issue_type=issue_type,
-                    message=message. strip(),
-                    file_path=file_path. strip(),
-                    line=int(line_num),
-                    column=int(col),
-                    rule=rule.strip(),
-                    raw_line=line,
-                    severity=severity
-                )
+        """Tenta parsear uma linha como issue (no máximo uma avaliação de regex)."""
+        # Descarta ruído (pub get, wrappers do PowerShell, stack traces) sem regex
+        if not line.lstrip()[:7].lower().startswith(self.ISSUE_PREFIXES):
+            return None
         
-        return None
+        match = self.ISSUE_PATTERN.match(line)
+        if not match:
+            return None
+        
+        groups = match.groups()
+        issue_type_str = groups[0]
+        # Grupos 1-5 = formato estrito; 6-10 = formato alternativo
+        if groups[1] is not None:
+            message, file_path, line_num, col, rule = groups[1:6]
+        else:
+            message, file_path, line_num, col, rule = groups[6:11]
+        
+        issue_type = self.ISSUE_TYPES.get(issue_type_str.lower(), IssueType.INFO)
+        severity = self. SEVERITY_MAP.get(rule, IssueSeverity.MEDIUM)
+        
+        return DartIssue(
+            issue_type=issue_type,
+            message=sys.intern(message. strip()),
+            file_path=sys.intern(file_path. strip()),
+            line=int(line_num),
+            column=int(col),
+            rule=sys.intern(rule.strip()),
+            raw_line=line if self.keep_raw_lines else None,
+            severity=severity
+        )
     
-    def _update_stats(self, issue: DartIssue):
-        """Atualiza estatísticas por arquivo."""
+    def _parse_machine_line(self, line: str) -> Optional[DartIssue]:
+        """
+        Parse de uma linha do `--format=machine` (sem regex).
+        
+        SEVERITY|TYPE|ERROR_CODE|FILE_PATH|LINE|COLUMN|LENGTH|ERROR_MESSAGE
+        """
+        fields = _split_machine_line(line)
+        if len(fields) != 8:
+            return None
+        
+        severity_str, _, code, file_path, line_num, col, length, message = fields
+        try:
+            line_num, col, length = int(line_num), int(col), int(length)
+        except ValueError:
+            return None
+        
+        rule = sys.intern(code.lower())
+        return DartIssue(
+            issue_type=self.ISSUE_TYPES.get(severity_str.lower(), IssueType.INFO),
+            message=sys.intern(message),
+            file_path=sys.intern(self._relative_path(file_path)),
+            line=line_num,
+            column=col,
+            rule=rule,
+            raw_line=line if self.keep_raw_lines else None,
+            severity=self.SEVERITY_MAP.get(rule, IssueSeverity.MEDIUM),
+            end_line=line_num,
+            end_column=col + length,
+            length=length
+        )
+    
+    def _parse_json_document(self, content: str) -> Iterator[DartIssue]:
+        """Parse do `--format=json` (`{"version": 1, "diagnostics": [...]}`)."""
+        # Descarta eventual ruído antes do documento (ex: avisos do pub)
+        start = content.find('{')
+        if start < 0:
+            return
+        try:
+            data = json.loads(content[start:])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Output JSON do analyzer inválido: {e}")
+            return
+        
+        for diag in data.get('diagnostics', []):
+            location = diag.get('location', {})
+            start_pos = location.get('range', {}).get('start', {})
+            end_pos = location.get('range', {}).get('end', {})
+            rule = sys.intern(diag.get('code', '').lower())
+            issue_type = self.ISSUE_TYPES.get(diag.get('severity', '').lower(), IssueType.INFO)
+            file_path = sys.intern(self._relative_path(location.get('file', '')))
+            message = sys.intern(diag.get('problemMessage', ''))
+            line_num = start_pos.get('line', 0)
+            col = start_pos.get('column', 0)
+            offset = start_pos.get('offset')
+            end_offset = end_pos.get('offset')
+            
+            yield DartIssue(
+                issue_type=issue_type,
+                message=message,
+                file_path=file_path,
+                line=line_num,
+                column=col,
+                rule=rule,
+                severity=self.SEVERITY_MAP.get(rule, IssueSeverity.MEDIUM),
+                end_line=end_pos.get('line'),
+                end_column=end_pos.get('column'),
+                offset=offset,
+                length=(end_offset - offset) if offset is not None and end_offset is not None else None,
+                correction=diag.get('correctionMessage')
+            )
+    
+    def load_issues(self, issues: Iterable[DartIssue]) -> List[DartIssue]:
+        """Recalcula os agregados a partir de issues já parseados (ex: cache)."""
+        self._reset_aggregates()
+        for issue in issues:
+            self._update_stats(issue)
+        return self.issues
+    
+    def parse_server_errors(self, errors_by_file: Dict[str, list]) -> List[DartIssue]:
+        """Converte os erros do analysis server (`analysis.errors`) em issues."""
+        self._reset_aggregates()
+        for file_path in sorted(errors_by_file):
+            for error in errors_by_file[file_path]:
+                # TODO/FIXME não aparecem no `flutter analyze`
+                if error.get('type') == 'TODO':
+                    continue
+                self._update_stats(self._server_error_issue(error))
+        return self.issues
+    
+    def _server_error_issue(self, error: dict) -> DartIssue:
+        location = error.get('location', {})
+        rule = sys.intern(error.get('code', '').lower())
+        return DartIssue(
+            issue_type=self.ISSUE_TYPES.get(error.get('severity', '').lower(), IssueType.INFO),
+            message=sys.intern(error.get('message', '')),
+            file_path=sys.intern(self._relative_path(location.get('file', ''))),
+            line=location.get('startLine', 0),
+            column=location.get('startColumn', 0),
+            rule=rule,
+            severity=self.SEVERITY_MAP.get(rule, IssueSeverity.MEDIUM),
+            end_line=location.get('endLine'),
+            end_column=location.get('endColumn'),
+            offset=location.get('offset'),
+            length=location.get('length'),
+            correction=error.get('correction')
+        )
+    
+    def _relative_path(self, file_path: str) -> str:
+        """Torna caminho absoluto relativo ao project_root (se configurado)."""
+        if self.project_root and os.path.isabs(file_path):
+            try:
+                return os.path.relpath(file_path, self.project_root)
+            except ValueError:
+                # Windows: drive diferente
+                return file_path
+        return file_path
+    
+    def _update_stats(self, issue: DartIssue, keep: bool = True):
+        """Atualiza estatísticas e agregados com um issue recém-parseado."""
         stats = self.stats[issue.file_path]
         stats.total_issues += 1
         
@@ -281,75 +759,625 @@ class AnalyzerParser:
             stats.warnings += 1
         else:
             stats.infos += 1
+        
+        self.total_issues += 1
+        self.type_counts[issue.issue_type] += 1
+        self.severity_counts[issue.severity] += 1
+        self.rule_counts[issue.rule] += 1
+        self.directory_counts[directory_key(issue.file_path)] += 1
+        self.rule_counts_by_file[issue.file_path][issue.rule] += 1
+        
+        # Listas só quando os issues são mantidos (keep=False = memória plana)
+        if keep:
+            self.issues.append(issue)
+            self.issues_by_file[issue.file_path].append(issue)
+            self.issues_by_rule[issue.rule].append(issue)
     
     def get_issues_by_file(self) -> Dict[str, List[DartIssue]]:
-        """Agrupa issues por arquivo."""
-        by_file = defaultdict(list)
-        for issue in self.issues:
-            by_file[issue.file_path].append(issue)
-        return dict(by_file)
+        """Agrupa issues por arquivo (listas compartilhadas - não modificar)."""
+        return dict(self.issues_by_file)
     
     def get_issues_by_rule(self) -> Dict[str, List[DartIssue]]:
-        """Agrupa issues por regra."""
-        by_rule = defaultdict(list)
-        for issue in self.issues:
-            by_rule[issue.rule].append(issue)
-        return dict(by_rule)
+        """Agrupa issues por regra (listas compartilhadas - não modificar)."""
+        return dict(self.issues_by_rule)
     
     def get_summary(self) -> Dict:
         """Retorna resumo das issues."""
         return {
-            'total':  len(self.issues),
-            'errors': sum(1 for i in self.issues if i.issue_type == IssueType. ERROR),
-            'warnings': sum(1 for i in self. issues if i.issue_type == IssueType.WARNING),
-            'infos': sum(1 for i in self.issues if i.issue_type == IssueType.INFO),
+            'total':  self.total_issues,
+            'errors': self.type_counts[IssueType.ERROR],
+            'warnings': self.type_counts[IssueType.WARNING],
+            'infos': self.type_counts[IssueType.INFO],
             'files_affected': len(self.stats),
             'by_severity': {
-                'critical': sum(1 for i in self.issues if i.severity == IssueSeverity. CRITICAL),
-                'high': sum(1 for i in self. issues if i.severity == IssueSeverity.HIGH),
-                'medium': sum(1 for i in self.issues if i. severity == IssueSeverity. MEDIUM),
-                'low':  sum(1 for i in self.issues if i.severity == IssueSeverity.LOW),
+                'critical': self.severity_counts[IssueSeverity.CRITICAL],
+                'high': self.severity_counts[IssueSeverity.HIGH],
+                'medium': self.severity_counts[IssueSeverity.MEDIUM],
+                'low': self.severity_counts[IssueSeverity.LOW],
             }
         }
 
 
+@dataclass(frozen=True)
+class TextEdit:
+    """Troca o trecho [start_offset, end_offset) do documento por `replacement`."""
+    start_offset: int
+    end_offset: int
+    replacement: str
+    
+    @property
+    def is_insertion(self) -> bool:
+        return self.start_offset == self.end_offset
+    
+    def conflicts_with(self, other: 'TextEdit') -> bool:
+        """Trechos com interseção, ou inserção no meio do trecho do outro."""
+        if self.is_insertion and other.is_insertion:
+            return False
+        if self.is_insertion:
+            return other.start_offset < self.start_offset < other.end_offset
+        if other.is_insertion:
+            return self.start_offset < other.start_offset < self.end_offset
+        return (max(self.start_offset, other.start_offset)
+                < min(self.end_offset, other.end_offset))
+
+
+# import/export/part 'uri' (grupo 3 é a URI)
+URI_DIRECTIVE_PATTERN = re.compile(r"""^\s*(import|export|part)\s+(['"])(.+?)\2""")
+
+# Nome que falta nas mensagens de undefined_identifier/class/function
+UNDEFINED_SYMBOL_PATTERN = re.compile(
+    r"Undefined (?:name|class) '([\w$]+)'|The function '([\w$]+)' isn't defined"
+)
+
+# Comentário `// ignore: a, b` ocupando a linha inteira
+IGNORE_COMMENT_PATTERN = re.compile(r'^(\s*)// ignore: ?([\w, ]+)\n$')
+
+
+def merge_ignore_insertions(first: TextEdit, second: TextEdit) -> Optional[TextEdit]:
+    """
+    Duas inserções de `// ignore:` antes da mesma linha viram uma só.
+    
+    O ignore vale só para a linha seguinte, então dois comentários empilhados
+    deixariam o de cima sem efeito.
+    """
+    if not (first.is_insertion and second.is_insertion
+            and first.start_offset == second.start_offset):
+        return None
+    m1 = IGNORE_COMMENT_PATTERN.match(first.replacement)
+    m2 = IGNORE_COMMENT_PATTERN.match(second.replacement)
+    if not (m1 and m2) or m1.group(1) != m2.group(1):
+        return None
+    rules = [r.strip() for r in m1.group(2).split(',')]
+    rules += [r.strip() for r in m2.group(2).split(',') if r.strip() not in rules]
+    return TextEdit(first.start_offset, first.start_offset,
+                    f"{m1.group(1)}// ignore: {', '.join(rules)}\n")
+
+
+class EditBatch:
+    """
+    Edições aceitas para um documento, ordenadas por offset.
+    
+    `add` aceita as edições de um fix inteiro ou nenhuma: se alguma conflita
+    com o que já foi aceito, o fix é rejeitado. Edições idênticas e ignores
+    na mesma linha são mesclados. `apply` monta o texto novo numa passada.
+    """
+    
+    def __init__(self):
+        self.edits: List[TextEdit] = []
+        # (start, end) de cada edição, para bisect
+        self._keys: List[Tuple[int, int]] = []
+    
+    def __len__(self) -> int:
+        return len(self.edits)
+    
+    def _neighbors(self, edit: TextEdit) -> Iterator[int]:
+        """Índices das edições aceitas que podem encostar em `edit`."""
+        idx = bisect.bisect_right(self._keys, (edit.end_offset, edit.end_offset))
+        while idx > 0:
+            idx -= 1
+            other = self.edits[idx]
+            # Aceitas não se sobrepõem: antes disso nada alcança `edit`
+            if other.end_offset < edit.start_offset:
+                break
+            yield idx
+    
+    def find_conflict(self, edits: List[TextEdit]) -> Optional[TextEdit]:
+        for edit in edits:
+            for idx in self._neighbors(edit):
+                other = self.edits[idx]
+                if other != edit and edit.conflicts_with(other):
+                    return other
+        return None
+    
+    def add(self, edits: List[TextEdit]) -> Optional[TextEdit]:
+        """Aceita as edições; retorna a edição conflitante se rejeitar."""
+        conflict = self.find_conflict(edits)
+        if conflict:
+            return conflict
+        for edit in edits:
+            self._insert(edit)
+        return None
+    
+    def _insert(self, edit: TextEdit):
+        for idx in self._neighbors(edit):
+            other = self.edits[idx]
+            if other == edit:
+                return
+            merged = merge_ignore_insertions(other, edit)
+            if merged:
+                self.edits[idx] = merged
+                return
+        # Inserção antes de troca no mesmo offset; empates na ordem de chegada
+        key = (edit.start_offset, edit.end_offset)
+        idx = bisect.bisect_right(self._keys, key)
+        self.edits.insert(idx, edit)
+        self._keys.insert(idx, key)
+    
+    def apply(self, text: str) -> str:
+        """Texto com todas as edições aplicadas (uma passada, offsets do original)."""
+        parts = []
+        position = 0
+        for edit in self.edits:
+            parts.append(text[position:edit.start_offset])
+            parts.append(edit.replacement)
+            position = edit.end_offset
+        parts.append(text[position:])
+        return ''.join(parts)
+
+
+class DartDocument:
+    """Linhas de um arquivo com o offset de início de cada linha."""
+    
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.line_starts = [0]
+        for line in lines:
+            self.line_starts.append(self.line_starts[-1] + len(line))
+    
+    @property
+    def text(self) -> str:
+        return ''.join(self.lines)
+    
+    def insert_before(self, line_idx: int, text: str) -> TextEdit:
+        start = self.line_starts[line_idx]
+        return TextEdit(start, start, text)
+    
+    def delete_line(self, line_idx: int) -> TextEdit:
+        return TextEdit(self.line_starts[line_idx], self.line_starts[line_idx + 1], '')
+    
+    def replace_line(self, line_idx: int, new_line: str) -> TextEdit:
+        """Edição mínima (só o trecho que muda) para trocar a linha por `new_line`."""
+        old_line = self.lines[line_idx]
+        prefix = 0
+        limit = min(len(old_line), len(new_line))
+        while prefix < limit and old_line[prefix] == new_line[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old_line[-1 - suffix] == new_line[-1 - suffix]:
+            suffix += 1
+        start = self.line_starts[line_idx]
+        return TextEdit(start + prefix, start + len(old_line) - suffix,
+                        new_line[prefix:len(new_line) - suffix])
+
+
+class DocumentCache:
+    """
+    Documentos Dart durante uma rodada de correções.
+    
+    Cada arquivo é lido do disco uma vez; os fixers geram edições sobre o
+    documento em memória e o arquivo só é gravado no flush (um write por
+    arquivo, em vez de um read + write + backup por issue).
+    """
+    
+    def __init__(self):
+        self.documents: Dict[Path, DartDocument] = {}
+        self.dirty: Set[Path] = set()
+        self.reads = 0
+        self.writes = 0
+    
+    def get(self, path: Path) -> DartDocument:
+        document = self.documents.get(path)
+        if document is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                document = DartDocument(f.readlines())
+            self.documents[path] = document
+            self.reads += 1
+        return document
+    
+    def put(self, path: Path, text: str):
+        """Troca o conteúdo do arquivo; vai para o disco no próximo flush."""
+        # Só '\n' quebra linha, como no readlines do get (splitlines também
+        # quebraria em \x0c, \u2028...)
+        lines = [line + '\n' for line in text.split('\n')]
+        lines[-1] = lines[-1][:-1]
+        self.documents[path] = DartDocument(lines if lines[-1] else lines[:-1])
+        self.dirty.add(path)
+    
+    def flush(self, write: Callable[[Path, List[str]], None],
+              paths: Optional[Iterable[Path]] = None, evict: bool = True):
+        """Grava os documentos sujos (todos ou só `paths`) e opcionalmente os descarta."""
+        targets = list(self.documents) if paths is None else list(paths)
+        for path in targets:
+            if path in self.dirty:
+                write(path, self.documents[path].lines)
+                self.dirty.discard(path)
+                self.writes += 1
+            if evict:
+                self.documents.pop(path, None)
+
+
+# ==================== REGRAS DE CORREÇÃO ====================
+
+@dataclass(frozen=True)
+class Rewrite:
+    """Reescrita de linha: regex (só a 1a ocorrência) ou literal (todas)."""
+    pattern: str
+    replacement: str
+    literal: bool = False
+
+
+@dataclass(frozen=True)
+class RuleVariant:
+    """
+    Grupo de reescritas de uma regra.
+    
+    `when(linha, contexto)` decide se o grupo vale para o issue; o primeiro
+    grupo aceito é o único tentado (como um if/elif). Sem `apply_all` vale a
+    primeira reescrita que muda a linha; `check(original, nova)` pode
+    recusar o resultado.
+    """
+    rewrites: Tuple[Rewrite, ...]
+    description: str
+    change: Optional[str] = None
+    when: Optional[Callable[[str, Dict[str, str]], bool]] = None
+    check: Optional[Callable[[str, str], bool]] = None
+    apply_all: bool = False
+
+
+@dataclass(frozen=True)
+class FixRule:
+    """
+    Regra de correção declarativa.
+    
+    - `message`: regex sobre a mensagem do issue; grupos nomeados viram o
+      contexto dos `when`. Se não casar, o issue é reportado com `unmatched`.
+    - `fallback`: 'ignore' (comentário // ignore) ou 'report' (não corrige,
+      descreve com `report`, que aceita {file_path}/{line}).
+    - `handler`: método do DartFileFixer para as regras procedurais.
+    """
+    rule: str
+    summary: str
+    variants: Tuple[RuleVariant, ...] = ()
+    message: Optional[str] = None
+    unmatched: str = "Mensagem não reconhecida"
+    fallback: str = 'ignore'
+    report: str = "Correção automática não disponível"
+    handler: Optional[str] = None
+    enabled: bool = True
+    
+    @property
+    def kind(self) -> str:
+        if self.handler:
+            return 'procedural'
+        if self.variants:
+            return 'reescrita'
+        return self.fallback
+
+
+def _dynamic_to(target: str, brackets: Optional[bool] = None) -> Callable[[str, Dict[str, str]], bool]:
+    """when: argumento dynamic para `target` (brackets: linha com map['key'])."""
+    def when(line: str, context: Dict[str, str]) -> bool:
+        if context['source'] != 'dynamic' or context['target'].rstrip('?') != target:
+            return False
+        return brackets is None or brackets == ("['" in line or '["' in line)
+    return when
+
+
+def _cast_variant(target: str, cast: str) -> RuleVariant:
+    return RuleVariant(
+        rewrites=(
+            Rewrite(r',\s*(\w+)\s*\)', f', \\1{cast})'),
+            Rewrite(r'\(\s*(\w+)\s*\)', f'(\\1{cast})'),
+            Rewrite(r',\s*(\w+)\s*,', f', \\1{cast},'),
+        ),
+        description=f"Cast {cast} aplicado",
+        when=_dynamic_to(target),
+    )
+
+
+FIX_RULES: Tuple[FixRule, ...] = (
+    FixRule('unused_import', "Remove o import", handler='_fix_unused_import'),
+    FixRule('unused_element', "Ignore antes da declaração", handler='_fix_unused_element'),
+    FixRule('unused_field', "Ignore para field não utilizado"),
+    FixRule('unused_local_variable', "Ignore para variável local não utilizada"),
+    FixRule(
+        'prefer_const_constructors', "Adiciona const onde necessário",
+        variants=(RuleVariant(
+            rewrites=(
+                Rewrite(r'(\s+)(SizedBox\()', r'\1const SizedBox('),
+                Rewrite(r'(\s+)(EdgeInsets\. )', r'\1const EdgeInsets. '),
+                Rewrite(r'(\s+)(BorderRadius\. )', r'\1const BorderRadius. '),
+                Rewrite(r'(\s+)(Icon\()', r'\1const Icon('),
+                Rewrite(r'(\s+)(Text\([\'"])', r'\1const Text(\''),
+                Rewrite(r'(\s+)(Offset\()', r'\1const Offset('),
+                Rewrite(r'(\s+)(Duration\()', r'\1const Duration('),
+            ),
+            description="Adicionado const",
+            change="Linha {line}:  adicionado const",
+        ),),
+    ),
+    FixRule('prefer_const_literals_to_create_immutables', "Ignore para literals"),
+    FixRule(
+        'deprecated_member_use', "Substitui membros deprecated (mapeamento deprecated -> novo)",
+        variants=(RuleVariant(
+            rewrites=(
+                Rewrite('. withOpacity(', '.withValues(alpha:  ', literal=True),
+                Rewrite('WillPopScope', 'PopScope', literal=True),
+                Rewrite('dart: html', 'package:web', literal=True),
+            ),
+            description="Substituído deprecated",
+            change="Linha {line}: atualizado uso deprecated",
+            apply_all=True,
+        ),),
+    ),
+    FixRule(
+        'argument_type_not_assignable', "Cast simples de dynamic para String/int/double/bool",
+        message=r"argument type '(?P<source>[^']+)' can't be assigned to the parameter type '(?P<target>[^']+)'",
+        unmatched="Padrao de tipo nao identificado",
+        variants=(
+            # map['key'] com target String
+            RuleVariant(
+                rewrites=(Rewrite(r'(\w+\[["\'][\w_]+["\']\])', r'(\1).toString()'),),
+                description="Cast .toString() aplicado",
+                when=_dynamic_to('String', brackets=True),
+                check=lambda line, modified: modified.count('(') <= line.count('(') + 2,
+            ),
+            # Variável simples em argumento de função
+            _cast_variant('String', '.toString()'),
+            _cast_variant('int', '.toInt() ?? 0'),
+            _cast_variant('double', '.toDouble() ?? 0.0'),
+            _cast_variant('bool', '== true'),
+        ),
+    ),
+    FixRule('return_of_invalid_type', "Ignore para tipo de retorno inválido"),
+    FixRule('undefined_identifier', "Adiciona o import que declara o nome (índice de símbolos)",
+            handler='_fix_undefined_identifier'),
+    FixRule('undefined_class', "Adiciona o import que declara a classe (índice de símbolos)",
+            handler='_fix_undefined_identifier'),
+    FixRule('undefined_function', "Adiciona o import que declara a função (índice de símbolos)",
+            handler='_fix_undefined_identifier'),
+    FixRule('dead_code', "Ignore para código morto"),
+    FixRule('duplicate_import', "Remove o import duplicado", handler='_fix_unused_import'),
+    FixRule('unnecessary_import', "Remove o import desnecessário", handler='_fix_unused_import'),
+    FixRule('file_names', "Reporta arquivos com nomes inválidos", fallback='report',
+            report="Arquivo precisa ser renomeado: {file_path}"),
+    FixRule('uri_does_not_exist', "Aponta o import para o arquivo existente (grafo de imports)",
+            handler='_fix_uri_does_not_exist'),
+    FixRule('depend_on_referenced_packages', "Reporta dependência não declarada", fallback='report',
+            report="Adicionar dependência ao pubspec.yaml"),
+    FixRule('unexpected_token', "mport -> import e ; faltante", handler='_fix_unexpected_token'),
+    FixRule('use_build_context_synchronously', "Ignore para BuildContext após await"),
+    FixRule('implicit_this_reference_in_initializer', "Ignore para this implícito em inicializador"),
+    FixRule('extra_positional_arguments', "Reporta argumentos posicionais extras", fallback='report',
+            report="Argumentos extras - requer análise manual da assinatura da função"),
+    FixRule('list_element_type_not_assignable', "Ignore para tipo de elemento de lista"),
+    FixRule('illegal_character', "Remove caracteres de controle", handler='_fix_illegal_character'),
+)
+
+
+class CompiledVariant:
+    """RuleVariant com os padrões compilados e um pré-filtro combinado."""
+    
+    def __init__(self, variant: RuleVariant):
+        self.variant = variant
+        if variant.apply_all:
+            # Literais: uma passada só com a alternação de todos. O despacho é
+            # pelo texto casado, então regex aqui não teria entrada na tabela
+            regexes = [r.pattern for r in variant.rewrites if not r.literal]
+            if regexes:
+                raise ValueError(f"apply_all aceita só reescritas literais: {', '.join(regexes)}")
+            self.table = {r.pattern: r.replacement for r in variant.rewrites}
+            # Mais longo primeiro: um literal prefixo de outro não o encobre
+            self.combined = re.compile('|'.join(
+                re.escape(pattern) for pattern in sorted(self.table, key=len, reverse=True)
+            ))
+        else:
+            self.rewrites = [
+                (re.compile(re.escape(r.pattern) if r.literal else r.pattern),
+                 r.replacement.replace('\\', '\\\\') if r.literal else r.replacement)
+                for r in variant.rewrites
+            ]
+            # Linhas que não casam com nenhum padrão saem com um search só
+            self.combined = re.compile('|'.join(
+                f'(?:{pattern.pattern})' for pattern, _ in self.rewrites
+            ))
+    
+    def apply(self, line: str) -> Optional[str]:
+        """Linha reescrita ou None se nada mudou."""
+        if not self.combined.search(line):
+            return None
+        if self.variant.apply_all:
+            modified = self.combined.sub(lambda m: self.table[m.group()], line)
+        else:
+            modified = line
+            for pattern, replacement in self.rewrites:
+                modified = pattern.sub(replacement, line, count=1)
+                if modified != line:
+                    break
+        if modified == line:
+            return None
+        if self.variant.check and not self.variant.check(line, modified):
+            return None
+        return modified
+
+
+class CompiledRule:
+    """FixRule compilada uma vez: despacho direto para a primeira variante aceita."""
+    
+    def __init__(self, rule: FixRule):
+        self.rule = rule
+        self.message = re.compile(rule.message) if rule.message else None
+        self.variants = [CompiledVariant(v) for v in rule.variants]
+        self.patterns = sum(len(v.rewrites) for v in rule.variants)
+    
+    def context(self, message: str) -> Optional[Dict[str, str]]:
+        if not self.message:
+            return {}
+        match = self.message.search(message)
+        return match.groupdict() if match else None
+    
+    def rewrite(self, line: str, context: Dict[str, str]) -> Optional[Tuple[str, RuleVariant]]:
+        for compiled in self.variants:
+            when = compiled.variant.when
+            if when is None or when(line, context):
+                modified = compiled.apply(line)
+                return (modified, compiled.variant) if modified is not None else None
+        return None
+
+
+def compile_rules(rules: Iterable[FixRule] = FIX_RULES,
+                  disabled: Iterable[str] = ()) -> Dict[str, CompiledRule]:
+    """Compila as regras habilitadas (feito uma vez por DartFileFixer)."""
+    disabled = set(disabled)
+    unknown = disabled - {rule.rule for rule in rules}
+    if unknown:
+        raise ValueError(f"Regras desconhecidas: {', '.join(sorted(unknown))}")
+    return {
+        rule.rule: CompiledRule(rule)
+        for rule in rules
+        if rule.enabled and rule.rule not in disabled
+    }
+
+
+def print_rules(rules: Iterable[FixRule] = FIX_RULES, disabled: Iterable[str] = ()):
+    disabled = set(disabled)
+    print(f"{'regra':45s} {'tipo':11s} {'padrões':>7s}  status")
+    print("-" * 80)
+    for rule in rules:
+        status = 'on' if rule.enabled and rule.rule not in disabled else 'off'
+        patterns = sum(len(v.rewrites) for v in rule.variants)
+        print(f"{rule.rule:45s} {rule.kind:11s} {patterns:7d}  {status:3s}  {rule.summary}")
+
+
+def print_rule_benchmark(stats: Dict[str, Dict]):
+    print(f"{'regra':45s} {'issues':>7s} {'corrigidos':>10s} {'total':>9s} {'por issue':>10s}")
+    print("-" * 85)
+    for rule, data in sorted(stats.items(), key=lambda item: -item[1]['seconds']):
+        per_issue = data['seconds'] / data['issues'] * 1e6
+        print(f"{rule:45s} {data['issues']:7d} {data['fixed']:10d} "
+              f"{data['seconds'] * 1000:7.2f}ms {per_issue:8.1f}us")
+
+
+def text_sha1(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+
+class FixPlanWriter:
+    """
+    Plano de correções serializado (JSON Lines), gravado conforme os arquivos
+    são corrigidos.
+    
+    A primeira linha é o cabeçalho; depois uma linha por arquivo com o sha1
+    do texto original e, por fix, regra/linha/descrição e as edições
+    [início, fim, texto] em offsets do original. `--apply-plan` reaplica sem
+    analyzer nem fixers; dá para revisar e apagar fixes do plano antes.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: str, project_root: str):
+        self.path = path
+        self.files = 0
+        self.fixes = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({'version': self.VERSION, 'created': datetime.now().isoformat(),
+                     'project_root': os.path.abspath(project_root)})
+    
+    def _write(self, entry: Dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+    
+    def add(self, path: str, original: str, results: List[FixResult]):
+        fixes = [
+            {
+                'rule': r.issue.rule,
+                'line': r.issue.line,
+                'column': r.issue.column,
+                'message': r.issue.message,
+                'description': r.description,
+                'edits': [[e.start_offset, e.end_offset, e.replacement] for e in r.edits],
+            }
+            for r in results if r.success and r.edits
+        ]
+        if fixes:
+            self._write({'path': path, 'sha1': text_sha1(original), 'fixes': fixes})
+            self.files += 1
+            self.fixes += len(fixes)
+    
+    def close(self):
+        self._file.close()
+
+
+def read_fix_plan(path: str) -> Tuple[Dict, List[Dict]]:
+    """(cabeçalho, entradas por arquivo) de um plano salvo com --save-plan."""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if not entries or entries[0].get('version') != FixPlanWriter.VERSION:
+        raise ValueError(f"{path}: plano inválido ou de outra versão")
+    return entries[0], entries[1:]
+
+
 class DartFileFixer:
     """Aplica correções em arquivos Dart."""
     
-    def __init__(self, project_root: str, dry_run: bool = False):
+    # Regras cujos fixers consultam o grafo de imports
+    GRAPH_RULES = ('uri_does_not_exist', 'undefined_identifier', 'undefined_class', 'undefined_function')
+    
+    def __init__(self, project_root: str, dry_run: bool = False,
+                 disabled_rules: Iterable[str] = (), keep_originals: bool = False):
         self.project_root = Path(project_root)
         self.dry_run = dry_run
-        self.backup_manager = BackupManager()
+        # Texto de antes da primeira gravação de cada arquivo (--bisect-regressions)
+        self.keep_originals = keep_originals
+        self.originals: Dict[Path, str] = {}
+        self._backup_manager: Optional[BackupManager] = None
+        self._graph: Optional[ImportGraph] = None
+        # Processos do scan do grafo (workers do --jobs não podem criar processos)
+        self._graph_jobs: Optional[int] = None
         self.fixes_applied:  List[FixResult] = []
-        
-        # Registra fixers disponíveis
+        self.documents = DocumentCache()
+        # Dry run: diff unificado de cada arquivo, emitido assim que é corrigido
+        self.diff_stream: Optional[TextIO] = None
+        # Plano serializado (--save-plan), preenchido a cada arquivo aplicado
+        self.plan: Optional[FixPlanWriter] = None
+        # Dentro de fix_all as edições são aplicadas em lote por arquivo
+        self._batching = False
+        
+        # Regras compiladas uma vez; procedurais apontam para o método
+        self.disabled_rules = tuple(disabled_rules)
+        self.rules = compile_rules(disabled=self.disabled_rules)
         self.fixers:  Dict[str, Callable] = {
-            'unused_import': self._fix_unused_import,
-            'unused_element': self._fix_unused_element,
-            'unused_field': self._fix_unused_field,
-            'unused_local_variable': self._fix_unused_local_variable,
-            'prefer_const_constructors': self._fix_prefer_const_constructors,
-            'prefer_const_literals_to_create_immutables': self._fix_prefer_const_literals,
-            'deprecated_member_use': self._fix_deprecated_member_use,
-            'argument_type_not_assignable':  self._fix_argument_type,
-            'return_of_invalid_type': self._fix_return_type,
-            'undefined_identifier': self._fix_undefined_identifier,
-            'dead_code': self._fix_dead_code,
-            'duplicate_import': self._fix_duplicate_import,
-            'unnecessary_import': self._fix_unnecessary_import,
-            'file_names': self._fix_file_names,
-            'uri_does_not_exist': self._fix_uri_does_not_exist,
-            'depend_on_referenced_packages': self._fix_depend_on_packages,
-            'unexpected_token': self._fix_unexpected_token,
-            'use_build_context_synchronously': self._fix_use_build_context_synchronously,
-            'implicit_this_reference_in_initializer': self._fix_implicit_this_reference_in_initializer,
-            'extra_positional_arguments': self._fix_extra_positional_arguments,
-            'list_element_type_not_assignable': self._fix_list_element_type_not_assignable,
-            'illegal_character': self._fix_illegal_character,
+            name: getattr(self, compiled.rule.handler) if compiled.rule.handler
+            else partial(self._apply_rule, compiled)
+            for name, compiled in self.rules.items()
         }
     
-    def _read_file(self, file_path: str) -> List[str]:
-        """Lê arquivo e retorna linhas."""
+    @property
+    def backup_manager(self) -> BackupManager:
+        # Criado só na primeira gravação (workers do --jobs nunca gravam)
+        if self._backup_manager is None:
+            self._backup_manager = BackupManager()
+        return self._backup_manager
+    
+    @property
+    def graph(self) -> ImportGraph:
+        """Grafo de imports do projeto (do .import_graph.json, relendo o que mudou)."""
+        if self._graph is None:
+            self._graph = ImportGraph.load(str(self.project_root), jobs=self._graph_jobs)
+        return self._graph
+    
+    def _resolve_path(self, file_path: str) -> Path:
         full_path = self.project_root / file_path
         if not full_path.exists():
             # Tenta caminho absoluto
@@ -357,20 +1385,67 @@ class DartFileFixer:
         
         if not full_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
-        
-        with open(full_path, 'r', encoding='utf-8') as f:
-            return f.readlines()
+        return full_path
     
-    def _write_file(self, file_path: str, lines: List[str]):
-        """Escreve linhas no arquivo."""
+    def _document(self, file_path: str) -> DartDocument:
+        """Documento do arquivo (lido uma vez por rodada). Fixers não alteram."""
+        return self.documents.get(self._resolve_path(file_path))
+    
+    def _apply_batch(self, file_path: str, batch: EditBatch):
+        """Aplica as edições aceitas ao documento e grava (uma vez)."""
+        if not batch:
+            return
+        full_path = self._resolve_path(file_path)
+        text = self.documents.get(full_path).text
+        if self.keep_originals:
+            self.originals.setdefault(full_path, text)
+        new_text = batch.apply(text)
+        if self.dry_run and self.diff_stream is not None:
+            self._emit_diff(self._plan_path(full_path), text, new_text)
+        self.documents.put(full_path, new_text)
+        self.documents.flush(self._flush_document, [full_path])
+    
+    def _plan_path(self, full_path: Path) -> str:
+        """Caminho relativo ao projeto com '/' (plano e cabeçalhos do diff)."""
+        try:
+            return graph_path(os.path.relpath(full_path, self.project_root))
+        except ValueError:
+            # Windows: drive diferente
+            return graph_path(str(full_path))
+    
+    def _emit_diff(self, path: str, old: str, new: str):
+        diff = difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                    fromfile=f'a/{path}', tofile=f'b/{path}')
+        for line in diff:
+            if not line.endswith('\n'):
+                line += '\n\\ No newline at end of file\n'
+            self.diff_stream.write(line)
+        self.diff_stream.flush()
+    
+    def _commit_file(self, file_path: str, file_results: List[FixResult]):
+        """Aplica as edições dos fixes bem-sucedidos de um arquivo (e registra no plano)."""
+        batch = EditBatch()
+        for result in file_results:
+            if result.success and result.edits:
+                batch.add(result.edits)
+        if not batch:
+            return
+        if self.plan is not None:
+            full_path = self._resolve_path(file_path)
+            self.plan.add(self._plan_path(full_path), self.documents.get(full_path).text,
+                          file_results)
+        self._apply_batch(file_path, batch)
+    
+    def flush(self):
+        """Grava todos os arquivos alterados ainda em memória."""
+        self.documents.flush(self._flush_document)
+    
+    def _flush_document(self, full_path: Path, lines: List[str]):
+        """Grava o buffer no disco (backup na primeira modificação)."""
         if self.dry_run:
-            logger.info(f"[DRY RUN] Escreveria em:  {file_path}")
+            logger.info(f"[DRY RUN] Escreveria em:  {full_path}")
             return
         
-        full_path = self.project_root / file_path
-        if not full_path.exists():
-            full_path = Path(file_path)
-        
         # Criar backup LOCAL na mesma pasta com sufixo .backup
         backup_path = str(full_path) + '.backup'
         if not os.path.exists(backup_path):
@@ -399,7 +1474,13 @@ class DartFileFixer:
             )
         
         try:
-            return fixer(issue)
+            result = fixer(issue)
+            if result.success and result.edits and not self._batching:
+                # Chamada avulsa: aplica já
+                batch = EditBatch()
+                batch.add(result.edits)
+                self._apply_batch(issue.file_path, batch)
+            return result
         except Exception as e: 
             logger.error(f"Erro ao corrigir {issue.rule} em {issue.file_path}:{issue.line}:  {e}")
             return FixResult(
@@ -410,8 +1491,16 @@ class DartFileFixer:
     
     def fix_all(self, issues: List[DartIssue], 
                 rules: Optional[List[str]] = None,
-                severity_threshold: IssueSeverity = IssueSeverity.LOW) -> List[FixResult]: 
-        """Corrige múltiplos issues."""
+                severity_threshold: IssueSeverity = IssueSeverity.LOW,
+                jobs: int = 1, apply: bool = True) -> List[FixResult]: 
+        """
+        Corrige múltiplos issues.
+        
+        Com jobs > 1 os arquivos são corrigidos em processos separados (fixes
+        nunca cruzam arquivos); gravação, backups e logs ficam no processo
+        principal, na ordem dos arquivos. Com apply=False nada é gravado: os
+        resultados trazem as edições para apply_results (modo especulativo).
+        """
         results = []
         
         # Filtra por regras se especificado
@@ -425,28 +1514,199 @@ class DartFileFixer:
         by_file = defaultdict(list)
         for issue in issues:
             by_file[issue.file_path].append(issue)
+        groups = list(by_file.items())
         
-        for file_path, file_issues in by_file.items():
-            # Ordena por linha (reverso) para evitar problemas de offset
-            file_issues.sort(key=lambda x: x.line, reverse=True)
+        self._batching = True
+        try:
+            if jobs > 1 and len(groups) > 1:
+                file_results = self._fix_files_parallel(groups, jobs)
+            else:
+                file_results = (self._fix_file(file_path, file_issues)
+                                for file_path, file_issues in groups)
             
-            for issue in file_issues: 
-                result = self.fix_issue(issue)
-                results.append(result)
-                self.fixes_applied.append(result)
-                
-                if result.success:
-                    logger.info(f"✓ Corrigido: {issue.rule} em {issue. file_path}:{issue.line}")
-                else:
-                    logger.debug(f"✗ Não corrigido: {issue.rule} - {result.description}")
+            for (file_path, _), group_results in zip(groups, file_results):
+                # Checkpoint: todas as edições do arquivo numa passada -> um único write
+                if apply:
+                    self._commit_file(file_path, group_results)
+                self.flush()
+                results.extend(group_results)
+                self.fixes_applied.extend(group_results)
+        finally:
+            self._batching = False
+            self.flush()
+        
+        logger.info(f"Arquivos lidos: {self.documents.reads}, gravados: {self.documents.writes}")
+        return results
+    
+    def write_plan(self, plan: FixPlanWriter, results: List[FixResult]):
+        """Registra no plano os fixes que ficaram, sobre os originais (plano depois da bisseção)."""
+        by_file: Dict[Path, List[FixResult]] = defaultdict(list)
+        for result in results:
+            if result.success and result.edits:
+                by_file[self._resolve_path(result.issue.file_path)].append(result)
+        for full_path, group in by_file.items():
+            if full_path in self.originals:
+                plan.add(self._plan_path(full_path), self.originals[full_path], group)
+    
+    def apply_results(self, results: List[FixResult]):
+        """Grava as edições dos fixes bem-sucedidos (um write por arquivo)."""
+        by_file: Dict[str, List[FixResult]] = defaultdict(list)
+        for result in results:
+            by_file[result.issue.file_path].append(result)
+        for file_path, file_results in by_file.items():
+            self._commit_file(file_path, file_results)
+        self.flush()
+    
+    def apply_plan(self, path: str) -> Tuple[int, List[str]]:
+        """
+        Aplica um plano salvo com --save-plan, sem analyzer nem fixers.
+        
+        Arquivos que mudaram desde o plano (sha1 diferente) são pulados.
+        Retorna (fixes aplicados, arquivos pulados).
+        """
+        _, entries = read_fix_plan(path)
+        applied = 0
+        skipped = []
+        for entry in entries:
+            try:
+                full_path = self._resolve_path(entry['path'])
+            except FileNotFoundError:
+                logger.warning(f"Plano: arquivo não encontrado: {entry['path']}")
+                skipped.append(entry['path'])
+                continue
+            if text_sha1(self.documents.get(full_path).text) != entry['sha1']:
+                logger.warning(f"Plano: {entry['path']} mudou desde o plano, pulando")
+                skipped.append(entry['path'])
+                self.documents.flush(self._flush_document, [full_path])
+                continue
+            
+            batch = EditBatch()
+            for fix in entry['fixes']:
+                conflict = batch.add([TextEdit(*edit) for edit in fix['edits']])
+                if conflict:
+                    logger.warning(f"Plano: {fix['rule']} em {entry['path']}:{fix['line']} "
+                                   f"conflita no offset {conflict.start_offset}, pulando")
+                    continue
+                applied += 1
+                logger.info(f"✓ Aplicado do plano: {fix['rule']} em {entry['path']}:{fix['line']}")
+            self._apply_batch(str(full_path), batch)
+            self.flush()
+        return applied, skipped
+    
+    def benchmark(self, issues: List[DartIssue], rounds: int = 3) -> Dict[str, Dict]:
+        """
+        Tempo de cada regra sobre os issues, sem aplicar nada.
         
+        Os documentos são lidos antes, então o tempo medido é só o do fixer.
+        """
+        loaded = set()
+        for file_path in {issue.file_path for issue in issues}:
+            try:
+                self._document(file_path)
+                loaded.add(file_path)
+            except FileNotFoundError:
+                pass
+        
+        by_rule = defaultdict(list)
+        for issue in issues:
+            if issue.rule in self.fixers and issue.file_path in loaded:
+                by_rule[issue.rule].append(issue)
+        
+        stats = {}
+        self._batching = True
+        try:
+            for rule, rule_issues in by_rule.items():
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    results = [self.fix_issue(issue) for issue in rule_issues]
+                stats[rule] = {
+                    'issues': len(rule_issues),
+                    'fixed': sum(1 for r in results if r.success),
+                    'seconds': (time.perf_counter() - start) / rounds,
+                }
+        finally:
+            self._batching = False
+            self.flush()
+        return stats
+    
+    def _fix_file(self, file_path: str, file_issues: List[DartIssue]) -> List[FixResult]:
+        """Roda os fixers de um arquivo; conflitos entre edições viram falha."""
+        results = []
+        # Edições usam offsets do texto original: a ordem só define
+        # quem ganha num conflito (linhas de baixo primeiro, como antes)
+        file_issues.sort(key=lambda x: x.line, reverse=True)
+        batch = EditBatch()
+        
+        for issue in file_issues: 
+            result = self.fix_issue(issue)
+            if result.success and result.edits:
+                conflict = batch.add(result.edits)
+                if conflict:
+                    result = FixResult(
+                        success=False,
+                        issue=issue,
+                        description=f"Conflito com outra correção no offset {conflict.start_offset}"
+                    )
+            results.append(result)
+            
+            if result.success:
+                logger.info(f"✓ Corrigido: {issue.rule} em {issue. file_path}:{issue.line}")
+            else:
+                logger.debug(f"✗ Não corrigido: {issue.rule} - {result.description}")
         return results
     
+    def _fix_files_parallel(self, groups: List[Tuple[str, List[DartIssue]]],
+                            jobs: int) -> Iterator[List[FixResult]]:
+        """_fix_file em um pool de processos; resultados e logs na ordem de `groups`."""
+        chunksize = max(1, len(groups) // (jobs * 4))
+        if any(i.rule in self.GRAPH_RULES for _, file_issues in groups for i in file_issues):
+            # Atualiza o grafo salvo antes: os workers só leem do disco
+            self.graph
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_fix_worker,
+            initargs=(str(self.project_root), self.disabled_rules, logging.getLogger().level)
+        ) as executor:
+            for group_results, records in executor.map(_fix_file_worker, groups,
+                                                       chunksize=chunksize):
+                for record in records:
+                    logging.getLogger(record.name).handle(record)
+                yield group_results
+    
     # ==================== FIXERS ====================
     
+    def _apply_rule(self, compiled: CompiledRule, issue: DartIssue) -> FixResult:
+        """Fixer genérico das regras declarativas."""
+        rule = compiled.rule
+        if compiled.variants:
+            doc = self._document(issue.file_path)
+            line_idx = issue.line - 1
+            if line_idx >= len(doc.lines):
+                return FixResult(False, issue, "Linha fora do range")
+            
+            context = compiled.context(issue.message)
+            if context is None:
+                return FixResult(False, issue, rule.unmatched)
+            
+            rewritten = compiled.rewrite(doc.lines[line_idx], context)
+            if rewritten:
+                line, variant = rewritten
+                return FixResult(
+                    success=True,
+                    issue=issue,
+                    description=variant.description,
+                    changes_made=[variant.change.format(line=issue.line)] if variant.change else [],
+                    edits=[doc.replace_line(line_idx, line)]
+                )
+        
+        if rule.fallback == 'ignore':
+            return self._add_ignore_comment(issue, rule.rule)
+        return FixResult(False, issue, rule.report.format(file_path=issue.file_path, line=issue.line))
+    
     def _fix_unused_import(self, issue: DartIssue) -> FixResult:
         """Remove import não utilizado."""
-        lines = self._read_file(issue.file_path)
+        doc = self._document(issue.file_path)
+        lines = doc.lines
         line_idx = issue.line - 1
         
         if line_idx >= len(lines):
@@ -459,20 +1719,18 @@ class DartFileFixer:
             return FixResult(False, issue, "Linha não é um import")
         
         # Remove a linha (deleta completamente)
-        del lines[line_idx]
-        
-        self._write_file(issue.file_path, lines)
-        
         return FixResult(
             success=True,
             issue=issue,
             description="Import removido",
-            changes_made=[f"Removida linha {issue.line}:  {original_line. strip()}"]
+            changes_made=[f"Removida linha {issue.line}:  {original_line. strip()}"],
+            edits=[doc.delete_line(line_idx)]
         )
     
     def _fix_unused_element(self, issue: DartIssue) -> FixResult:
         """Adiciona ignore comment para elemento não utilizado."""
-        lines = self._read_file(issue. file_path)
+        doc = self._document(issue. file_path)
+        lines = doc.lines
         line_idx = issue.line - 1
         
         if line_idx >= len(lines):
@@ -482,195 +1740,26 @@ class DartFileFixer:
         indent = len(lines[line_idx]) - len(lines[line_idx].lstrip())
         ignore_comment = ' ' * indent + '// ignore: unused_element\n'
         
-        lines. insert(line_idx, ignore_comment)
-        
-        self._write_file(issue.file_path, lines)
-        
         return FixResult(
             success=True,
             issue=issue,
             description="Adicionado ignore comment",
-            changes_made=[f"Adicionado // ignore: unused_element antes da linha {issue.line}"]
+            changes_made=[f"Adicionado // ignore: unused_element antes da linha {issue.line}"],
+            edits=[doc.insert_before(line_idx, ignore_comment)]
         )
     
-    def _fix_unused_field(self, issue: DartIssue) -> FixResult:
-        """Adiciona ignore comment para field não utilizado."""
-        return self._add_ignore_comment(issue, 'unused_field')
-    
-    def _fix_unused_local_variable(self, issue: DartIssue) -> FixResult:
-        """Adiciona ignore comment para variável local não utilizada."""
-        return self._add_ignore_comment(issue, 'unused_local_variable')
-    
-    def _fix_prefer_const_constructors(self, issue: DartIssue) -> FixResult:
-        """Adiciona const onde necessário."""
-        lines = self._read_file(issue.file_path)
-        line_idx = issue.line - 1
-        
-        if line_idx >= len(lines):
-            return FixResult(False, issue, "Linha fora do range")
-        
-        line = lines[line_idx]
-        
-        # Padrões comuns onde adicionar const
-        patterns = [
-            (r'(\s+)(SizedBox\()', r'\1const SizedBox('),
-            (r'(\s+)(EdgeInsets\. )', r'\1const EdgeInsets. '),
-            (r'(\s+)(BorderRadius\. )', r'\1const BorderRadius. '),
-            (r'(\s+)(Icon\()', r'\1const Icon('),
-            (r'(\s+)(Text\([\'"])', r'\1const Text(\''),
-            (r'(\s+)(Offset\()', r'\1const Offset('),
-            (r'(\s+)(Duration\()', r'\1const Duration('),
-        ]
-        
-        modified = False
-        for pattern, replacement in patterns:
-            if re.search(pattern, line):
-                line = re.sub(pattern, replacement, line, count=1)
-                modified = True
-                break
-        
-        if modified:
-            lines[line_idx] = line
-            self._write_file(issue.file_path, lines)
-            return FixResult(
-                success=True,
-                issue=issue,
-                description="Adicionado const",
-                changes_made=[f"Linha {issue.line}:  adicionado const"]
-            )
-        
-        return self._add_ignore_comment(issue, 'prefer_const_constructors')
-    
-    def _fix_prefer_const_literals(self, issue: DartIssue) -> FixResult:
-        """Adiciona const para literals."""
-        return self._add_ignore_comment(issue, 'prefer_const_literals_to_create_immutables')
-    
-    def _fix_deprecated_member_use(self, issue: DartIssue) -> FixResult:
-        """Tenta corrigir uso de membros deprecated."""
-        lines = self._read_file(issue.file_path)
-        line_idx = issue.line - 1
-        
-        if line_idx >= len(lines):
-            return FixResult(False, issue, "Linha fora do range")
-        
-        line = lines[line_idx]
-        
-        # Mapeamento de deprecated -> novo
-        replacements = {
-            '. withOpacity(':  '.withValues(alpha:  ',
-            'WillPopScope':  'PopScope',
-            'dart: html': 'package:web',
-        }
-        
-        modified = False
-        for old, new in replacements.items():
-            if old in line:
-                line = line.replace(old, new)
-                modified = True
-        
-        if modified:
-            lines[line_idx] = line
-            self._write_file(issue.file_path, lines)
-            return FixResult(
-                success=True,
-                issue=issue,
-                description="Substituído deprecated",
-                changes_made=[f"Linha {issue. line}: atualizado uso deprecated"]
-            )
-        
-        return self._add_ignore_comment(issue, 'deprecated_member_use')
-    
-    def _fix_argument_type(self, issue: DartIssue) -> FixResult:
-        """Tenta corrigir tipos de argumentos incompatíveis - com ignore comments."""
-        # Estratégia: Para argument_type_not_assignable, a maioria requer análise manual.
-        # Solução pragmática: Adicionar ignore comment para evitar bloqueio.
-        # Apenas alguns casos óbvios (dynamic -> String/int/double) podem ser auto-fixados.
-        
-        lines = self._read_file(issue.file_path)
-        line_idx = issue.line - 1
-        
-        if line_idx >= len(lines):
-            return FixResult(False, issue, "Linha fora do range")
-        
-        line = lines[line_idx]
-        
-        # Extrai tipos da mensagem de erro
-        match = re.search(r"argument type '([^']+)' can't be assigned to the parameter type '([^']+)'", issue.message)
-        if not match:
-            return FixResult(False, issue, "Padrao de tipo nao identificado")
-        
-        source_type = match.group(1)
-        target_type = match.group(2).rstrip('?')
-        
-        # Alguns casos muito simples: dynamic para tipos primitivos
-        # Aplicar .toString(), .toInt(), etc
-        if source_type == 'dynamic':
-            # Estratégia simples: tenta encontrar identificadores simples em argumentos
-            # e adiciona cast básico se parecer seguro
-            
-            # Caso 1: map['key'] com target String
-            if target_type == 'String' and ("['" in line or '["' in line):
-                # Tenta substituição simples
-                modified = re.sub(
-                    r'(\w+\[["\'][\w_]+["\']\])',
-                    r'(\1).toString()',
-                    line,
-                    count=1
-                )
-                if modified != line and modified.count('(') <= line.count('(') + 2:
-                    try:
-                        lines[line_idx] = modified
-                        self._write_file(issue.file_path, lines)
-                        return FixResult(True, issue, f"Cast .toString() aplicado")
-                    except:
-                        pass
-            
-            # Caso 2: Variável simples em função
-            elif target_type in ('String', 'int', 'double', 'bool'):
-                cast_map = {'String': '.toString()', 'int': '.toInt() ?? 0', 'double': '.toDouble() ?? 0.0', 'bool': '== true'}
-                cast_expr = cast_map.get(target_type, '')
-                
-                if cast_expr:
-                    # Procura por identificador em argumento de função
-                    patterns = [
-                        (r',\s*(\w+)\s*\)', f', \\1{cast_expr})'),
-                        (r'\(\s*(\w+)\s*\)', f'(\\1{cast_expr})'),
-                        (r',\s*(\w+)\s*,', f', \\1{cast_expr},'),
-                    ]
-                    
-                    for pattern, repl in patterns:
-                        if re.search(pattern, line):
-                            try:
-                                modified = re.sub(pattern, repl, line, count=1)
-                                if modified != line:
-                                    lines[line_idx] = modified
-                                    self._write_file(issue.file_path, lines)
-                                    return FixResult(True, issue, f"Cast {cast_expr} aplicado")
-                            except:
-                                pass
-        
-        # Fallback: Ignora com comentário
-        return self._add_ignore_comment(issue, 'argument_type_not_assignable')
-    
-    def _fix_return_type(self, issue: DartIssue) -> FixResult:
-        """Adiciona ignore ou cast para tipo de retorno inválido."""
-        return self._add_ignore_comment(issue, 'return_of_invalid_type')
-    
     def _fix_undefined_identifier(self, issue: DartIssue) -> FixResult:
-        """Tenta corrigir identificador não definido."""
-        # Alguns casos comuns
-        lines = self._read_file(issue.file_path)
+        """Adiciona o import do arquivo que declara o nome (ou classe/função) indefinido."""
+        doc = self._document(issue.file_path)
         line_idx = issue.line - 1
         
-        if line_idx >= len(lines):
+        if line_idx >= len(doc.lines):
             return FixResult(False, issue, "Linha fora do range")
         
-        line = lines[line_idx]
-        
         # Extrai nome do identificador
-        match = re.search(r"Undefined name '(\w+)'", issue.message)
+        match = UNDEFINED_SYMBOL_PATTERN.search(issue.message)
         if match:
-            identifier = match.group(1)
+            identifier = match.group(1) or match.group(2)
             
             # Verifica se é um problema de encoding
             if any(ord(c) > 127 for c in identifier):
@@ -680,48 +1769,64 @@ class DartFileFixer:
                     issue=issue,
                     description=f"Identificador com caracteres especiais: {identifier}"
                 )
+            
+            result = self._add_symbol_import(issue, doc, identifier)
+            if result:
+                return result
         
         return FixResult(False, issue, "Correção automática não disponível")
     
-    def _fix_dead_code(self, issue: DartIssue) -> FixResult:
-        """Remove ou comenta código morto."""
-        return self._add_ignore_comment(issue, 'dead_code')
-    
-    def _fix_duplicate_import(self, issue:  DartIssue) -> FixResult:
-        """Remove import duplicado."""
-        return self._fix_unused_import(issue)
-    
-    def _fix_unnecessary_import(self, issue: DartIssue) -> FixResult:
-        """Remove import desnecessário."""
-        return self._fix_unused_import(issue)
-    
-    def _fix_file_names(self, issue: DartIssue) -> FixResult:
-        """Reporta arquivos com nomes inválidos."""
+    def _add_symbol_import(self, issue: DartIssue, doc: DartDocument,
+                           symbol: str) -> Optional[FixResult]:
+        """Import mais barato que expõe `symbol` (None se o símbolo não é do projeto)."""
+        providers = self.graph.symbol_index().get(symbol)
+        if not providers:
+            return None
+        
+        libraries = self.graph.declaring_libraries(symbol)
+        if len(libraries) > 1:
+            return FixResult(False, issue, f"'{symbol}' declarado em {len(libraries)} arquivos: "
+                                           f"{', '.join(sorted(libraries))}")
+        
+        from_file = graph_path(os.path.relpath(self._resolve_path(issue.file_path), self.project_root))
+        if self.graph.library_of(from_file) != from_file:
+            return FixResult(False, issue, "Arquivo é `part of`: import vai na biblioteca")
+        entry = self.graph.files.get(from_file)
+        imported = {self.graph.resolve(d.uri, from_file) for d in entry.directives
+                    if d.kind == 'import'} if entry else set()
+        if from_file in libraries or imported & set(providers):
+            return FixResult(False, issue, f"'{symbol}' já é importado (prefixo ou show/hide?)")
+        
+        uri = self.graph.package_uri(providers[0])
         return FixResult(
-            success=False,
-            issue=issue,
-            description=f"Arquivo precisa ser renomeado: {issue.file_path}"
-        )
-    
-    def _fix_uri_does_not_exist(self, issue: DartIssue) -> FixResult:
-        """Reporta imports para URIs inexistentes."""
-        return FixResult(
-            success=False,
+            success=True,
             issue=issue,
-            description=f"Import para arquivo inexistente - verificar manualmente"
+            description=f"Adicionado import de {uri}",
+            changes_made=[f"Import '{uri}' para {symbol}"],
+            edits=[doc.insert_before(self._import_insertion_line(doc), f"import '{uri}';\n")]
         )
     
-    def _fix_depend_on_packages(self, issue: DartIssue) -> FixResult:
-        """Reporta dependência não declarada."""
-        return FixResult(
-            success=False,
-            issue=issue,
-            description="Adicionar dependência ao pubspec.yaml"
-        )
+    @staticmethod
+    def _import_insertion_line(doc: DartDocument) -> int:
+        """Linha logo após a última diretiva import/export/library do cabeçalho."""
+        insert_at = 0
+        idx = 0
+        while idx < len(doc.lines):
+            stripped = doc.lines[idx].strip()
+            if stripped.startswith(('import ', 'export ', 'library ')):
+                # Diretiva pode continuar nas linhas seguintes (show/hide)
+                while idx < len(doc.lines) - 1 and ';' not in doc.lines[idx]:
+                    idx += 1
+                insert_at = idx + 1
+            elif stripped and not stripped.startswith(('//', '/*', '*', '@')):
+                break
+            idx += 1
+        return insert_at
     
     def _add_ignore_comment(self, issue: DartIssue, rule: str) -> FixResult:
         """Adiciona comentário de ignore genérico."""
-        lines = self._read_file(issue.file_path)
+        doc = self._document(issue.file_path)
+        lines = doc.lines
         line_idx = issue.line - 1
         
         if line_idx >= len(lines):
@@ -743,15 +1848,45 @@ class DartFileFixer:
         indent = len(current_line) - len(current_line. lstrip())
         ignore_comment = ' ' * indent + f'// ignore: {rule}\n'
         
-        lines.insert(line_idx, ignore_comment)
+        return FixResult(
+            success=True,
+            issue=issue,
+            description=f"Adicionado // ignore: {rule}",
+            changes_made=[f"Adicionado ignore comment antes da linha {issue.line}"],
+            edits=[doc.insert_before(line_idx, ignore_comment)]
+        )
+    
+    def _fix_uri_does_not_exist(self, issue: DartIssue) -> FixResult:
+        """Aponta import/export/part quebrado para o arquivo que existe, se só houver um."""
+        doc = self._document(issue.file_path)
+        line_idx = issue.line - 1
         
-        self._write_file(issue.file_path, lines)
+        if line_idx >= len(doc.lines):
+            return FixResult(False, issue, "Linha fora do range")
         
+        line = doc.lines[line_idx]
+        match = URI_DIRECTIVE_PATTERN.search(line)
+        if not match:
+            return FixResult(False, issue, "Import para arquivo inexistente - verificar manualmente")
+        
+        uri = match.group(3)
+        from_file = graph_path(os.path.relpath(self._resolve_path(issue.file_path), self.project_root))
+        candidates = self.graph.replacement_candidates(uri, from_file)
+        if len(candidates) != 1:
+            description = "Import para arquivo inexistente - verificar manualmente"
+            if candidates:
+                description += f" (candidatos: {', '.join(sorted(candidates))})"
+            return FixResult(False, issue, description)
+        
+        target = candidates.pop()
+        new_uri = self.graph.package_uri(target) if uri.startswith('package:') else None
+        new_uri = new_uri or graph_path(os.path.relpath(target, os.path.dirname(from_file)))
         return FixResult(
             success=True,
             issue=issue,
-            description=f"Adicionado // ignore: {rule}",
-            changes_made=[f"Adicionado ignore comment antes da linha {issue.line}"]
+            description=f"URI corrigida para {new_uri}",
+            changes_made=[f"Linha {issue.line}: {uri} -> {new_uri}"],
+            edits=[doc.replace_line(line_idx, line[:match.start(3)] + new_uri + line[match.end(3):])]
         )
     
     def _fix_dynamic_to_string(self, issue: DartIssue) -> FixResult:
@@ -762,7 +1897,7 @@ class DartFileFixer:
         if "dynamic" not in issue.message or "String" not in issue.message:
             return FixResult(False, issue, "Não é conversão dynamic->String")
         
-        lines = self._read_file(issue.file_path)
+        lines = self._document(issue.file_path).lines
         line_idx = issue.line - 1
         
         if line_idx >= len(lines):
@@ -790,7 +1925,8 @@ class DartFileFixer:
     
     def _fix_unexpected_token(self, issue: DartIssue) -> FixResult:
         """Corrige erros de token inesperado - muitas vezes são corrupções de encoding."""
-        lines = self._read_file(issue.file_path)
+        doc = self._document(issue.file_path)
+        lines = doc.lines
         line_idx = issue.line - 1
         
         if line_idx >= len(lines):
@@ -802,14 +1938,13 @@ class DartFileFixer:
         # Padrão criativo 1: mport em vez de import (corrupção de encoding comum)
         if line.strip().startswith('mport '):
             line = line.replace('mport ', 'import ', 1)
-            lines[line_idx] = line
-            self._write_file(issue.file_path, lines)
             
             return FixResult(
                 success=True,
                 issue=issue,
                 description="Corrigido 'mport' para 'import' (corrupção de encoding)",
-                changes_made=[f"Linha {issue.line}: mport -> import"]
+                changes_made=[f"Linha {issue.line}: mport -> import"],
+                edits=[doc.replace_line(line_idx, line)]
             )
         
         # Padrão criativo 2: Falta de símbolo em fim de linha (const, etc)
@@ -818,38 +1953,21 @@ class DartFileFixer:
             # Pode ser falta de ; no fim
             if not line.strip().endswith(';'):
                 line = line.rstrip() + ';\\n' if line.endswith('\\n') else line + ';'
-                lines[line_idx] = line
-                self._write_file(issue.file_path, lines)
                 
                 return FixResult(
                     success=True,
                     issue=issue,
                     description="Adicionado ponto-e-vírgula faltante",
-                    changes_made=[f"Linha {issue.line}: adicionado ;"]
+                    changes_made=[f"Linha {issue.line}: adicionado ;"],
+                    edits=[doc.replace_line(line_idx, line)]
                 )
         
         return FixResult(False, issue, "Padrão de erro inesperado não reconhecido")
     
-    def _fix_use_build_context_synchronously(self, issue: DartIssue) -> FixResult:
-        """Adiciona ignor para uso síncrono de BuildContext."""
-        # Este é um warning sobre uso async/await - melhor é adicionar ignore comment
-        return self._add_ignore_comment(issue, 'use_build_context_synchronously')
-    
-    def _fix_implicit_this_reference_in_initializer(self, issue: DartIssue) -> FixResult:
-        """Adiciona 'this.' quando necessário em inicializadores."""
-        return self._add_ignore_comment(issue, 'implicit_this_reference_in_initializer')
-    
-    def _fix_extra_positional_arguments(self, issue: DartIssue) -> FixResult:
-        """Reporta argumentos posicionais extras."""
-        return FixResult(False, issue, "Argumentos extras - requer análise manual da assinatura da função")
-    
-    def _fix_list_element_type_not_assignable(self, issue: DartIssue) -> FixResult:
-        """Adiciona ignore para tipo de elemento de lista incompatível."""
-        return self._add_ignore_comment(issue, 'list_element_type_not_assignable')
-    
     def _fix_illegal_character(self, issue: DartIssue) -> FixResult:
         """Tenta corrigir caracteres ilegais - muitas vezes de encoding."""
-        lines = self._read_file(issue.file_path)
+        doc = self._document(issue.file_path)
+        lines = doc.lines
         line_idx = issue.line - 1
         
         if line_idx >= len(lines):
@@ -865,19 +1983,54 @@ class DartFileFixer:
             if char in line:
                 # Remove caracteres ilegais
                 new_line = line.replace(char, '')
-                lines[line_idx] = new_line
-                self._write_file(issue.file_path, lines)
                 
                 return FixResult(
                     success=True,
                     issue=issue,
                     description="Removidos caracteres de controle ilegais",
-                    changes_made=[f"Linha {issue.line}: removidos caracteres de controle"]
+                    changes_made=[f"Linha {issue.line}: removidos caracteres de controle"],
+                    edits=[doc.replace_line(line_idx, new_line)]
                 )
         
         return FixResult(False, issue, "Caractere ilegal não identificado")
 
 
+# Estado dos processos do `fix_all(jobs=N)`
+_worker_fixer: Optional[DartFileFixer] = None
+_worker_records: List[logging.LogRecord] = []
+
+
+class _RecordCollector(logging.Handler):
+    """Guarda os logs do worker para o processo principal reemitir em ordem."""
+    
+    def emit(self, record: logging.LogRecord):
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        _worker_records.append(record)
+
+
+def _init_fix_worker(project_root: str, disabled_rules: Tuple[str, ...], level: int):
+    global _worker_fixer
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_RecordCollector())
+    root.setLevel(level)
+    _worker_fixer = DartFileFixer(project_root, disabled_rules=disabled_rules)
+    _worker_fixer._graph_jobs = 1
+    _worker_fixer._batching = True
+
+
+def _fix_file_worker(group: Tuple[str, List[DartIssue]]) -> Tuple[List[FixResult], List[logging.LogRecord]]:
+    """Corrige um arquivo no worker; só calcula edições, quem grava é o principal."""
+    file_path, file_issues = group
+    _worker_records.clear()
+    results = _worker_fixer._fix_file(file_path, file_issues)
+    _worker_fixer.flush()
+    return results, list(_worker_records)
+
+
 class ReportGenerator:
     """Gera relatórios das correções."""
     
@@ -923,10 +2076,10 @@ class ReportGenerator:
         return report
     
     def generate_detailed_report(self, parser:  AnalyzerParser, 
-                                  results: List[FixResult]) -> Dict: 
-        """Gera relatório detalhado em JSON."""
+                                  results: List[FixResult],
+                                  bisection: Optional[Dict] = None) -> Dict: 
+        """Gera relatório detalhado em JSON (com os culpados da bisseção, se houve)."""
         by_rule = parser.get_issues_by_rule()
-        by_file = parser.get_issues_by_file()
         
         # Agrupa resultados por arquivo
         results_by_file = defaultdict(list)
@@ -956,11 +2109,11 @@ class ReportGenerator:
             },
             'files_summary': {
                 file:  {
-                    'total': len(issues),
-                    'errors': sum(1 for i in issues if i.issue_type == IssueType.ERROR),
-                    'warnings': sum(1 for i in issues if i.issue_type == IssueType. WARNING),
+                    'total': stats.total_issues,
+                    'errors': stats.errors,
+                    'warnings': stats.warnings,
                 }
-                for file, issues in by_file.items()
+                for file, stats in parser.stats.items()
             },
             'fix_results': dict(results_by_file),
             'unfixed_critical': [
@@ -975,10 +2128,13 @@ class ReportGenerator:
                 if not r.success and r.issue. severity == IssueSeverity.CRITICAL
             ]
         }
+        if bisection is not None:
+            report['regression_bisection'] = bisection
         
         return report
     
-    def save_reports(self, parser: AnalyzerParser, results: List[FixResult]):
+    def save_reports(self, parser: AnalyzerParser, results: List[FixResult],
+                     bisection: Optional[Dict] = None):
         """Salva relatórios em arquivos."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -989,7 +2145,7 @@ class ReportGenerator:
             f.write(summary)
         
         # Relatório JSON detalhado
-        detailed = self.generate_detailed_report(parser, results)
+        detailed = self.generate_detailed_report(parser, results, bisection)
         json_path = self.output_dir / f"detailed_{timestamp}.json"
         with open(json_path, 'w', encoding='utf-8') as f:
             json.dump(detailed, f, indent=2, ensure_ascii=False)
@@ -1020,21 +2176,49 @@ class PubspecFixer:
         self.project_root = Path(project_root)
         self.pubspec_path = self.project_root / "pubspec.yaml"
     
-    def find_missing_dependencies(self, issues: List[DartIssue]) -> Set[str]:
-        """Encontra dependências faltantes baseado nos erros."""
+    def declared_dependencies(self) -> Set[str]:
+        """Pacotes em dependencies/dev_dependencies/dependency_overrides."""
+        declared = set()
+        section = None
+        try:
+            with open(self.pubspec_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if re.match(r'^\S', line):
+                        section = line.split(':', 1)[0].strip()
+                        continue
+                    match = re.match(r'^  ([A-Za-z_]\w*):', line)
+                    if match and section in ('dependencies', 'dev_dependencies', 'dependency_overrides'):
+                        declared.add(match.group(1))
+        except OSError:
+            pass
+        return declared
+    
+    def find_missing_dependencies(self, issues: List[DartIssue],
+                                  graph: Optional[ImportGraph] = None) -> Set[str]:
+        """
+        Encontra dependências faltantes baseado nos erros e, com o grafo de
+        imports, nos pacotes importados em lib/ que não estão no pubspec.
+        """
         missing = set()
+        declared = self.declared_dependencies()
+        own_package = read_package_name(str(self.project_root))
         
         for issue in issues:
             if issue. rule == 'depend_on_referenced_packages':
                 # Extrai nome do pacote da mensagem
                 match = re.search(r"package '(\w+)'", issue.message)
-                if match:
-                    missing.add(match.group(1))
             elif issue.rule == 'uri_does_not_exist': 
                 # Extrai pacote do import
-                match = re.search(r"package: (\w+)/", issue.message)
-                if match:
-                    missing.add(match.group(1))
+                match = re.search(r"package:(\w+)/", issue.message)
+            else:
+                continue
+            # O próprio projeto e o que já está no pubspec não faltam (o issue
+            # pode ser de um snapshot anterior ao `flutter pub get`)
+            if match and match.group(1) != own_package and match.group(1) not in declared:
+                missing.add(match.group(1))
+        
+        if graph is not None:
+            missing |= graph.external_packages() - declared
         
         return missing
     
@@ -1050,21 +2234,560 @@ class PubspecFixer:
         return suggestions
 
 
-def run_flutter_analyze(project_path: str) -> str:
-    """Executa flutter analyze e retorna output."""
+def analyze_command(target: str = 'lib', output_format: str = 'text') -> List[str]:
+    """Monta o comando do analyzer para o formato desejado."""
+    if output_format in ('machine', 'json'):
+        # Formatos estruturados só existem no `dart analyze`
+        return ['dart', 'analyze', f'--format={output_format}', target]
+    return ['flutter', 'analyze', target]
+
+
+def stream_flutter_analyze(project_path: str, target: str = 'lib',
+                           output_format: str = 'text') -> Iterator[str]:
+    """Executa flutter analyze e gera as linhas do output conforme chegam no pipe."""
+    try:
+        process = subprocess.Popen(
+            analyze_command(target, output_format),
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1
+        )
+    except Exception as e:
+        logger.error(f"Erro ao executar flutter analyze: {e}")
+        return
+    
     try:
+        for line in process.stdout:
+            yield line
+    finally:
+        # Consumidor pode parar antes do fim (ex: break) - não deixa processo órfão
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+
+def run_analyzer_on_files(project_path: str, command: List[str], files: Iterable[str],
+                          output_format: str = 'auto', timeout: int = 300,
+                          chunk_size: int = 100) -> List[DartIssue]:
+    """
+    Roda o analyzer só nos arquivos dados e retorna os issues.
+    
+    `command` é o analyzer sem alvo; os arquivos vão como argumentos, em
+    lotes para não estourar o limite de linha de comando do Windows.
+    """
+    ordered = sorted(files)
+    issues: List[DartIssue] = []
+    for start in range(0, len(ordered), chunk_size):
         result = subprocess.run(
-            ['flutter', 'analyze', 'lib'],
+            command + ordered[start:start + chunk_size],
             cwd=project_path,
             capture_output=True,
             text=True,
+            timeout=timeout,
             encoding='utf-8',
             errors='replace'
         )
-        return result.stdout + result.stderr
-    except Exception as e:
-        logger.error(f"Erro ao executar flutter analyze: {e}")
-        return ""
+        chunk_parser = AnalyzerParser(output_format, project_root=project_path)
+        issues.extend(chunk_parser.parse_content(result.stdout + result.stderr))
+    return issues
+
+
+class AnalysisCache:
+    """
+    Cache em disco dos diagnósticos por arquivo .dart.
+    
+    Cada entrada guarda o SHA-256 do arquivo e os issues da última análise.
+    O cache inteiro depende do hash de analysis_options.yaml + pubspec.lock:
+    se um deles mudar, tudo é descartado. Um arquivo alterado invalida também
+    quem o importa diretamente (via ImportGraph), já que os erros dele
+    dependem das declarações importadas.
+    """
+    
+    CACHE_FILE = '.analysis_cache.json'
+    CONFIG_FILES = ('analysis_options.yaml', 'pubspec.lock')
+    VERSION = 1
+    
+    def __init__(self, project_root: str, target: str = 'lib',
+                 graph: Optional[ImportGraph] = None):
+        self.project_root = Path(project_root)
+        self.target = target
+        self.cache_path = self.project_root / self.CACHE_FILE
+        self.graph = graph
+        self.config_hash = self._config_hash()
+        # arquivo (relativo, com '/') -> {'hash': sha256, 'issues': [linhas]}
+        self.entries: Dict[str, dict] = {}
+        self._load()
+    
+    @staticmethod
+    def hash_file(path: Path) -> Optional[str]:
+        try:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+    
+    def _config_hash(self) -> str:
+        digest = hashlib.sha256()
+        for name in self.CONFIG_FILES:
+            digest.update(name.encode())
+            digest.update((self.hash_file(self.project_root / name) or '-').encode())
+        return digest.hexdigest()
+    
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != self.VERSION:
+            return
+        if data.get('config') != self.config_hash:
+            logger.info("analysis_options.yaml/pubspec.lock mudaram - cache de análise descartado")
+            return
+        self.entries = data.get('files', {})
+    
+    def save(self):
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'config': self.config_hash,
+                       'files': self.entries}, f)
+    
+    def current_hashes(self) -> Dict[str, str]:
+        """Hash atual de cada .dart do target."""
+        hashes = {}
+        for path in (self.project_root / self.target).rglob('*.dart'):
+            file_hash = self.hash_file(path)
+            if file_hash:
+                hashes[graph_path(str(path.relative_to(self.project_root)))] = file_hash
+        return hashes
+    
+    def stale_files(self, hashes: Optional[Dict[str, str]] = None) -> Set[str]:
+        """
+        Arquivos que precisam ser reanalisados: novos, alterados e quem
+        importa diretamente um arquivo alterado/removido.
+        """
+        hashes = hashes if hashes is not None else self.current_hashes()
+        changed = {f for f, h in hashes.items() if self.entries.get(f, {}).get('hash') != h}
+        removed = set(self.entries) - set(hashes)
+        for file_path in removed:
+            del self.entries[file_path]
+        if not (changed | removed):
+            return set()
+        if self.graph is None:
+            self.graph = ImportGraph.load(str(self.project_root))
+        return self.graph.affected_files(changed | removed) & set(hashes)
+    
+    def store(self, issues: Iterable[DartIssue], files: Iterable[str],
+              hashes: Optional[Dict[str, str]] = None):
+        """Grava os diagnósticos de `files` (arquivo sem issues fica com lista vazia)."""
+        by_file: Dict[str, list] = defaultdict(list)
+        for issue in issues:
+            by_file[graph_path(issue.file_path)].append([
+                issue.issue_type.value, issue.severity.name, issue.rule, issue.line,
+                issue.column, issue.message, issue.file_path, issue.end_line,
+                issue.end_column, issue.offset, issue.length, issue.correction
+            ])
+        for file_path in files:
+            file_path = graph_path(file_path)
+            file_hash = (hashes or {}).get(file_path) or self.hash_file(self.project_root / file_path)
+            if file_hash:
+                self.entries[file_path] = {'hash': file_hash, 'issues': by_file.get(file_path, [])}
+    
+    def issues(self) -> List[DartIssue]:
+        """Todos os issues em cache, na ordem dos arquivos."""
+        issues = []
+        for file_path in sorted(self.entries):
+            for (issue_type, severity, rule, line, column, message, original_path,
+                 end_line, end_column, offset, length, correction) in self.entries[file_path]['issues']:
+                issues.append(DartIssue(
+                    issue_type=IssueType(issue_type),
+                    message=message,
+                    file_path=original_path,
+                    line=line,
+                    column=column,
+                    rule=rule,
+                    severity=IssueSeverity[severity],
+                    end_line=end_line,
+                    end_column=end_column,
+                    offset=offset,
+                    length=length,
+                    correction=correction
+                ))
+        return issues
+    
+    def analyze(self, command: List[str], output_format: str = 'auto',
+                timeout: int = 300) -> List[DartIssue]:
+        """
+        Snapshot completo reanalisando só o que o cache não cobre.
+        
+        Se quase tudo estiver inválido (ex: primeira execução) roda o target
+        inteiro de uma vez em vez de em lotes.
+        """
+        hashes = self.current_hashes()
+        stale = self.stale_files(hashes)
+        if stale:
+            logger.info(f"Cache de análise: {len(stale)} de {len(hashes)} arquivos para reanalisar")
+            if len(stale) > len(hashes) // 2:
+                fresh = run_analyzer_on_files(str(self.project_root), command, [self.target],
+                                              output_format, timeout)
+                stale = set(hashes)
+            else:
+                fresh = run_analyzer_on_files(str(self.project_root), command, stale,
+                                              output_format, timeout)
+            self.store(fresh, stale, hashes)
+            self.save()
+        else:
+            logger.info(f"Cache de análise: {len(hashes)} arquivos servidos do cache")
+        return self.issues()
+
+
+def _tee_lines(lines: Iterable[str], path: str) -> Iterator[str]:
+    """Repassa as linhas gravando cada uma em `path`."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line)
+            yield line
+
+
+def run_flutter_analyze(project_path: str) -> str:
+    """Executa flutter analyze e retorna output."""
+    return ''.join(stream_flutter_analyze(project_path))
+
+
+class AnalysisServerClient:
+    """
+    Cliente do analysis server do Dart (protocolo JSON por linha via stdio).
+    
+    O servidor sobe uma vez e fica quente: depois das correções basta avisar
+    quais arquivos mudaram (notify_changed) e ler os diagnósticos de novo,
+    sem repetir o cold start do `flutter analyze`. Os erros chegam por evento
+    (`analysis.errors`) e ficam guardados por arquivo.
+    
+    Uso:
+        with AnalysisServerClient('.') as client:
+            issues = client.analyze()
+            # ... aplica correções ...
+            client.notify_changed(['lib/main.dart'])
+            issues = client.diagnostics()
+    """
+    
+    DEFAULT_COMMAND = ['dart', 'language-server', '--protocol=analyzer']
+    
+    def __init__(self, project_path: str = '.', command: Optional[List[str]] = None,
+                 target: str = 'lib', timeout: float = 300):
+        self.project_path = os.path.abspath(project_path)
+        self.root = os.path.join(self.project_path, target)
+        self.command = command or self.DEFAULT_COMMAND
+        self.timeout = timeout
+        self.process: Optional[subprocess.Popen] = None
+        # arquivo absoluto -> lista de erros no formato do servidor
+        self.errors: Dict[str, list] = {}
+        self._cond = threading.Condition()
+        self._responses: Dict[str, dict] = {}
+        self._next_id = 0
+        self._connected = False
+        self._closed = False
+        self._analyzing = False
+        # Incrementa a cada fim de análise (isAnalyzing -> false)
+        self._analysis_runs = 0
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def start(self) -> 'AnalysisServerClient':
+        """Sobe o servidor e espera o `server.connected`."""
+        if self.process:
+            return self
+        logger.info(f"Iniciando analysis server: {' '.join(self.command)}")
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=self.project_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            bufsize=1
+        )
+        threading.Thread(target=self._read_loop, daemon=True).start()
+        self._wait(lambda: self._connected, 'server.connected')
+        self.request('server.setSubscriptions', {'subscriptions': ['STATUS']})
+        return self
+    
+    def close(self):
+        """Pede shutdown; mata o processo se ele não sair sozinho."""
+        if not self.process:
+            return
+        try:
+            if not self._closed:
+                self.request('server.shutdown', timeout=10)
+        except (RuntimeError, TimeoutError, OSError):
+            pass
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+    
+    # ==================== PROTOCOLO ====================
+    
+    def request(self, method: str, params: Optional[dict] = None,
+                timeout: Optional[float] = None) -> dict:
+        """Envia um request e espera a resposta com o mesmo id."""
+        with self._cond:
+            self._next_id += 1
+            request_id = str(self._next_id)
+        message = {'id': request_id, 'method': method}
+        if params is not None:
+            message['params'] = params
+        self.process.stdin.write(json.dumps(message) + '\n')
+        self.process.stdin.flush()
+        
+        self._wait(lambda: request_id in self._responses, method, timeout)
+        with self._cond:
+            response = self._responses.pop(request_id)
+        if 'error' in response:
+            raise RuntimeError(f"{method}: {response['error'].get('message', response['error'])}")
+        return response.get('result') or {}
+    
+    def _wait(self, predicate: Callable[[], bool], what: str, timeout: Optional[float] = None):
+        with self._cond:
+            self._cond.wait_for(lambda: predicate() or self._closed,
+                                self.timeout if timeout is None else timeout)
+            if predicate():
+                return
+            if self._closed:
+                raise RuntimeError(f"Analysis server encerrou aguardando {what}")
+        raise TimeoutError(f"Timeout aguardando {what}")
+    
+    def _read_loop(self):
+        """Thread leitora: respostas e eventos do stdout do servidor."""
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                # Servidor pode imprimir avisos fora do protocolo
+                continue
+            with self._cond:
+                self._handle_message(message)
+                self._cond.notify_all()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+    
+    def _handle_message(self, message: dict):
+        if 'id' in message and 'event' not in message:
+            self._responses[message['id']] = message
+            return
+        event = message.get('event')
+        params = message.get('params', {})
+        if event == 'server.connected':
+            self._connected = True
+        elif event == 'analysis.errors':
+            self.errors[params['file']] = params.get('errors', [])
+        elif event == 'analysis.flushResults':
+            for file_path in params.get('files', []):
+                self.errors.pop(file_path, None)
+        elif event == 'server.status' and 'analysis' in params:
+            analyzing = params['analysis'].get('isAnalyzing', False)
+            if self._analyzing and not analyzing:
+                self._analysis_runs += 1
+            self._analyzing = analyzing
+        elif event == 'server.error':
+            logger.warning(f"Analysis server: {params.get('message')}")
+    
+    # ==================== ANÁLISE ====================
+    
+    def analyze(self, parser: Optional[AnalyzerParser] = None) -> List[DartIssue]:
+        """Análise completa do target (primeira vez aquece o servidor)."""
+        self.start()
+        runs = self._analysis_runs
+        self.request('analysis.setAnalysisRoots', {'included': [self.root], 'excluded': []})
+        self._wait(lambda: self._analysis_runs > runs, 'fim da análise')
+        return self.diagnostics(parser)
+    
+    def notify_changed(self, paths: Iterable[str]):
+        """
+        Avisa o servidor que arquivos mudaram em disco.
+        
+        O conteúdo atual vai como overlay (não depende do file watcher) e os
+        erros dos próprios arquivos são pedidos na hora; dependentes chegam
+        por evento até o servidor ficar ocioso.
+        """
+        files = {}
+        for path in paths:
+            path = os.path.join(self.project_path, path)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    files[path] = {'type': 'add', 'content': f.read()}
+            else:
+                files[path] = {'type': 'remove'}
+        if not files:
+            return
+        self.request('analysis.updateContent', {'files': files})
+        
+        for path in files:
+            if files[path]['type'] == 'add' and path.endswith('.dart'):
+                # getErrors só responde quando os erros do arquivo estão atualizados
+                result = self.request('analysis.getErrors', {'file': path})
+                with self._cond:
+                    self.errors[path] = result.get('errors', [])
+    
+    def diagnostics(self, parser: Optional[AnalyzerParser] = None) -> List[DartIssue]:
+        """Issues atuais (espera a análise em andamento terminar)."""
+        self._wait(lambda: not self._analyzing, 'fim da análise')
+        parser = parser or AnalyzerParser(project_root=self.project_path)
+        with self._cond:
+            errors = dict(self.errors)
+        return parser.parse_server_errors(errors)
+
+
+def normalize_message(message: str) -> str:
+    """Mensagem sem ponto final e com espaços colapsados (texto vs machine/json)."""
+    return ' '.join(message.split()).rstrip('.')
+
+
+def issue_key(issue: DartIssue) -> Tuple[str, str, str]:
+    """Identidade de um issue entre snapshots (independe da linha)."""
+    return (normalize_path(issue.file_path), issue.rule, normalize_message(issue.message))
+
+
+def merge_scoped_snapshot(previous: List[DartIssue], scoped: List[DartIssue],
+                          files: Iterable[str]) -> List[DartIssue]:
+    """
+    Snapshot completo a partir de uma reanálise parcial.
+    
+    Issues de `files` vêm de `scoped`; os demais arquivos mantêm os issues
+    do snapshot anterior.
+    """
+    reanalyzed = {normalize_path(f) for f in files}
+    merged = [i for i in previous if normalize_path(i.file_path) not in reanalyzed]
+    merged.extend(scoped)
+    return merged
+
+
+@dataclass
+class SnapshotDiff:
+    """Diferença entre dois snapshots do analyzer."""
+    resolved: List[DartIssue] = field(default_factory=list)
+    introduced: List[DartIssue] = field(default_factory=list)
+    # (antes, depois) - mesmo issue em outra linha
+    moved: List[Tuple[DartIssue, DartIssue]] = field(default_factory=list)
+    unchanged: int = 0
+    
+    def by_rule(self) -> Dict[str, Dict[str, int]]:
+        """Contagens resolved/introduced/moved por regra."""
+        return self._group(lambda issue: issue.rule)
+    
+    def by_file(self) -> Dict[str, Dict[str, int]]:
+        """Contagens resolved/introduced/moved por arquivo."""
+        return self._group(lambda issue: normalize_path(issue.file_path))
+    
+    def _group(self, key: Callable[[DartIssue], str]) -> Dict[str, Dict[str, int]]:
+        groups: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {'resolved': 0, 'introduced': 0, 'moved': 0})
+        for issue in self.resolved:
+            groups[key(issue)]['resolved'] += 1
+        for issue in self.introduced:
+            groups[key(issue)]['introduced'] += 1
+        for _, issue in self.moved:
+            groups[key(issue)]['moved'] += 1
+        return dict(groups)
+    
+    def summary(self) -> Dict[str, int]:
+        return {
+            'resolved': len(self.resolved),
+            'introduced': len(self.introduced),
+            'moved': len(self.moved),
+            'unchanged': self.unchanged,
+        }
+
+
+def diff_snapshots(before: Iterable[DartIssue], after: Iterable[DartIssue],
+                   line_tolerance: Optional[int] = None) -> SnapshotDiff:
+    """
+    Compara dois snapshots em tempo linear.
+    
+    Issues são agrupados em buckets por (arquivo, regra, mensagem normalizada).
+    Dentro de cada bucket, linhas idênticas casam primeiro (unchanged); as
+    sobras casam em ordem de linha como moved, desde que o deslocamento não
+    passe de `line_tolerance` (None = qualquer). O que sobra é resolved
+    (só no antes) ou introduced (só no depois).
+    """
+    buckets: Dict[Tuple[str, str, str], Tuple[List[DartIssue], List[DartIssue]]] = \
+        defaultdict(lambda: ([], []))
+    for issue in before:
+        buckets[issue_key(issue)][0].append(issue)
+    for issue in after:
+        buckets[issue_key(issue)][1].append(issue)
+    
+    diff = SnapshotDiff()
+    for old_issues, new_issues in buckets.values():
+        if not new_issues:
+            diff.resolved.extend(old_issues)
+            continue
+        if not old_issues:
+            diff.introduced.extend(new_issues)
+            continue
+        
+        # Casamento exato por linha
+        new_by_line: Dict[int, List[DartIssue]] = defaultdict(list)
+        for issue in new_issues:
+            new_by_line[issue.line].append(issue)
+        old_left = []
+        for issue in old_issues:
+            same_line = new_by_line.get(issue.line)
+            if same_line:
+                same_line.pop()
+                diff.unchanged += 1
+            else:
+                old_left.append(issue)
+        new_left = [issue for group in new_by_line.values() for issue in group]
+        
+        # Sobras: pareia em ordem de linha (deslocamento por inserção/remoção)
+        old_left.sort(key=lambda i: i.line)
+        new_left.sort(key=lambda i: i.line)
+        for old_issue, new_issue in zip(old_left, new_left):
+            if line_tolerance is None or abs(new_issue.line - old_issue.line) <= line_tolerance:
+                diff.moved.append((old_issue, new_issue))
+            else:
+                diff.resolved.append(old_issue)
+                diff.introduced.append(new_issue)
+        diff.resolved.extend(old_left[len(new_left):])
+        diff.introduced.extend(new_left[len(old_left):])
+    
+    return diff
+
+
+def print_snapshot_diff(diff: SnapshotDiff, limit: int = 20):
+    """Mostra resumo do diff, regras com issues novos e os issues introduzidos."""
+    summary = diff.summary()
+    print(f"\n[*] DIFF: {summary['resolved']} resolvidos, {summary['introduced']} introduzidos, "
+          f"{summary['moved']} movidos, {summary['unchanged']} inalterados")
+    
+    if not diff.introduced:
+        return
+    
+    by_rule = sorted(diff.by_rule().items(), key=lambda item: item[1]['introduced'], reverse=True)
+    print("\n[!] Regras com issues novos:")
+    for rule, counts in by_rule:
+        if counts['introduced']:
+            print(f"  {counts['introduced']:4d} +  {counts['resolved']:4d} -  {rule}")
+    
+    print("\n[!] Issues introduzidos:")
+    for issue in diff.introduced[:limit]:
+        print(f"  + {issue.file_path}:{issue.line} [{issue.rule}] {issue.message[:80]}")
+    if len(diff.introduced) > limit:
+        print(f"  ... e mais {len(diff.introduced) - limit} issues")
 
 
 class ValidationManager:
@@ -1100,7 +2823,61 @@ class ValidationManager:
         except Exception as e:
             return {'compared': False, 'error': str(e)}
     
-    def validate_fixes(self, initial_issues: int, final_issues: int, results: List[FixResult]) -> Dict:
+    def diff(self, initial: List[DartIssue], final: List[DartIssue]) -> SnapshotDiff:
+        """Issues resolvidos/introduzidos/movidos entre a análise inicial e a final."""
+        return diff_snapshots(initial, final)
+    
+    def files_to_restore(self, diff: SnapshotDiff, results: List[FixResult]) -> Set[str]:
+        """
+        Arquivos modificados que devem voltar ao backup após uma regressão.
+        
+        Só os arquivos alterados onde apareceram issues novos. Se os issues
+        novos estão em arquivos que não foram tocados (ex: quem importa um
+        arquivo alterado), não dá para apontar o culpado e restaura todos.
+        """
+        modified = {r.issue.file_path for r in results if r.success}
+        introduced_files = {normalize_path(i.file_path) for i in diff.introduced}
+        culprits = {f for f in modified if normalize_path(f) in introduced_files}
+        if introduced_files - {normalize_path(f) for f in modified}:
+            return modified
+        return culprits
+    
+    def scoped_files(self, results: List[FixResult],
+                     graph: Optional[ImportGraph] = None) -> Set[str]:
+        """Arquivos alterados pelos fixes + quem os importa diretamente."""
+        modified = {r.issue.file_path for r in results if r.success}
+        if not modified:
+            return set()
+        graph = graph or ImportGraph.load(str(self.project_root))
+        # O grafo inclui test/, mas o snapshot anterior é só do lib/
+        return {f for f in graph.affected_files(modified) if f.startswith('lib/')}
+    
+    def reanalyze_scoped(self, previous: List[DartIssue], results: List[FixResult],
+                         command: List[str], output_format: str = 'auto',
+                         timeout: int = 300, chunk_size: int = 100,
+                         cache: Optional['AnalysisCache'] = None
+                         ) -> Tuple[List[DartIssue], Set[str]]:
+        """
+        Reanalisa só o escopo afetado pelos fixes e junta ao snapshot anterior.
+        
+        `command` é o analyzer sem alvo (ex: ['flutter', 'analyze', '--no-pub']).
+        Com `cache`, os diagnósticos novos atualizam o cache em disco.
+        Retorna (snapshot completo, arquivos reanalisados).
+        """
+        files = self.scoped_files(results)
+        if not files:
+            return list(previous), files
+        
+        scoped = run_analyzer_on_files(str(self.project_root), command, files,
+                                       output_format, timeout, chunk_size)
+        if cache is not None:
+            cache.store(scoped, files)
+        
+        logger.info(f"Reanálise parcial: {len(files)} arquivos ({len(scoped)} issues)")
+        return merge_scoped_snapshot(previous, scoped, files), files
+    
+    def validate_fixes(self, initial_issues: int, final_issues: int, results: List[FixResult],
+                       diff: Optional[SnapshotDiff] = None) -> Dict:
         """Valida se as correções melhoraram ou pioraram a situação."""
         successful = sum(1 for r in results if r.success)
         failed = sum(1 for r in results if not r.success)
@@ -1121,6 +2898,10 @@ class ValidationManager:
             'status': 'IMPROVED' if improvement > 0 else ('UNCHANGED' if improvement == 0 else 'REGRESSED')
         }
         
+        if diff is not None:
+            validation['diff'] = diff.summary()
+            validation['diff_by_rule'] = diff.by_rule()
+        
         return validation
     
     def restore_from_backup(self, file_path: str) -> bool:
@@ -1139,6 +2920,499 @@ class ValidationManager:
             return False
 
 
+# Instalação local usada no Windows quando o flutter não está no PATH
+WINDOWS_FLUTTER = "C:\\temp_flutter\\flutter\\bin\\flutter.bat"
+
+
+def default_flutter_executable() -> str:
+    """flutter do PATH; senão a instalação local do Windows (se existir)."""
+    if shutil.which('flutter'):
+        return 'flutter'
+    return WINDOWS_FLUTTER if os.path.exists(WINDOWS_FLUTTER) else 'flutter'
+
+
+class StageTimer:
+    """Tempo de parede por etapa da execução (análise, correções, validação)."""
+    
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+    
+    def report(self) -> str:
+        return '\n'.join(f"  {name:28s} {seconds:8.2f}s" for name, seconds in self.timings.items())
+
+
+@dataclass
+class ValidationResult:
+    """Resultado da etapa de validação pós-correção."""
+    final_issues: List[DartIssue]
+    diff: SnapshotDiff
+    validation: Dict
+    # Arquivos reanalisados; None = análise completa
+    scope: Optional[Set[str]] = None
+
+
+class ValidationStage:
+    """
+    Análise pós-correção única.
+    
+    Roda o analyzer uma vez e parseia uma vez; o mesmo resultado serve o
+    check de regressão e a decisão SITUACAO 1/2/3. A fonte da análise é,
+    nesta ordem: analysis server quente, projeto inteiro (full) ou só os
+    arquivos alterados + importadores (atualizando o cache, se houver).
+    """
+    
+    def __init__(self, project_path: str, executable: Optional[str] = None,
+                 timeout: int = 300, full: bool = False,
+                 client: Optional[AnalysisServerClient] = None,
+                 cache: Optional[AnalysisCache] = None,
+                 timer: Optional[StageTimer] = None, target: str = 'lib'):
+        self.project_path = project_path
+        self.executable = executable or default_flutter_executable()
+        self.timeout = timeout
+        self.full = full
+        self.client = client
+        self.cache = cache
+        self.timer = timer or StageTimer()
+        self.target = target
+    
+    @property
+    def command(self) -> List[str]:
+        return [self.executable, 'analyze', '--no-pub']
+    
+    def run(self, initial: List[DartIssue], results: List[FixResult]) -> ValidationResult:
+        validator = ValidationManager(self.project_path)
+        scope = None
+        
+        with self.timer.stage('validacao: analise'):
+            if self.client:
+                final = self.client.diagnostics()
+            elif self.full:
+                final = run_analyzer_on_files(self.project_path, self.command, [self.target],
+                                              timeout=self.timeout)
+            else:
+                final, scope = validator.reanalyze_scoped(initial, results, self.command,
+                                                          timeout=self.timeout, cache=self.cache)
+                if self.cache:
+                    self.cache.save()
+        
+        with self.timer.stage('validacao: diff'):
+            diff = validator.diff(initial, final)
+            validation = validator.validate_fixes(len(initial), len(final), results, diff)
+        validation['timings'] = dict(self.timer.timings)
+        
+        return ValidationResult(final, diff, validation, scope)
+
+
+class ShadowWorkspace:
+    """
+    Cópia-sombra do projeto num diretório temporário, para análise especulativa.
+    
+    A sombra é feita de symlinks para o projeto real (sem permissão de
+    symlink, como no Windows sem modo desenvolvedor, vira cópia). Um overlay
+    grava o arquivo na sombra, trocando por diretórios reais só o caminho até
+    ele; reverter é recriar o link. O analyzer roda na sombra com os mesmos
+    caminhos relativos, então os issues saem comparáveis aos do projeto.
+    """
+    
+    # Não entram na sombra (pesados e irrelevantes para o analyzer)
+    SKIP = ('.git', 'build')
+    
+    def __init__(self, project_path: str, command: List[str],
+                 output_format: str = 'auto', timeout: int = 300):
+        self.project_path = os.path.abspath(project_path)
+        self.command = command
+        self.output_format = output_format
+        self.timeout = timeout
+        self.root = tempfile.mkdtemp(prefix='flutter_fix_shadow_')
+        self.overlays: Set[str] = set()
+        self._link_children('')
+    
+    def _link(self, rel: str):
+        source = os.path.join(self.project_path, rel)
+        target = os.path.join(self.root, rel)
+        try:
+            os.symlink(source, target, target_is_directory=os.path.isdir(source))
+        except OSError:
+            if os.path.isdir(source):
+                shutil.copytree(source, target, symlinks=True)
+            else:
+                shutil.copy2(source, target)
+    
+    def _link_children(self, rel_dir: str):
+        for entry in os.listdir(os.path.join(self.project_path, rel_dir)):
+            if not rel_dir and entry in self.SKIP:
+                continue
+            self._link(os.path.join(rel_dir, entry))
+    
+    def _materialize(self, rel_dir: str):
+        """Troca o link de um diretório por um diretório real com links para os filhos."""
+        if not rel_dir:
+            return
+        self._materialize(os.path.dirname(rel_dir))
+        target = os.path.join(self.root, rel_dir)
+        if os.path.islink(target):
+            os.unlink(target)
+            os.mkdir(target)
+            self._link_children(rel_dir)
+    
+    def update(self, contents: Dict[str, str]):
+        """Grava o conteúdo especulativo dos arquivos (caminhos relativos) na sombra."""
+        for rel, content in contents.items():
+            rel = os.path.normpath(rel)
+            self._materialize(os.path.dirname(rel))
+            target = os.path.join(self.root, rel)
+            if os.path.lexists(target):
+                os.remove(target)
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(content)
+            self.overlays.add(rel)
+    
+    def revert(self, paths: Iterable[str]):
+        """Volta os arquivos ao conteúdo do projeto (link de novo)."""
+        for rel in paths:
+            rel = os.path.normpath(rel)
+            if rel in self.overlays:
+                os.remove(os.path.join(self.root, rel))
+                self._link(rel)
+                self.overlays.discard(rel)
+    
+    def analyze(self, files: Iterable[str]) -> List[DartIssue]:
+        return run_analyzer_on_files(self.root, self.command, files,
+                                     self.output_format, self.timeout)
+    
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class ServerOverlays:
+    """
+    Overlays do analysis server (`analysis.updateContent`) para análise
+    especulativa: o servidor analisa o conteúdo em memória e o disco não é
+    tocado. Reverter é remover o overlay.
+    """
+    
+    def __init__(self, client: AnalysisServerClient):
+        self.client = client
+    
+    def _path(self, rel: str) -> str:
+        return os.path.normpath(os.path.join(self.client.project_path, rel))
+    
+    def update(self, contents: Dict[str, str]):
+        if contents:
+            self.client.request('analysis.updateContent', {'files': {
+                self._path(rel): {'type': 'add', 'content': content}
+                for rel, content in contents.items()
+            }})
+    
+    def revert(self, paths: Iterable[str]):
+        files = {self._path(rel): {'type': 'remove'} for rel in paths}
+        if files:
+            self.client.request('analysis.updateContent', {'files': files})
+    
+    def analyze(self, files: Iterable[str]) -> List[DartIssue]:
+        errors = {}
+        for rel in files:
+            path = self._path(rel)
+            # getErrors só responde quando os erros do arquivo estão atualizados
+            errors[path] = self.client.request('analysis.getErrors', {'file': path}).get('errors', [])
+        return AnalyzerParser(project_root=self.client.project_path).parse_server_errors(errors)
+    
+    def close(self):
+        pass
+
+
+def make_overlays(project_path: str, client: Optional[AnalysisServerClient] = None,
+                  executable: Optional[str] = None, timeout: int = 300):
+    """Overlays do analysis server se houver cliente; senão uma cópia-sombra do projeto."""
+    if client:
+        if not client.process:
+            client.analyze()
+        return ServerOverlays(client)
+    executable = executable or default_flutter_executable()
+    return ShadowWorkspace(project_path, [executable, 'analyze', '--no-pub'], timeout=timeout)
+
+
+def bisect_culprits(units: List, passes: Callable[[List], bool]) -> Tuple[List, List, int]:
+    """
+    Busca binária adaptativa pelas unidades que fazem `passes` falhar.
+    
+    `passes(subconjunto)` testa aplicar só aquelas unidades. Grupos que
+    passam são aceitos e entram nos testes seguintes; os que falham são
+    divididos ao meio até sobrar a unidade culpada. Se a primeira metade de
+    um grupo reprovado passa, a segunda é culpada sem precisar de teste:
+    com um culpado entre n unidades são ~log2(n) testes.
+    Retorna (aceitas, culpadas, testes).
+    """
+    accepted: List = []
+    culprits: List = []
+    tests = 0
+    # (grupo, reprovado sem testar, primeira metade de um grupo reprovado)
+    pending = deque([(list(units), False, False)] if units else [])
+    while pending:
+        group, known_bad, first_half = pending.popleft()
+        if not known_bad:
+            tests += 1
+            if passes(accepted + group):
+                accepted.extend(group)
+                if first_half:
+                    sibling = pending.popleft()[0]
+                    pending.appendleft((sibling, True, False))
+                continue
+        if len(group) == 1:
+            culprits.extend(group)
+        else:
+            middle = len(group) // 2
+            pending.extendleft(((group[middle:], False, False), (group[:middle], False, True)))
+    return accepted, culprits, tests
+
+
+class OverlayValidator:
+    """Base das validações em overlay: texto especulativo e análise por arquivo."""
+    
+    def __init__(self, fixer: DartFileFixer, overlays):
+        self.fixer = fixer
+        self.overlays = overlays
+        self.rounds = 0
+    
+    def _relative(self, file_path: str) -> str:
+        full_path = self.fixer._resolve_path(file_path).resolve()
+        return graph_path(os.path.relpath(full_path, self.fixer.project_root.resolve()))
+    
+    def _importers(self, files: Iterable[str]) -> Dict[str, Set[str]]:
+        # Mesmo escopo da reanálise parcial: só lib/
+        graph = self.fixer.graph
+        return {rel: {f for f in graph.direct_importers(rel) if f.startswith('lib/')}
+                for rel in files}
+    
+    @staticmethod
+    def _content(original: str, results: List[FixResult]) -> str:
+        batch = EditBatch()
+        for result in results:
+            batch.add(result.edits)
+        return batch.apply(original)
+    
+    def _analyze(self, files: Set[str]) -> Dict[str, List[DartIssue]]:
+        found: Dict[str, List[DartIssue]] = defaultdict(list)
+        for issue in self.overlays.analyze(files):
+            found[graph_path(issue.file_path)].append(issue)
+        return found
+
+
+class SpeculativeValidator(OverlayValidator):
+    """
+    Validação fix a fix antes de gravar, com rollback individual.
+    
+    As edições de cada arquivo vão para um overlay (ShadowWorkspace ou
+    ServerOverlays) e só os arquivos tocados + importadores diretos são
+    analisados, contra uma análise do mesmo escopo sem os fixes. Se o grupo
+    de fixes de um arquivo não introduz issues, fica inteiro; senão é
+    dividido ao meio e cada metade é testada de novo, até isolar os fixes
+    culpados. Os arquivos suspeitos avançam juntos (uma análise por rodada).
+    Descartar um fix é só voltar o buffer: nada foi gravado no projeto.
+    
+    Issue novo num arquivo conta contra o próprio arquivo e contra os
+    arquivos em teste que ele importa (não dá para separar os culpados).
+    """
+    
+    def __init__(self, fixer: DartFileFixer, overlays):
+        super().__init__(fixer, overlays)
+        self.kept = 0
+        self.rejected: List[FixResult] = []
+    
+    def run(self, results: List[FixResult]) -> List[FixResult]:
+        """Os mesmos resultados, com os fixes que introduziram issues virando falha."""
+        candidates: Dict[str, List[FixResult]] = defaultdict(list)
+        for result in results:
+            if result.success and result.edits:
+                candidates[self._relative(result.issue.file_path)].append(result)
+        if not candidates:
+            return results
+        
+        originals = {rel: self.fixer._document(group[0].issue.file_path).text
+                     for rel, group in candidates.items()}
+        importers = self._importers(candidates)
+        baseline = self._analyze(set(candidates).union(*importers.values()))
+        
+        accepted: Dict[str, List[FixResult]] = defaultdict(list)
+        pending = {rel: deque([group]) for rel, group in candidates.items()}
+        failures: Dict[int, List[DartIssue]] = {}
+        try:
+            while pending:
+                self.rounds += 1
+                testing = {rel: queue.popleft() for rel, queue in pending.items()}
+                self.overlays.update({rel: self._content(originals[rel], accepted[rel] + group)
+                                      for rel, group in testing.items()})
+                scope = set(testing).union(*(importers[rel] for rel in testing))
+                found = self._analyze(scope)
+                
+                failed: Dict[str, List[DartIssue]] = defaultdict(list)
+                for rel in scope:
+                    introduced = diff_snapshots(baseline.get(rel, []), found.get(rel, [])).introduced
+                    if not introduced:
+                        continue
+                    owners = [t for t in testing if t == rel or rel in importers[t]]
+                    for owner in owners:
+                        failed[owner].extend(introduced)
+                
+                for rel, group in testing.items():
+                    if rel not in failed:
+                        accepted[rel].extend(group)
+                    elif len(group) == 1:
+                        failures[id(group[0])] = failed[rel]
+                    else:
+                        middle = len(group) // 2
+                        pending[rel].extendleft((group[middle:], group[:middle]))
+                    if not pending[rel]:
+                        del pending[rel]
+                        # Arquivo decidido: overlay fica só com os fixes aceitos
+                        if accepted[rel]:
+                            self.overlays.update({rel: self._content(originals[rel], accepted[rel])})
+                        else:
+                            self.overlays.revert([rel])
+        finally:
+            self.overlays.revert(candidates)
+        
+        final = []
+        for result in results:
+            introduced = failures.get(id(result))
+            if introduced is None:
+                self.kept += bool(result.success and result.edits)
+                final.append(result)
+                continue
+            rules = ', '.join(sorted({i.rule for i in introduced}))
+            logger.info(f"↺ Descartado: {result.issue.rule} em {result.issue.file_path}:"
+                        f"{result.issue.line} (introduziu {rules})")
+            rejected = FixResult(
+                success=False,
+                issue=result.issue,
+                description=f"Descartado na validação especulativa: introduziu "
+                            f"{len(introduced)} issue(s) ({rules})"
+            )
+            self.rejected.append(rejected)
+            final.append(rejected)
+        return final
+
+
+class RegressionBisector(OverlayValidator):
+    """
+    Acha por busca binária o fixer (e depois os arquivos) que causou uma regressão.
+    
+    Roda depois da gravação, quando a validação acusou mais issues: os
+    textos de antes das correções ficaram no fixer (keep_originals). Cada
+    teste monta nos overlays os originais + as edições de um subconjunto e
+    analisa só os arquivos que ele altera + importadores. Primeiro isola as
+    regras culpadas, depois, dentro de cada uma, os arquivos. O resto fica
+    aplicado e o disco é regravado sem os culpados.
+    """
+    
+    def __init__(self, fixer: DartFileFixer, overlays):
+        super().__init__(fixer, overlays)
+        # (regra, arquivo) -> fixes revertidos
+        self.culprits: Dict[Tuple[str, str], List[FixResult]] = {}
+        self.rewritten: Set[str] = set()
+    
+    def run(self, results: List[FixResult]) -> List[FixResult]:
+        """Os mesmos resultados, com os fixes culpados revertidos e marcados como falha."""
+        by_file: Dict[str, List[FixResult]] = defaultdict(list)
+        paths: Dict[str, Path] = {}
+        for result in results:
+            if result.success and result.edits:
+                rel = self._relative(result.issue.file_path)
+                by_file[rel].append(result)
+                paths[rel] = self.fixer._resolve_path(result.issue.file_path)
+        originals = {rel: self.fixer.originals[path] for rel, path in paths.items()
+                     if path in self.fixer.originals}
+        if not originals:
+            return results
+        relative = {id(r): rel for rel, group in by_file.items() for r in group}
+        importers = self._importers(originals)
+        
+        # O disco já tem tudo aplicado: o ponto de partida nos overlays são os originais
+        current = dict(originals)
+        self.overlays.update(current)
+        baseline = self._analyze(set(originals).union(*importers.values()))
+        
+        def passes(active: List[FixResult]) -> bool:
+            self.rounds += 1
+            grouped: Dict[str, List[FixResult]] = defaultdict(list)
+            for result in active:
+                grouped[relative[id(result)]].append(result)
+            contents = {rel: self._content(originals[rel], grouped.get(rel, []))
+                        for rel in originals}
+            self.overlays.update({rel: text for rel, text in contents.items()
+                                  if text != current[rel]})
+            current.update(contents)
+            touched = {rel for rel in grouped}
+            scope = touched.union(*(importers[rel] for rel in touched))
+            found = self._analyze(scope)
+            return not any(diff_snapshots(baseline.get(rel, []), found.get(rel, [])).introduced
+                           for rel in scope)
+        
+        applied = [r for r in results if id(r) in relative]
+        by_rule: Dict[str, List[FixResult]] = defaultdict(list)
+        for result in applied:
+            by_rule[result.issue.rule].append(result)
+        
+        try:
+            good_rules, bad_rules, _ = bisect_culprits(
+                list(by_rule), lambda rules: passes([r for rule in rules for r in by_rule[rule]]))
+            kept = [r for rule in good_rules for r in by_rule[rule]]
+            for rule in bad_rules:
+                rule_files: Dict[str, List[FixResult]] = defaultdict(list)
+                for result in by_rule[rule]:
+                    rule_files[relative[id(result)]].append(result)
+                base = list(kept)
+                good_files, bad_files, _ = bisect_culprits(
+                    list(rule_files),
+                    lambda rels: passes(base + [r for rel in rels for r in rule_files[rel]]))
+                kept += [r for rel in good_files for r in rule_files[rel]]
+                for rel in bad_files:
+                    self.culprits[(rule, rel)] = rule_files[rel]
+        finally:
+            self.overlays.revert(originals)
+        
+        # Disco: originais + o que ficou (só arquivos que perderam algum fix)
+        reverted = {id(r) for group in self.culprits.values() for r in group}
+        for rel in {relative[i] for i in reverted}:
+            keep = [r for r in by_file[rel] if id(r) not in reverted]
+            self.fixer.documents.put(paths[rel], self._content(originals[rel], keep))
+            self.rewritten.add(rel)
+        self.fixer.flush()
+        
+        final = []
+        for result in results:
+            if id(result) not in reverted:
+                final.append(result)
+                continue
+            logger.info(f"↺ Revertido: {result.issue.rule} em {result.issue.file_path}:{result.issue.line}")
+            final.append(FixResult(
+                success=False,
+                issue=result.issue,
+                description=f"Revertido pela bisseção: {result.issue.rule} introduziu issues "
+                            f"em {relative[id(result)]} ou importadores"
+            ))
+        return final
+    
+    def summary(self) -> Dict:
+        """Culpados para o relatório."""
+        return {
+            'analysis_rounds': self.rounds,
+            'culprit_rules': sorted({rule for rule, _ in self.culprits}),
+            'culprits': [
+                {'rule': rule, 'file': rel, 'fixes_reverted': len(group)}
+                for (rule, rel), group in sorted(self.culprits.items())
+            ],
+        }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Corretor automático de issues Flutter/Dart',
@@ -1164,6 +3438,69 @@ Exemplos de uso:
         help='Executa flutter analyze automaticamente'
     )
     
+    parser.add_argument(
+        '--format',
+        choices=AnalyzerParser.OUTPUT_FORMATS,
+        default='auto',
+        help='Formato do output do analyzer: text, machine (dart analyze '
+             '--format=machine), json ou auto (default: detecta)'
+    )
+    
+    parser.add_argument(
+        '--server',
+        action='store_true',
+        help='Usa o analysis server do Dart: sobe uma vez e serve a análise '
+             'inicial e as validações pós-correção'
+    )
+    
+    parser.add_argument(
+        '--server-command',
+        help='Comando do analysis server (default: dart language-server --protocol=analyzer)'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=f'Com --run-analyze: guarda diagnósticos por hash de arquivo em '
+             f'{AnalysisCache.CACHE_FILE} e só reanalisa arquivos alterados'
+    )
+    
+    parser.add_argument(
+        '--flutter-path',
+        help='Executável do flutter usado na validação (default: flutter do PATH '
+             f'ou {WINDOWS_FLUTTER})'
+    )
+    
+    parser.add_argument(
+        '--analyze-timeout',
+        type=int,
+        default=300,
+        help='Timeout em segundos da análise de validação (default: 300)'
+    )
+    
+    parser.add_argument(
+        '--full-validation',
+        action='store_true',
+        help='Reanalisa o projeto inteiro na validação (default: só arquivos '
+             'alterados e quem os importa)'
+    )
+    
+    parser.add_argument(
+        '--speculative',
+        action='store_true',
+        help='Valida cada fix antes de gravar: as edições vão para overlays '
+             '(analysis server com --server, senão uma cópia-sombra do projeto), '
+             'só os arquivos tocados + importadores são analisados e cada fix que '
+             'introduz issues é descartado individualmente'
+    )
+    
+    parser.add_argument(
+        '--bisect-regressions',
+        action='store_true',
+        help='Se a validação acusar mais issues, acha por busca binária (por regra, '
+             'depois por arquivo) os fixes culpados, reverte só eles e mantém o resto'
+    )
+    
     parser.add_argument(
         '--project-path',
         default='.',
@@ -1176,11 +3513,45 @@ Exemplos de uso:
         help='Mostra correções sem aplicar'
     )
     
+    parser.add_argument(
+        '--diff-output',
+        help='Com --dry-run: grava o diff unificado das correções neste arquivo '
+             '(default: imprime na saída, arquivo a arquivo)'
+    )
+    
+    parser.add_argument(
+        '--save-plan',
+        help='Salva o plano de correções (JSON Lines: edições por arquivo) para '
+             'revisar e aplicar depois com --apply-plan'
+    )
+    
+    parser.add_argument(
+        '--apply-plan',
+        help='Aplica um plano salvo com --save-plan (sem analyzer nem fixers) e sai'
+    )
+    
     parser.add_argument(
         '--rules',
         help='Lista de regras para corrigir (separadas por vírgula)'
     )
     
+    parser.add_argument(
+        '--disable-rules',
+        help='Regras para desligar (separadas por vírgula; ver --list-rules)'
+    )
+    
+    parser.add_argument(
+        '--list-rules',
+        action='store_true',
+        help='Lista as regras de correção registradas e sai'
+    )
+    
+    parser.add_argument(
+        '--benchmark-rules',
+        action='store_true',
+        help='Mede o tempo de cada regra sobre os issues (sem aplicar) e sai'
+    )
+    
     parser.add_argument(
         '--severity',
         choices=['critical', 'high', 'medium', 'low'],
@@ -1188,6 +3559,20 @@ Exemplos de uso:
         help='Severidade mínima para corrigir (default: medium)'
     )
     
+    parser.add_argument(
+        '--diff',
+        nargs=2,
+        metavar=('ANTES', 'DEPOIS'),
+        help='Compara dois outputs do analyzer (resolvidos/introduzidos/movidos) e sai'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Processos para corrigir arquivos em paralelo (default: 1)'
+    )
+    
     parser.add_argument(
         '--restore',
         action='store_true',
@@ -1211,6 +3596,25 @@ Exemplos de uso:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    disabled_rules = [r.strip() for r in args.disable_rules.split(',')] if args.disable_rules else []
+    try:
+        compile_rules(disabled=disabled_rules)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.list_rules:
+        print_rules(disabled=disabled_rules)
+        return
+    
+    # Diff entre snapshots
+    if args.diff:
+        before = AnalyzerParser(args.format).parse_file(args.diff[0])
+        after = AnalyzerParser(args.format).parse_file(args.diff[1])
+        diff = diff_snapshots(before, after)
+        print(f"{args.diff[0]}: {len(before)} issues -> {args.diff[1]}: {len(after)} issues")
+        print_snapshot_diff(diff)
+        return
+    
     # Restaurar backup
     if args.restore:
         backup = BackupManager()
@@ -1218,23 +3622,54 @@ Exemplos de uso:
         print("Arquivos restaurados do backup.")
         return
     
+    # Aplicar plano salvo: sem analyzer nem fixers
+    if args.apply_plan:
+        fixer = DartFileFixer(args.project_path, dry_run=args.dry_run, disabled_rules=disabled_rules)
+        if args.dry_run:
+            fixer.diff_stream = open(args.diff_output, 'w', encoding='utf-8') if args.diff_output else sys.stdout
+        try:
+            applied, skipped = fixer.apply_plan(args.apply_plan)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"\n{'[DRY RUN] ' if args.dry_run else ''}{applied} correções aplicadas de {args.apply_plan}")
+        if skipped:
+            print(f"[!] {len(skipped)} arquivos pulados (mudaram desde o plano ou não existem):")
+            for path in skipped:
+                print(f"  - {path}")
+        if args.diff_output and fixer.diff_stream:
+            fixer.diff_stream.close()
+        return
+    
     # Obtém conteúdo do analyzer
-    analyzer_parser = AnalyzerParser()
-    
-    if args.analyze_file:
-        # Usa parse_file que tem lógica de encoding correta
-        issues = analyzer_parser.parse_file(args.analyze_file)
-    elif args.run_analyze:
-        print("Executando flutter analyze...")
-        analyze_content = run_flutter_analyze(args.project_path)
-        
-        # Salva output para referência
-        with open('flutter_analyze_output.txt', 'w', encoding='utf-8') as f:
-            f. write(analyze_content)
-        print("Output salvo em flutter_analyze_output.txt")
-        issues = analyzer_parser.parse_content(analyze_content)
-    else:
-        parser.error("Especifique --analyze-file ou --run-analyze")
+    analyzer_parser = AnalyzerParser(args.format, project_root=args.project_path)
+    cache = AnalysisCache(args.project_path) if args.cache else None
+    client = None
+    if args.server:
+        command = shlex.split(args.server_command) if args.server_command else None
+        client = AnalysisServerClient(args.project_path, command)
+        atexit.register(client.close)
+    
+    timer = StageTimer()
+    with timer.stage('analise inicial'):
+        if args.analyze_file:
+            # Usa parse_file que tem lógica de encoding correta
+            issues = analyzer_parser.parse_file(args.analyze_file)
+        elif args.run_analyze and cache:
+            print("Executando flutter analyze (com cache por hash)...")
+            command = analyze_command('lib', args.format)[:-1]
+            issues = analyzer_parser.load_issues(cache.analyze(command, args.format))
+        elif args.run_analyze:
+            print("Executando flutter analyze...")
+            # Parse em streaming: issues são lidos enquanto o analyzer roda e o
+            # output é salvo para referência na mesma passada
+            issues = list(analyzer_parser.iter_issues(args.project_path,
+                                                      tee_path='flutter_analyze_output.txt'))
+            print("Output salvo em flutter_analyze_output.txt")
+        elif client:
+            print("Analisando com o analysis server...")
+            issues = client.analyze(analyzer_parser)
+        else:
+            parser.error("Especifique --analyze-file, --run-analyze ou --server")
     
     # Parse issues
     print("\nAnalisando issues...")
@@ -1253,6 +3688,11 @@ Exemplos de uso:
         report_gen.save_reports(analyzer_parser, [])
         return
     
+    if args.benchmark_rules:
+        fixer = DartFileFixer(args.project_path, dry_run=True, disabled_rules=disabled_rules)
+        print_rule_benchmark(fixer.benchmark(issues))
+        return
+    
     # Prepara regras para corrigir
     rules = None
     if args.rules:
@@ -1269,51 +3709,121 @@ Exemplos de uso:
     # Aplica correções
     print(f"\n{'[DRY RUN] ' if args.dry_run else ''}Aplicando correções...")
     
-    fixer = DartFileFixer(args.project_path, dry_run=args.dry_run)
-    results = fixer. fix_all(issues, rules=rules, severity_threshold=severity)
-    
-    # VALIDAÇÃO: Verifica se as correções pioraram a situação
-    if not args.dry_run and args.run_analyze:
+    speculative = args.speculative and not args.dry_run
+    fixer = DartFileFixer(args.project_path, dry_run=args.dry_run, disabled_rules=disabled_rules,
+                          keep_originals=args.bisect_regressions)
+    if args.dry_run:
+        # Diff de cada arquivo sai assim que ele é corrigido, dos buffers em memória
+        fixer.diff_stream = open(args.diff_output, 'w', encoding='utf-8') if args.diff_output else sys.stdout
+    # Com bisseção o plano só é escrito no fim, sem os fixes revertidos
+    defer_plan = args.save_plan and args.bisect_regressions and not args.dry_run
+    if args.save_plan and not defer_plan:
+        fixer.plan = FixPlanWriter(args.save_plan, args.project_path)
+    with timer.stage('correcoes'):
+        results = fixer. fix_all(issues, rules=rules, severity_threshold=severity, jobs=args.jobs,
+                                 apply=not speculative)
+    
+    if speculative:
+        # Nada foi gravado ainda: cada fix é testado em overlay e só os que
+        # não introduzem issues vão para o disco
+        print("\nValidação especulativa (fix a fix, antes de gravar)...")
+        overlays = make_overlays(args.project_path, client, args.flutter_path, args.analyze_timeout)
+        speculation = SpeculativeValidator(fixer, overlays)
+        try:
+            with timer.stage('validacao especulativa'):
+                results = speculation.run(results)
+        finally:
+            overlays.close()
+        with timer.stage('correcoes: gravacao'):
+            fixer.apply_results(results)
+        print(f"  {speculation.kept} fixes mantidos, {len(speculation.rejected)} descartados "
+              f"em {speculation.rounds} rodadas")
+    
+    if args.diff_output and fixer.diff_stream:
+        fixer.diff_stream.close()
+        print(f"Diff das correções salvo em {args.diff_output}")
+    
+    if client and not args.dry_run:
+        if not client.process:
+            # Issues vieram de --analyze-file: servidor sobe só agora
+            client.analyze()
+        # Servidor quente: só os arquivos corrigidos são reanalisados
+        client.notify_changed({r.issue.file_path for r in results if r.success})
+    
+    # VALIDAÇÃO: uma única análise pós-correção, usada aqui (regressão) e na
+    # decisão SITUACAO 1/2/3 no final
+    validation_result = None
+    bisection = None
+    if not args.dry_run:
         print("\n" + "="*70)
         print("VALIDAÇÃO DAS CORREÇÕES")
         print("="*70)
         
-        # Re-analisa após correções
         print("\nRe-analisando projeto após correções...")
+        stage = ValidationStage(
+            args.project_path,
+            executable=args.flutter_path,
+            timeout=args.analyze_timeout,
+            full=args.full_validation,
+            client=client,
+            cache=cache,
+            timer=timer
+        )
         try:
-            flutter_output = subprocess.run(
-                [args.flutter_path or "flutter", "analyze", args.project_path, "--format=json"],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            if flutter_output.stdout:
-                final_data = json.loads(flutter_output.stdout)
-                final_issues = len(final_data.get('issues', []))
-                
-                validator = ValidationManager(args.project_path)
-                validation = validator.validate_fixes(initial_summary['total'], final_issues, results)
-                
-                print(f"\nResultado: {validation['status']}")
-                print(f"Issues iniciais: {validation['initial_issues']}")
-                print(f"Issues finais: {validation['final_issues']}")
-                print(f"Melhoria: {validation['improvement']} issues ({validation['improvement_percentage']:.1f}%)")
-                print(f"Taxa de sucesso de fixes: {validation['success_rate']:.1f}%")
-                
-                # Se piorou, restaura e avisa
-                if validation['improvement'] < 0:
-                    print("\n⚠️  AVISO: Issues AUMENTARAM após as correções!")
-                    print(f"Aumentou {abs(validation['improvement'])} issues")
-                    print("\nRestaurando arquivos do backup...")
-                    
-                    modified_files = set(r.issue.file_path for r in results if r.success)
-                    for file_path in modified_files:
-                        validator.restore_from_backup(file_path)
-                    
-                    print("\n✅ Arquivos restaurados dos backups locais")
-                    sys.exit(1)
+            validation_result = stage.run(issues, results)
         except Exception as e:
-            logger.warning(f"Erro na validação: {e}")
+            logger.error(f"Erro na validação: {e}")
+            print(f"\n[!] Erro ao analisar resultado: {e}")
+        
+        if validation_result:
+            validation = validation_result.validation
+            if validation_result.scope is not None:
+                print(f"Reanalisados {len(validation_result.scope)} arquivos (alterados + importadores)")
+            print(f"\nResultado: {validation['status']}")
+            print(f"Issues iniciais: {validation['initial_issues']}")
+            print(f"Issues finais: {validation['final_issues']}")
+            print(f"Melhoria: {validation['improvement']} issues ({validation['improvement_percentage']:.1f}%)")
+            print(f"Taxa de sucesso de fixes: {validation['success_rate']:.1f}%")
+        
+        if validation_result and args.bisect_regressions and validation_result.validation['improvement'] < 0:
+            print("\nRegressão: bisseção por regra e arquivo para achar os fixes culpados...")
+            overlays = make_overlays(args.project_path, client, args.flutter_path, args.analyze_timeout)
+            bisector = RegressionBisector(fixer, overlays)
+            try:
+                with timer.stage('bisseccao'):
+                    results = bisector.run(results)
+                bisection = bisector.summary()
+                if client:
+                    client.notify_changed(bisector.rewritten)
+                validation_result = stage.run(issues, results)
+            except Exception as e:
+                logger.error(f"Erro na bisseção: {e}")
+                print(f"\n[!] Erro na bisseção: {e}")
+            finally:
+                overlays.close()
+            
+            if bisection:
+                for culprit in bisection['culprits']:
+                    print(f"  - {culprit['rule']} em {culprit['file']} "
+                          f"({culprit['fixes_reverted']} fixes revertidos)")
+                print(f"Culpados: {', '.join(bisection['culprit_rules']) or 'nenhum'} "
+                      f"({bisection['analysis_rounds']} análises)")
+                validation = validation_result.validation
+                validation['bisection'] = bisection
+                print(f"Issues finais após reverter os culpados: {validation['final_issues']} "
+                      f"({validation['status']})")
+        
+        if validation_result:
+            print("\nTempos por etapa:")
+            print(timer.report())
+    
+    if defer_plan:
+        fixer.plan = FixPlanWriter(args.save_plan, args.project_path)
+        fixer.write_plan(fixer.plan, results)
+    if fixer.plan:
+        fixer.plan.close()
+        print(f"\nPlano salvo em {args.save_plan}: {fixer.plan.fixes} correções em "
+              f"{fixer.plan.files} arquivos (aplicar com --apply-plan)")
     
     # Gera relatórios
     print("\nGerando relatorios...")
@@ -1325,7 +3835,7 @@ Exemplos de uso:
     except UnicodeEncodeError:
         print(report.encode('ascii', 'replace').decode('ascii'))
     
-    report_gen.save_reports(analyzer_parser, results)
+    report_gen.save_reports(analyzer_parser, results, bisection)
     
     # Mostra próximos passos
     unfixed_critical = [r for r in results if not r.success and r.issue.severity == IssueSeverity.CRITICAL]
@@ -1376,7 +3886,7 @@ Analisar mensagens de erro especificas, criar fixers mais inteligentes e agressi
     
     # Verifica dependências faltantes
     pubspec_fixer = PubspecFixer(args.project_path)
-    missing_deps = pubspec_fixer.find_missing_dependencies(issues)
+    missing_deps = pubspec_fixer.find_missing_dependencies(issues, fixer.graph)
     
     if missing_deps:
         print("\n[+] Dependencias possivelmente faltantes:")
@@ -1391,45 +3901,34 @@ Analisar mensagens de erro especificas, criar fixers mais inteligentes e agressi
     print("ANALISE POS-EXECUCAO E VALIDACAO FINAL")
     print("="*80)
     
-    # Re-analisa para comparar
-    if not args.dry_run and not args.report_only:
-        print("\n[*] Analisando codigo pos-correcao...")
+    # Decisão SITUACAO 1/2/3 com o mesmo resultado da etapa de validação
+    if validation_result:
         try:
-            flutter_cmd = "C:\\temp_flutter\\flutter\\bin\\flutter.bat"  # Usar caminho completo
-            result = subprocess.run(
-                [flutter_cmd, "analyze", "lib", "--no-pub"],
-                cwd=args.project_path,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                encoding='utf-8',
-                errors='replace'
-            )
+            final_list = validation_result.final_issues
+            final_issue_count = len(final_list)
+            diff = validation_result.diff
+            validator = ValidationManager(args.project_path)
             
-            # Extrai número de issues do output
-            output = result.stdout + result.stderr
-            issues_match = re.search(r'(\d+)\s+issues? found', output)
+            initial_issue_count = initial_summary['total']
+            difference = initial_issue_count - final_issue_count
             
-            if issues_match:
-                final_issue_count = int(issues_match.group(1))
-                initial_issue_count = initial_summary['total']
-                difference = initial_issue_count - final_issue_count
-                
-                print(f"\n[*] RESULTADO DA ANALISE:")
-                print(f"   Issues Iniciais:  {initial_issue_count}")
-                print(f"   Issues Finais:    {final_issue_count}")
-                print(f"   Diferenca:        {difference:+d} issues")
-                print(f"   Reducao %:        {(difference/initial_issue_count*100):.2f}%")
+            print(f"\n[*] RESULTADO DA ANALISE:")
+            print(f"   Issues Iniciais:  {initial_issue_count}")
+            print(f"   Issues Finais:    {final_issue_count}")
+            print(f"   Diferenca:        {difference:+d} issues")
+            print(f"   Reducao %:        {(difference/initial_issue_count*100):.2f}%")
+            if final_list:
+                print_snapshot_diff(diff)
+            
+            # ================================================================
+            # SITUACAO 1: ISSUES AUMENTARAM - REGRESSOR
+            # ================================================================
+            if difference < 0:
+                print("\n" + "[!] "*40)
+                print("[!] SITUACAO 1: ISSUES AUMENTARAM - ACAO NECESSARIA")
+                print("[!] "*40)
                 
-                # ================================================================
-                # SITUACAO 1: ISSUES AUMENTARAM - REGRESSOR
-                # ================================================================
-                if difference < 0:
-                    print("\n" + "[!] "*40)
-                    print("[!] SITUACAO 1: ISSUES AUMENTARAM - ACAO NECESSARIA")
-                    print("[!] "*40)
-                    
-                    prompt_situation_1 = """
+                prompt_situation_1 = """
 ================================================================================
                     SITUACAO 1: ISSUES AUMENTARAM (REGRESSOR)
 ================================================================================
@@ -1460,25 +3959,27 @@ PROXIMO PASSO:
 
 ================================================================================
 """.format(initial=initial_issue_count, final=final_issue_count, diff=difference)
-                    print(prompt_situation_1)
-                    
-                    # Restaurar automaticamente
-                    print("[*] Restaurando arquivos do backup...")
-                    validator = ValidationManager(args.project_path)
-                    modified_files = set(r.issue.file_path for r in results if r.success)
-                    for file_path in modified_files:
-                        validator.restore_from_backup(file_path)
-                    print("[+] Arquivos restaurados!")
-                    
-                    sys.exit(1)
+                print(prompt_situation_1)
+                
+                # Restaurar automaticamente - só os arquivos apontados pelo diff
+                print("[*] Restaurando arquivos do backup...")
+                if final_list:
+                    to_restore = validator.files_to_restore(diff, results)
+                else:
+                    to_restore = set(r.issue.file_path for r in results if r.success)
+                for file_path in to_restore:
+                    validator.restore_from_backup(file_path)
+                print(f"[+] {len(to_restore)} arquivos restaurados!")
+                
+                sys.exit(1)
+            
+            # SITUACAO 2: ISSUES DIMINUIRAM - SUCESSO
+            elif difference > 0:
+                print("\n" + "[+] "*40)
+                print("[+] SITUACAO 2: ISSUES DIMINUIRAM - PROSSEGUIR COM AJUSTES")
+                print("[+] "*40)
                 
-                # SITUACAO 2: ISSUES DIMINUIRAM - SUCESSO
-                elif difference > 0:
-                    print("\n" + "[+] "*40)
-                    print("[+] SITUACAO 2: ISSUES DIMINUIRAM - PROSSEGUIR COM AJUSTES")
-                    print("[+] "*40)
-                    
-                    prompt_situation_2 = """
+                prompt_situation_2 = """
 ================================================================================
               SITUACAO 2: ISSUES DIMINUIRAM - SUCESSO! (PROSSEGUIR) - NUNCA APAGUE ESSE SCRIPT
 ================================================================================
@@ -1516,22 +4017,22 @@ PROXIMO PASSO:
 
 ================================================================================
 """.format(initial=initial_issue_count, final=final_issue_count, 
-           diff=difference, percent=(difference/initial_issue_count*100))
-                    print(prompt_situation_2)
-                    
-                    # Sugerir commit
-                    print("\n[*] RECOMENDACAO: Fazer commit das mudancas...")
-                    print("   git add -A")
-                    print("   git commit -m 'fix: Reducao de {} issues com fixers aplicados'".format(difference))
-                    print("   git push origin main")
+       diff=difference, percent=(difference/initial_issue_count*100))
+                print(prompt_situation_2)
                 
-                # SITUACAO 3: SEM MUDANCAS
-                else:
-                    print("\n" + "[i] "*40)
-                    print("[i] SITUACAO 3: SEM MUDANCAS - ANALISAR")
-                    print("[i] "*40)
-                    
-                    prompt_situation_3 = """
+                # Sugerir commit
+                print("\n[*] RECOMENDACAO: Fazer commit das mudancas...")
+                print("   git add -A")
+                print("   git commit -m 'fix: Reducao de {} issues com fixers aplicados'".format(difference))
+                print("   git push origin main")
+            
+            # SITUACAO 3: SEM MUDANCAS
+            else:
+                print("\n" + "[i] "*40)
+                print("[i] SITUACAO 3: SEM MUDANCAS - ANALISAR")
+                print("[i] "*40)
+                
+                prompt_situation_3 = """
 ================================================================================
                     SITUACAO 3: SEM MUDANCAS (0 DIFERENCA)
 ================================================================================
@@ -1559,7 +4060,7 @@ CONTINUE ATÉ ZERAR OS COMITS
 
 ================================================================================
 """.format(initial=initial_issue_count)
-                    print(prompt_situation_3)
+                print(prompt_situation_3)
         
         except Exception as e:
             logger.error(f"Erro na analise pos-execucao: {e}")
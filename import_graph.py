@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Grafo de imports dos arquivos Dart do projeto.
+
+Varre as diretivas import/export/part de lib/ e test/ (em paralelo) e guarda
+as arestas nos dois sentidos, para responder "quem importa este arquivo",
+"qual barrel exporta AppColors" ou "há ciclos de import" sem reanalisar
+nada. Cada arquivo também guarda os tipos que declara (class, enum, mixin,
+extension, typedef). O grafo é salvo em .import_graph.json: na próxima vez
+só arquivos novos ou alterados (hash do conteúdo) são relidos.
+
+Usado pela validação para reanalisar só os arquivos alterados por uma
+rodada de correções e seus importadores diretos, e pelo fixer de
+uri_does_not_exist para achar o arquivo certo de um import quebrado.
+
+Uso:
+    python import_graph.py importers lib/main.dart
+    python import_graph.py imports lib/features/auth/auth.dart
+    python import_graph.py affected lib/core/theme/app_colors.dart lib/main.dart
+    python import_graph.py provides AppColors AppSpacing
+    python import_graph.py barrels
+    python import_graph.py cycles
+    python import_graph.py missing
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# import 'x.dart' / export "x.dart" / part 'x.dart' (ignora `part of`);
+# o resto até o ';' traz os combinadores (as/show/hide)
+DIRECTIVE_PATTERN = re.compile(
+    r"^\s*(import|export|part)\s+['\"]([^'\"]+)['\"]([^;]*);", re.MULTILINE
+)
+
+# Tipos declarados no topo do arquivo (código formatado: topo = coluna 0)
+DECLARATION_PATTERN = re.compile(
+    r"^(?:(?:abstract|sealed|base|final|interface)\s+)*"
+    r"(?:class|mixin class|mixin|enum|extension type|extension|typedef)\s+([A-Za-z$][\w$]*)",
+    re.MULTILINE
+)
+
+# Funções, getters e variáveis/constantes de topo: `[tipo] nome(`, `[tipo] nome =`,
+# `final nome;`, `tipo get nome`
+TOP_LEVEL_PATTERN = re.compile(
+    r"^(?!(?:import|export|part|library|return|if|for|while|switch|class|enum|mixin|"
+    r"extension|typedef|abstract|sealed|base|interface)\b)"
+    r"(?:external\s+)?(?:(?:const|final|var|late)\s+)*"
+    r"(?:[A-Za-z_$][\w$.]*(?:<[^;{}()=]*>)?\??\s+)?(?:get\s+)?"
+    r"([A-Za-z$][\w$]*)\s*(?:<[^;{}()=]*>)?\s*(?:[(=;]|=>|\{)",
+    re.MULTILINE
+)
+
+# Arestas "transparentes": quem importa o barrel/biblioteca também enxerga
+# o arquivo exportado/parte
+TRANSPARENT_KINDS = ('export', 'part')
+
+DEFAULT_ROOTS = ('lib', 'test')
+CACHE_FILE = '.import_graph.json'
+CACHE_VERSION = 2
+
+
+class Directive(NamedTuple):
+    kind: str
+    uri: str
+    show: Tuple[str, ...] = ()
+    hide: Tuple[str, ...] = ()
+    prefix: Optional[str] = None
+
+    def exposes(self, symbol: str) -> bool:
+        """O símbolo passa pelos combinadores show/hide?"""
+        if self.show and symbol not in self.show:
+            return False
+        return symbol not in self.hide
+
+
+@dataclass
+class FileEntry:
+    """O que se sabe de um arquivo sem relê-lo."""
+    hash: str
+    mtime: int
+    size: int
+    directives: List[Directive] = field(default_factory=list)
+    declarations: List[str] = field(default_factory=list)
+
+
+def read_package_name(project_path: str) -> Optional[str]:
+    """Nome do pacote no pubspec.yaml (ex: tagbean)."""
+    pubspec = os.path.join(project_path, 'pubspec.yaml')
+    try:
+        with open(pubspec, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                match = re.match(r'^name:\s*(\S+)', line)
+                if match:
+                    return match.group(1)
+    except OSError:
+        pass
+    return None
+
+
+def graph_path(path: str) -> str:
+    """Caminho relativo com '/' - chave usada no grafo."""
+    return os.path.normpath(path).replace('\\', '/')
+
+
+def parse_combinators(rest: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Optional[str]]:
+    """`as p show A, B hide C` -> (show, hide, prefixo)."""
+    show: List[str] = []
+    hide: List[str] = []
+    prefix = None
+    mode = None
+    for token in re.findall(r'[\w$]+', rest):
+        if token in ('show', 'hide', 'as'):
+            mode = token
+        elif token == 'deferred':
+            mode = None
+        elif mode == 'show':
+            show.append(token)
+        elif mode == 'hide':
+            hide.append(token)
+        elif mode == 'as':
+            prefix = token
+            mode = None
+    return tuple(show), tuple(hide), prefix
+
+
+def parse_content(content: str) -> Tuple[List[Directive], List[str]]:
+    """Diretivas e tipos públicos declarados num arquivo."""
+    directives = [
+        Directive(kind, uri, *parse_combinators(rest))
+        for kind, uri, rest in DIRECTIVE_PATTERN.findall(content)
+    ]
+    declarations = [name for name in DECLARATION_PATTERN.findall(content)
+                    if not name.startswith('_') and name != 'on']
+    declarations += [name for name in TOP_LEVEL_PATTERN.findall(content)
+                     if name not in declarations and name not in ('get', 'set', 'operator')]
+    return directives, declarations
+
+
+def scan_file(project_path: str, file_path: str) -> Optional[FileEntry]:
+    """Lê e parseia um arquivo (roda nos workers do scan)."""
+    full = os.path.join(project_path, file_path)
+    try:
+        stat = os.stat(full)
+        with open(full, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    directives, declarations = parse_content(data.decode('utf-8', errors='replace'))
+    return FileEntry(hashlib.sha1(data).hexdigest(), stat.st_mtime_ns, stat.st_size,
+                     directives, declarations)
+
+
+def _scan_task(args: Tuple[str, str]) -> Tuple[str, Optional[FileEntry]]:
+    project_path, file_path = args
+    return file_path, scan_file(project_path, file_path)
+
+
+class ImportGraph:
+    """Arestas import/export/part entre arquivos .dart (caminhos relativos ao projeto)."""
+
+    def __init__(self, project_path: str = '.', package: Optional[str] = None,
+                 roots: Iterable[str] = DEFAULT_ROOTS):
+        self.project_path = os.path.abspath(project_path)
+        self.package = package or read_package_name(self.project_path)
+        self.roots = tuple(roots)
+        self.files: Dict[str, FileEntry] = {}
+        # arquivo -> tipo de diretiva -> arquivos alvo
+        self.edges: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        # arquivo -> tipo de diretiva -> arquivos que apontam para ele
+        self.reverse: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        # símbolo -> arquivos que o declaram
+        self.declared_in: Dict[str, Set[str]] = defaultdict(set)
+        # nome do arquivo (app_colors.dart) -> caminhos
+        self.by_name: Dict[str, Set[str]] = defaultdict(set)
+        # raiz -> símbolo -> imports que o expõem (ver symbol_index); refeito quando o grafo muda
+        self._symbols: Dict[str, Dict[str, List[str]]] = {}
+
+    # ==================== CONSTRUÇÃO ====================
+
+    def dart_files(self) -> Dict[str, os.stat_result]:
+        """Arquivos .dart das raízes -> stat."""
+        found = {}
+        for root in self.roots:
+            base = os.path.join(self.project_path, root)
+            for dirpath, _, filenames in os.walk(base):
+                for name in filenames:
+                    if name.endswith('.dart'):
+                        path = os.path.join(dirpath, name)
+                        found[graph_path(os.path.relpath(path, self.project_path))] = os.stat(path)
+        return found
+
+    def scan(self, jobs: Optional[int] = None) -> 'ImportGraph':
+        """Lê as diretivas de todos os .dart das raízes (jobs > 1: em paralelo)."""
+        self.refresh(jobs=jobs)
+        return self
+
+    def refresh(self, jobs: Optional[int] = None) -> Set[str]:
+        """
+        Relê só o que mudou desde o último scan/load: arquivos novos, com
+        mtime/tamanho diferentes (e hash diferente) ou removidos.
+        Retorna os arquivos que mudaram.
+        """
+        current = self.dart_files()
+        changed: Set[str] = set()
+        for file_path in set(self.files) - set(current):
+            self.remove_file(file_path)
+            changed.add(file_path)
+
+        pending = [
+            file_path for file_path, stat in current.items()
+            if file_path not in self.files
+            or (self.files[file_path].mtime, self.files[file_path].size) != (stat.st_mtime_ns, stat.st_size)
+        ]
+        for file_path, entry in self._scan_files(pending, jobs):
+            previous = self.files.get(file_path)
+            if previous and entry and previous.hash == entry.hash:
+                # Só o mtime mudou
+                previous.mtime, previous.size = entry.mtime, entry.size
+                continue
+            self.remove_file(file_path)
+            if entry:
+                self._link(file_path, entry)
+            changed.add(file_path)
+        return changed
+
+    def _scan_files(self, files: List[str], jobs: Optional[int]) -> Iterable[Tuple[str, Optional[FileEntry]]]:
+        jobs = jobs or os.cpu_count() or 1
+        tasks = [(self.project_path, file_path) for file_path in sorted(files)]
+        if jobs <= 1 or len(tasks) < 64:
+            return [_scan_task(task) for task in tasks]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(_scan_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+
+    def add_file(self, file_path: str):
+        """(Re)lê as diretivas de um arquivo."""
+        self.remove_file(file_path)
+        entry = scan_file(self.project_path, file_path)
+        if entry:
+            self._link(file_path, entry)
+
+    def _link(self, file_path: str, entry: FileEntry):
+        self._symbols.clear()
+        self.files[file_path] = entry
+        self.by_name[os.path.basename(file_path)].add(file_path)
+        for symbol in entry.declarations:
+            self.declared_in[symbol].add(file_path)
+        for directive in entry.directives:
+            target = self.resolve(directive.uri, file_path)
+            if target:
+                self.edges[file_path][directive.kind].add(target)
+                self.reverse[target][directive.kind].add(file_path)
+
+    def remove_file(self, file_path: str):
+        self._symbols.clear()
+        entry = self.files.pop(file_path, None)
+        if entry:
+            self.by_name[os.path.basename(file_path)].discard(file_path)
+            for symbol in entry.declarations:
+                self.declared_in[symbol].discard(file_path)
+        for kind, targets in self.edges.pop(file_path, {}).items():
+            for target in targets:
+                self.reverse[target][kind].discard(file_path)
+
+    def resolve(self, uri: str, from_file: str) -> Optional[str]:
+        """URI da diretiva -> caminho no projeto (None para dart:/pacotes externos)."""
+        if uri.startswith('dart:'):
+            return None
+        if uri.startswith('package:'):
+            package, _, rest = uri[len('package:'):].partition('/')
+            if package != self.package:
+                return None
+            return graph_path(os.path.join('lib', rest))
+        return graph_path(os.path.join(os.path.dirname(from_file), uri))
+
+    def package_uri(self, file_path: str) -> Optional[str]:
+        """lib/x/y.dart -> package:<pacote>/x/y.dart (None fora de lib/)."""
+        file_path = graph_path(file_path)
+        if not self.package or not file_path.startswith('lib/'):
+            return None
+        return f"package:{self.package}/{file_path[len('lib/'):]}"
+
+    # ==================== PERSISTÊNCIA ====================
+
+    def save(self, path: Optional[str] = None):
+        path = path or os.path.join(self.project_path, CACHE_FILE)
+        data = {
+            'version': CACHE_VERSION,
+            'package': self.package,
+            'roots': list(self.roots),
+            'files': {
+                file_path: {
+                    'hash': entry.hash,
+                    'mtime': entry.mtime,
+                    'size': entry.size,
+                    'directives': [list(d) for d in entry.directives],
+                    'declarations': entry.declarations,
+                }
+                for file_path, entry in sorted(self.files.items())
+            },
+        }
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, project_path: str = '.', path: Optional[str] = None,
+             roots: Iterable[str] = DEFAULT_ROOTS, jobs: Optional[int] = None) -> 'ImportGraph':
+        """
+        Grafo salvo em disco, atualizado com o que mudou desde então (e
+        salvo de novo se algo mudou). Sem arquivo salvo equivale a scan().
+        """
+        graph = cls(project_path, roots=roots)
+        path = path or os.path.join(graph.project_path, CACHE_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if (data.get('version') == CACHE_VERSION and data.get('package') == graph.package
+                and tuple(data.get('roots', ())) == graph.roots):
+            for file_path, raw in data['files'].items():
+                graph._link(file_path, FileEntry(
+                    raw['hash'], raw['mtime'], raw['size'],
+                    [Directive(kind, uri, tuple(show), tuple(hide), prefix)
+                     for kind, uri, show, hide, prefix in raw['directives']],
+                    raw['declarations'],
+                ))
+        else:
+            data = {}
+        if graph.refresh(jobs=jobs) or not data:
+            try:
+                graph.save(path)
+            except OSError:
+                pass
+        return graph
+
+    # ==================== CONSULTAS ====================
+
+    def imports_of(self, file_path: str) -> Set[str]:
+        """Arquivos que `file_path` referencia diretamente."""
+        return set().union(*self.edges.get(graph_path(file_path), {}).values())
+
+    def direct_importers(self, file_path: str) -> Set[str]:
+        """
+        Arquivos que referenciam `file_path` diretamente.
+
+        Barrels (export) e bibliotecas (part) são atravessados: quem importa
+        o barrel enxerga o arquivo exportado como se o importasse.
+        """
+        found: Set[str] = set()
+        pending = [graph_path(file_path)]
+        seen = set(pending)
+        while pending:
+            current = pending.pop()
+            for kind, sources in self.reverse.get(current, {}).items():
+                for source in sources:
+                    found.add(source)
+                    if kind in TRANSPARENT_KINDS and source not in seen:
+                        seen.add(source)
+                        pending.append(source)
+        return found
+
+    def affected_files(self, file_paths: Iterable[str]) -> Set[str]:
+        """Arquivos alterados + importadores diretos (o que precisa reanalisar)."""
+        affected: Set[str] = set()
+        for file_path in file_paths:
+            affected.add(graph_path(file_path))
+            affected |= self.direct_importers(file_path)
+        return affected
+
+    def library_of(self, file_path: str) -> str:
+        """Biblioteca dona do arquivo (o próprio arquivo, ou quem o tem como `part`)."""
+        file_path = graph_path(file_path)
+        owners = self.reverse.get(file_path, {}).get('part')
+        return min(owners) if owners else file_path
+
+    def barrels(self) -> Dict[str, Set[str]]:
+        """Arquivos com `export` -> tudo que reexportam (transitivo)."""
+        return {
+            file_path: self.exported_files(file_path)
+            for file_path, kinds in self.edges.items()
+            if kinds.get('export')
+        }
+
+    def exported_files(self, barrel: str) -> Set[str]:
+        """Arquivos reexportados por `barrel`, direta ou indiretamente."""
+        found: Set[str] = set()
+        pending = [graph_path(barrel)]
+        while pending:
+            for target in self.edges.get(pending.pop(), {}).get('export', ()):
+                if target not in found:
+                    found.add(target)
+                    pending.append(target)
+        return found
+
+    def providers_of(self, symbol: str) -> Set[str]:
+        """
+        Arquivos cujo import dá acesso a `symbol`: a biblioteca que o declara
+        e todos os barrels que a reexportam (respeitando show/hide).
+        """
+        found: Set[str] = set()
+        pending = [self.library_of(f) for f in self.declared_in.get(symbol, ())]
+        found.update(pending)
+        while pending:
+            current = pending.pop()
+            for source in self.reverse.get(current, {}).get('export', ()):
+                if source in found:
+                    continue
+                entry = self.files.get(source)
+                directives = [d for d in entry.directives if d.kind == 'export'
+                              and self.resolve(d.uri, source) == current] if entry else []
+                if any(d.exposes(symbol) for d in directives):
+                    found.add(source)
+                    pending.append(source)
+        return found
+
+    def barrels_providing(self, symbol: str) -> List[str]:
+        """Barrels que exportam `symbol`, do mais amplo (mais arquivos) ao mais específico."""
+        declared = {self.library_of(f) for f in self.declared_in.get(symbol, ())}
+        barrels = self.providers_of(symbol) - declared
+        return sorted(barrels, key=lambda b: (-len(self.exported_files(b)), b))
+
+    def symbol_index(self, root: str = 'lib') -> Dict[str, List[str]]:
+        """
+        Símbolo de topo (tipo, função, variável) declarado em `root` -> arquivos
+        de `root` cujo import o expõe, do mais barato ao mais caro: a própria
+        biblioteca primeiro, depois os barrels pelo número de arquivos que
+        reexportam. Calculado uma vez por raiz; consultas são um lookup.
+        """
+        prefix = root.rstrip('/') + '/'
+        index = self._symbols.get(prefix)
+        if index is None:
+            sizes: Dict[str, int] = {}
+
+            def cost(file_path: str) -> Tuple[int, str]:
+                if file_path not in sizes:
+                    sizes[file_path] = len(self.exported_files(file_path))
+                return sizes[file_path], file_path
+
+            index = self._symbols[prefix] = {}
+            for symbol, declared in self.declared_in.items():
+                if not any(f.startswith(prefix) for f in declared):
+                    continue
+                providers = [p for p in self.providers_of(symbol) if p.startswith(prefix)]
+                index[symbol] = sorted(providers, key=cost)
+        return index
+
+    def declaring_libraries(self, symbol: str, root: str = 'lib') -> Set[str]:
+        """Bibliotecas de `root` que declaram `symbol` (mais de uma = nome ambíguo)."""
+        prefix = root.rstrip('/') + '/'
+        return {self.library_of(f) for f in self.declared_in.get(symbol, ()) if f.startswith(prefix)}
+
+    def files_named(self, name: str, root: Optional[str] = None) -> Set[str]:
+        """Arquivos com esse nome (ex: app_colors.dart), opcionalmente só sob `root`."""
+        files = self.by_name.get(name, set())
+        if root:
+            files = {f for f in files if f.startswith(root.rstrip('/') + '/')}
+        return set(files)
+
+    def replacement_candidates(self, uri: str, from_file: str) -> Set[str]:
+        """
+        Para um import que não existe: arquivos com o mesmo nome ou, sem
+        nenhum, a biblioteca que declara o tipo com o nome do arquivo
+        (app_colors.dart -> AppColors). Sempre na raiz do alvo: lib/ nunca
+        é consertado para um arquivo de test/.
+        """
+        target = self.resolve(uri, graph_path(from_file))
+        if not target or target in self.files:
+            return set()
+        name = os.path.basename(target)
+        root = target.split('/', 1)[0]
+        candidates = self.files_named(name, root=root)
+        if not candidates:
+            symbol = ''.join(part.capitalize() for part in name[:-len('.dart')].split('_'))
+            candidates = {self.library_of(f) for f in self.declared_in.get(symbol, ())
+                          if f.startswith(root + '/')}
+        return candidates
+
+    def missing_targets(self) -> Dict[str, Set[str]]:
+        """Alvos de diretivas que não existem no projeto -> quem aponta para eles."""
+        return {
+            target: set().union(*kinds.values())
+            for target, kinds in self.reverse.items()
+            if target not in self.files and any(kinds.values())
+            and target.split('/', 1)[0] in self.roots
+        }
+
+    def external_packages(self, root: str = 'lib') -> Set[str]:
+        """Pacotes (package:x) usados pelos arquivos de `root` que não são o próprio projeto."""
+        packages = set()
+        for file_path, entry in self.files.items():
+            if not file_path.startswith(root + '/'):
+                continue
+            for directive in entry.directives:
+                if directive.uri.startswith('package:'):
+                    package = directive.uri[len('package:'):].split('/', 1)[0]
+                    if package != self.package:
+                        packages.add(package)
+        return packages
+
+    def cycles(self) -> List[List[str]]:
+        """Ciclos de import/export (componentes fortemente conexos, Tarjan iterativo)."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        result: List[List[str]] = []
+        counter = 0
+
+        def successors(node: str) -> List[str]:
+            kinds = self.edges.get(node, {})
+            return sorted((kinds.get('import', set()) | kinds.get('export', set())) & self.files.keys())
+
+        for start in sorted(self.files):
+            if start in index:
+                continue
+            work = [(start, iter(successors(start)))]
+            index[start] = low[start] = counter
+            counter += 1
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(successors(child))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in successors(node):
+                        result.append(sorted(component))
+        return sorted(result, key=lambda c: (-len(c), c))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Consulta o grafo de imports do projeto Dart')
+    parser.add_argument('--project-path', default='.', help='Raiz do projeto (default: .)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Processos para o scan (default: núcleos da CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Ignora e não grava o {CACHE_FILE}')
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('importers', 'Quem importa o arquivo'),
+                            ('imports', 'O que o arquivo importa'),
+                            ('affected', 'Arquivos + importadores diretos')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('files', nargs='+')
+    p = sub.add_parser('provides', help='Biblioteca e barrels que dão acesso ao símbolo')
+    p.add_argument('symbols', nargs='+')
+    sub.add_parser('barrels', help='Barrels e quantos arquivos reexportam')
+    sub.add_parser('cycles', help='Ciclos de import/export')
+    sub.add_parser('missing', help='Diretivas para arquivos que não existem')
+    args = parser.parse_args()
+
+    if args.no_cache:
+        graph = ImportGraph(args.project_path).scan(jobs=args.jobs or None)
+    else:
+        graph = ImportGraph.load(args.project_path, jobs=args.jobs or None)
+
+    if args.command == 'provides':
+        for symbol in args.symbols:
+            declared = sorted(graph.declared_in.get(symbol, ()))
+            print(f"{symbol}: declarado em {', '.join(declared) or '(não encontrado)'}")
+            for barrel in graph.barrels_providing(symbol):
+                print(f"  {graph.package_uri(barrel) or barrel}")
+        return
+    if args.command == 'barrels':
+        for barrel, exported in sorted(graph.barrels().items(), key=lambda item: -len(item[1])):
+            print(f"{len(exported):5d}  {barrel}")
+        return
+    if args.command == 'cycles':
+        cycles = graph.cycles()
+        for cycle in cycles:
+            print(f"[{len(cycle)}] " + ' -> '.join(cycle))
+        print(f"\n{len(cycles)} ciclos")
+        return
+    if args.command == 'missing':
+        missing = graph.missing_targets()
+        for target, sources in sorted(missing.items()):
+            print(f"{target}  <- {', '.join(sorted(sources))}")
+        print(f"\n{len(missing)} alvos inexistentes")
+        return
+
+    if args.command == 'affected':
+        result: List[str] = sorted(graph.affected_files(args.files))
+    else:
+        result = []
+        for file_path in args.files:
+            found = graph.direct_importers(file_path) if args.command == 'importers' \
+                else graph.imports_of(file_path)
+            result.extend(sorted(found))
+    for file_path in result:
+        print(file_path)
+    print(f"\n{len(result)} arquivos")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Armazenamento persistente (SQLite) dos issues de vários snapshots do analyzer.
+
+Cada arquivo analyze_*.txt é parseado uma única vez pelo AnalyzerParser e
+gravado com um id de snapshot. Perguntas como "top regras do snapshot X" ou
+"redução desde 2879" viram consultas indexadas em vez de re-parse do texto.
+
+Uso:
+    python issue_store.py ingest analyze_v3.txt analyze_clean.txt
+    python issue_store.py ingest analyze_*.txt full_analyze*.txt --jobs 8
+    python issue_store.py ingest analyze_machine.txt --format machine --project-path .
+    python issue_store.py trend
+    python issue_store.py snapshots
+    python issue_store.py top-rules analyze_v3 -n 15
+    python issue_store.py files analyze_clean --exclude design_system --exclude theme --min 4
+    python issue_store.py dirs analyze_v3
+    python issue_store.py reduction analyze_v3 --baseline 2879
+    python issue_store.py reduction analyze_v3 --since analyze_v2
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+from fix_flutter_issues import (
+    AnalyzerParser, DartIssue, IssueTable, open_analyzer_output, normalize_path, directory_key
+)
+
+DEFAULT_DB = 'flutter_issues.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    source TEXT,
+    created_at TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS issues (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE,
+    issue_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    message TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_issues_rule ON issues(snapshot_id, rule);
+CREATE INDEX IF NOT EXISTS idx_issues_file ON issues(snapshot_id, file_path);
+CREATE INDEX IF NOT EXISTS idx_issues_directory ON issues(snapshot_id, directory);
+CREATE INDEX IF NOT EXISTS idx_issues_severity ON issues(snapshot_id, severity);
+"""
+
+
+def parse_snapshot(file_path: str, output_format: str = 'auto',
+                   project_root: Optional[str] = None) -> IssueTable:
+    """
+    Parseia um arquivo de snapshot para uma IssueTable (roda nos workers).
+
+    Com `project_root`, caminhos absolutos (formatos machine/json) viram
+    relativos ao projeto, como no formato texto.
+    """
+    parser = AnalyzerParser(output_format, project_root=project_root)
+    with open_analyzer_output(file_path) as f:
+        return IssueTable(parser.parse_stream(f, keep=False))
+
+
+def parse_snapshots(files: List[str], jobs: Optional[int] = None,
+                    output_format: str = 'auto',
+                    project_root: Optional[str] = None) -> List[Tuple[str, IssueTable]]:
+    """
+    Parseia vários snapshots em paralelo (um processo por arquivo).
+    
+    Retorna (arquivo, tabela) na mesma ordem de `files`, independente de
+    qual worker terminou primeiro. Com jobs=1 ou um único arquivo roda no
+    próprio processo.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, len(files))
+    if jobs <= 1:
+        return [(f, parse_snapshot(f, output_format, project_root)) for f in files]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        tables = executor.map(parse_snapshot, files, [output_format] * len(files),
+                              [project_root] * len(files))
+        return list(zip(files, tables))
+
+
+class IssueStore:
+    """Banco SQLite com issues de múltiplos snapshots do analyzer."""
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ==================== INGESTÃO ====================
+
+    def ingest_issues(self, name: str, issues: Iterable[DartIssue],
+                      source: Optional[str] = None) -> int:
+        """Grava issues como snapshot `name` (substitui se já existir)."""
+        with self.conn:
+            self.conn.execute('DELETE FROM snapshots WHERE name = ?', (name,))
+            cursor = self.conn.execute(
+                'INSERT INTO snapshots (name, source, created_at) VALUES (?, ?, ?)',
+                (name, source, datetime.now().isoformat())
+            )
+            snapshot_id = cursor.lastrowid
+
+            rows = (
+                (snapshot_id, issue.issue_type.value, issue.severity.name, issue.rule,
+                 normalize_path(issue.file_path), directory_key(issue.file_path),
+                 issue.line, issue.column, issue.message)
+                for issue in issues
+            )
+            self.conn.executemany(
+                'INSERT INTO issues (snapshot_id, issue_type, severity, rule, file_path, '
+                'directory, line, col, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+            total = self.conn.execute(
+                'SELECT COUNT(*) FROM issues WHERE snapshot_id = ?', (snapshot_id,)
+            ).fetchone()[0]
+            self.conn.execute('UPDATE snapshots SET total = ? WHERE id = ?', (total, snapshot_id))
+        return total
+
+    def ingest_file(self, file_path: str, name: Optional[str] = None,
+                    output_format: str = 'auto', project_root: Optional[str] = None) -> int:
+        """Parseia um arquivo de output do analyzer em streaming e grava."""
+        parser = AnalyzerParser(output_format, project_root=project_root)
+        with open_analyzer_output(file_path) as f:
+            return self.ingest_issues(name or Path(file_path).stem,
+                                      parser.parse_stream(f, keep=False),
+                                      source=file_path)
+
+    def ingest_files(self, files: List[str], jobs: Optional[int] = None,
+                     output_format: str = 'auto',
+                     project_root: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Importa vários arquivos: parse em paralelo, gravação serial.
+
+        O SQLite tem um único escritor, então só o parse vai para os workers;
+        as tabelas voltam na ordem dos arquivos e são gravadas nessa ordem,
+        o que mantém os ids de snapshot estáveis entre execuções.
+        """
+        return [
+            (file_path, self.ingest_issues(Path(file_path).stem, table, source=file_path))
+            for file_path, table in parse_snapshots(files, jobs, output_format, project_root)
+        ]
+
+    # ==================== CONSULTAS ====================
+
+    def _snapshot_id(self, name: str) -> int:
+        row = self.conn.execute('SELECT id FROM snapshots WHERE name = ?', (name,)).fetchone()
+        if not row:
+            raise KeyError(f"Snapshot não encontrado: {name}")
+        return row[0]
+
+    def snapshots(self) -> List[Tuple[str, int, str, str]]:
+        """Lista (nome, total, origem, data) em ordem de ingestão."""
+        return self.conn.execute(
+            'SELECT name, total, source, created_at FROM snapshots ORDER BY id'
+        ).fetchall()
+
+    def total(self, name: str) -> int:
+        row = self.conn.execute('SELECT total FROM snapshots WHERE name = ?', (name,)).fetchone()
+        if not row:
+            raise KeyError(f"Snapshot não encontrado: {name}")
+        return row[0]
+
+    def count_by_type(self, name: str) -> dict:
+        """Contagem por tipo (error/warning/info)."""
+        return dict(self.conn.execute(
+            'SELECT issue_type, COUNT(*) FROM issues WHERE snapshot_id = ? GROUP BY issue_type',
+            (self._snapshot_id(name),)
+        ).fetchall())
+
+    def top_rules(self, name: str, limit: int = 15) -> List[Tuple[str, int]]:
+        return self.conn.execute(
+            'SELECT rule, COUNT(*) AS n FROM issues WHERE snapshot_id = ? '
+            'GROUP BY rule ORDER BY n DESC, rule LIMIT ?',
+            (self._snapshot_id(name), limit)
+        ).fetchall()
+
+    def top_directories(self, name: str, limit: int = 10) -> List[Tuple[str, int]]:
+        return self.conn.execute(
+            'SELECT directory, COUNT(*) AS n FROM issues WHERE snapshot_id = ? '
+            'GROUP BY directory ORDER BY n DESC, directory LIMIT ?',
+            (self._snapshot_id(name), limit)
+        ).fetchall()
+
+    def files(self, name: str, min_issues: int = 1, exclude: Iterable[str] = (),
+              prefix: Optional[str] = None, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Arquivos com pelo menos `min_issues` issues.
+
+        `prefix` filtra por início do caminho (ex: 'lib/features/') usando faixa
+        no índice; `exclude` remove caminhos que contenham os trechos dados.
+        """
+        sql = 'SELECT file_path, COUNT(*) AS n FROM issues WHERE snapshot_id = ?'
+        params: list = [self._snapshot_id(name)]
+        if prefix:
+            # Faixa [prefix, prefix + U+FFFF) usa o índice (snapshot_id, file_path)
+            sql += ' AND file_path >= ? AND file_path < ?'
+            params += [prefix, prefix + '\uffff']
+        for part in exclude:
+            sql += " AND instr(file_path, ?) = 0"
+            params.append(part)
+        sql += ' GROUP BY file_path HAVING n >= ? ORDER BY n DESC, file_path'
+        params.append(min_issues)
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+    def reduction(self, name: str, baseline: Optional[int] = None,
+                  since: Optional[str] = None) -> Tuple[int, int, int]:
+        """Retorna (referência, atual, redução) contra um número ou outro snapshot."""
+        current = self.total(name)
+        reference = self.total(since) if since else baseline
+        if reference is None:
+            raise ValueError("Informe baseline ou since")
+        return reference, current, reference - current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Consulta issues do analyzer em SQLite')
+    parser.add_argument('--db', default=DEFAULT_DB, help=f'Arquivo do banco (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_ingest = sub.add_parser('ingest', help='Importa arquivos de output do analyzer')
+    p_ingest.add_argument('files', nargs='+')
+    p_ingest.add_argument('--name', help='Nome do snapshot (apenas com um arquivo)')
+    p_ingest.add_argument('--format', choices=AnalyzerParser.OUTPUT_FORMATS, default='auto')
+    p_ingest.add_argument('--project-path', default='.',
+                          help='Raiz do projeto: caminhos absolutos (machine/json) '
+                               'são gravados relativos a ela (default: .)')
+    p_ingest.add_argument('--jobs', '-j', type=int, default=0,
+                          help='Processos para o parse (default: núcleos da CPU)')
+
+    sub.add_parser('snapshots', help='Lista snapshots importados')
+    sub.add_parser('trend', help='Evolução do total de issues por snapshot')
+
+    p_rules = sub.add_parser('top-rules', help='Regras mais frequentes')
+    p_rules.add_argument('snapshot')
+    p_rules.add_argument('-n', type=int, default=15)
+
+    p_dirs = sub.add_parser('dirs', help='Diretórios com mais issues')
+    p_dirs.add_argument('snapshot')
+    p_dirs.add_argument('-n', type=int, default=10)
+
+    p_files = sub.add_parser('files', help='Arquivos com mais issues')
+    p_files.add_argument('snapshot')
+    p_files.add_argument('--min', type=int, default=1, help='Mínimo de issues por arquivo')
+    p_files.add_argument('--exclude', action='append', default=[], help='Ignora caminhos com este trecho')
+    p_files.add_argument('--prefix', help='Apenas caminhos que começam com (ex: lib/features/)')
+    p_files.add_argument('-n', type=int, help='Limite de linhas')
+
+    p_red = sub.add_parser('reduction', help='Redução de issues')
+    p_red.add_argument('snapshot')
+    group = p_red.add_mutually_exclusive_group(required=True)
+    group.add_argument('--baseline', type=int, help='Contagem de referência (ex: 2879)')
+    group.add_argument('--since', help='Snapshot de referência')
+
+    args = parser.parse_args()
+
+    with IssueStore(args.db) as store:
+        try:
+            if args.command == 'ingest':
+                if args.name and len(args.files) > 1:
+                    parser.error('--name só pode ser usado com um arquivo')
+                if args.name:
+                    total = store.ingest_file(args.files[0], args.name, args.format,
+                                              args.project_path)
+                    print(f"{args.files[0]}: {total} issues")
+                else:
+                    for file_path, total in store.ingest_files(args.files, args.jobs or None,
+                                                               args.format, args.project_path):
+                        print(f"{file_path}: {total} issues")
+
+            elif args.command == 'snapshots':
+                for name, total, source, created_at in store.snapshots():
+                    print(f"{name:30s} {total:6d}  {created_at[:19]}  {source or ''}")
+
+            elif args.command == 'trend':
+                rows = store.snapshots()
+                peak = max((total for _, total, _, _ in rows), default=0) or 1
+                previous = None
+                for name, total, _, _ in rows:
+                    delta = f"{total - previous:+6d}" if previous is not None else ' ' * 6
+                    print(f"{name:30s} {total:6d} {delta}  {'#' * round(total / peak * 40)}")
+                    previous = total
+
+            elif args.command == 'top-rules':
+                for rule, count in store.top_rules(args.snapshot, args.n):
+                    print(f"{count:5d} - {rule}")
+
+            elif args.command == 'dirs':
+                total = store.total(args.snapshot)
+                for directory, count in store.top_directories(args.snapshot, args.n):
+                    print(f"[{count:4d}] {count / total * 100:5.1f}% - {directory}")
+
+            elif args.command == 'files':
+                for file_path, count in store.files(args.snapshot, args.min, args.exclude,
+                                                    args.prefix, args.n):
+                    print(f"{count:4d} issues - {file_path}")
+
+            elif args.command == 'reduction':
+                reference, current, diff = store.reduction(args.snapshot, args.baseline, args.since)
+                pct = diff / reference * 100 if reference else 0
+                print(f"Redução desde {reference}: {diff} ({pct:.1f}%) - atual: {current}")
+
+        except KeyError as e:
+            print(e.args[0], file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,8 @@
 import os
 import re
 
+from dart_lexer import spans_for
+
 def create_safe_char_mapping():
     """Apenas caracteres corrompidos - 100% seguro"""
     return {
@@ -61,29 +63,13 @@ def create_safe_word_mapping():
         'Versoes': 'Versões'
     }
 
-def is_in_safe_context(line, match_start):
-    """Verifica se está em string ou comentário"""
-    line_before_match = line[:match_start]
-    
-    # String com aspas simples
-    single_quotes = line_before_match.count("'") - line_before_match.count("\\'")
-    if single_quotes % 2 == 1:
-        return True
-    
-    # String com aspas duplas  
-    double_quotes = line_before_match.count('"') - line_before_match.count('\\"')
-    if double_quotes % 2 == 1:
-        return True
-    
-    # Comentário de linha
-    if '//' in line_before_match:
-        return True
-    
-    # Comentário de documentação
-    if line.strip().startswith('///'):
-        return True
-    
-    return False
+def is_in_safe_context(table, offset, end=None):
+    """Verifica se está em string ou comentário (pela tabela do dart_lexer)"""
+    return table.is_text(offset, end)
+
+def mapping_pattern(mapping):
+    """Uma regex com todas as chaves (mais longas primeiro)"""
+    return re.compile('|'.join(re.escape(k) for k in sorted(mapping, key=len, reverse=True)))
 
 def is_dangerous_word_context(word, line):
     """Verifica se a palavra está em contexto perigoso"""
@@ -112,67 +98,34 @@ def apply_safe_fixes(file_path):
     except Exception as e:
         return False, f"Erro ao ler arquivo: {e}"
     
-    lines = content.split('\n')
-    modified_lines = []
     changes_made = 0
-    
-    char_mapping = create_safe_char_mapping()
-    word_mapping = create_safe_word_mapping()
-    
-    for line in lines:
-        modified_line = line
-        
-        # 1. Aplicar correções de caracteres (sempre seguras)
-        for old_char, new_char in char_mapping.items():
-            if old_char in modified_line:
-                start = 0
-                temp_line = modified_line
-                
-                while True:
-                    pos = temp_line.find(old_char, start)
-                    if pos == -1:
-                        break
-                    
-                    # Verifica contexto seguro
-                    if is_in_safe_context(line, pos):
-                        temp_line = temp_line[:pos] + new_char + temp_line[pos + len(old_char):]
-                        changes_made += 1
-                        start = pos + len(new_char)
-                    else:
-                        start = pos + 1
-                
-                modified_line = temp_line
-        
-        # 2. Aplicar correções de palavras (só em contexto seguro)
-        for old_word, new_word in word_mapping.items():
-            if old_word in modified_line:
-                start = 0
-                temp_line = modified_line
-                
-                while True:
-                    pos = temp_line.find(old_word, start)
-                    if pos == -1:
-                        break
-                    
-                    # Verifica se está em contexto seguro E não é perigoso
-                    if (is_in_safe_context(line, pos) and 
-                        not is_dangerous_word_context(old_word, line)):
-                        temp_line = temp_line[:pos] + new_word + temp_line[pos + len(old_word):]
-                        changes_made += 1
-                        start = pos + len(new_word)
-                    else:
-                        start = pos + 1
-                
-                modified_line = temp_line
-        
-        modified_lines.append(modified_line)
+    original = content
+    
+    # 1. Caracteres corrompidos (sempre seguros)
+    # 2. Palavras (só em contexto seguro E não perigoso)
+    for mapping, check_word in ((create_safe_char_mapping(), False),
+                                (create_safe_word_mapping(), True)):
+        table = spans_for(content)
+        pieces = []
+        last = 0
+        for match in mapping_pattern(mapping).finditer(content):
+            pos, end = match.span()
+            if not is_in_safe_context(table, pos, end):
+                continue
+            if check_word and is_dangerous_word_context(match.group(), table.line_text(pos)):
+                continue
+            pieces.append(content[last:pos])
+            pieces.append(mapping[match.group()])
+            last = end
+            changes_made += 1
+        pieces.append(content[last:])
+        content = ''.join(pieces)
     
     # Salva apenas se houve mudanças
-    if changes_made > 0:
-        new_content = '\n'.join(modified_lines)
+    if changes_made > 0 and content != original:
         try:
             with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                f.write(new_content)
+                f.write(content)
             return True, f"{changes_made} correções aplicadas"
         except Exception as e:
             return False, f"Erro ao salvar: {e}"
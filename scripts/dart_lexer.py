@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tokenizador Dart mínimo: classifica cada posição do arquivo em código,
+string, interpolação ou comentário.
+
+Uma passada linear gera a tabela de spans do arquivo (cacheada pelo hash do
+conteúdo); consultas por posição são O(log n). Trata o que a contagem de
+aspas por linha não pega: strings multi-linha (''' e \"\"\"), raw strings
+(r'...'), escapes, interpolação ${...} (com strings aninhadas) e $nome,
+comentários de bloco aninhados e doc comments (/// e /** */).
+
+Uso (nos scripts de encoding/palavras):
+    from dart_lexer import spans_for, is_text_kind
+    table = spans_for(content)
+    if is_text_kind(table.kind_at(offset)):
+        ...  # dentro de string ou comentário: seguro para trocar texto
+
+    python dart_lexer.py lib/main.dart  # imprime os spans
+"""
+
+import re
+import sys
+import hashlib
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Iterator, List, Tuple
+
+# Tipos de span
+CODE = 'code'
+STRING = 'string'
+INTERPOLATION = 'interpolation'
+LINE_COMMENT = 'line_comment'
+BLOCK_COMMENT = 'block_comment'
+DOC_COMMENT = 'doc_comment'
+
+# Onde trocar texto não muda o programa (interpolação é código)
+TEXT_KINDS = (STRING, LINE_COMMENT, BLOCK_COMMENT, DOC_COMMENT)
+COMMENT_KINDS = (LINE_COMMENT, BLOCK_COMMENT, DOC_COMMENT)
+
+# Código: início de comentário, string (com prefixo r opcional) ou chave
+CODE_TOKEN = re.compile(r"""//|/\*|r?(?:'''|\"\"\"|'|")|[{}]""")
+IDENT_CHAR = re.compile(r'[A-Za-z0-9_$]')
+BLOCK_TOKEN = re.compile(r'/\*|\*/')
+SIMPLE_INTERPOLATION = re.compile(r'\$[A-Za-z_][A-Za-z0-9_]*')
+
+# Fim/escape/interpolação de string, por (aspas, raw)
+_STRING_TOKENS = {}
+for _quote in ("'", '"', "'''", '"""'):
+    _end = re.escape(_quote) if len(_quote) == 3 else re.escape(_quote) + '|\n'
+    _STRING_TOKENS[(_quote, True)] = re.compile(_end)
+    _STRING_TOKENS[(_quote, False)] = re.compile(r'\\.|\\$|\$\{|\$[A-Za-z_]|' + _end, re.DOTALL)
+
+
+class SpanTable:
+    """
+    Spans contíguos do arquivo: `starts[i]` é o início do span i e
+    `kinds[i]` o seu tipo (o span vai até `starts[i + 1]`).
+    """
+
+    def __init__(self, text: str, starts: List[int], kinds: List[str]):
+        self.text = text
+        self.starts = starts
+        self.kinds = kinds
+        self.line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def index_at(self, offset: int) -> int:
+        return max(bisect_right(self.starts, offset) - 1, 0)
+
+    def kind_at(self, offset: int) -> str:
+        """Tipo do span que contém `offset`."""
+        if not self.starts:
+            return CODE
+        return self.kinds[self.index_at(offset)]
+
+    def span_at(self, offset: int) -> Tuple[int, int, str]:
+        """(início, fim, tipo) do span que contém `offset`."""
+        index = self.index_at(offset)
+        end = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.text)
+        return self.starts[index], end, self.kinds[index]
+
+    def is_text(self, start: int, end: int = None) -> bool:
+        """True se [start, end) está inteiro dentro de um único span de texto."""
+        span_start, span_end, kind = self.span_at(start)
+        return kind in TEXT_KINDS and (end is None or end <= span_end)
+
+    def offset(self, line: int, column: int = 0) -> int:
+        """Offset de (linha, coluna), ambos a partir de 0."""
+        return self.line_starts[line] + column
+
+    def line_at(self, offset: int) -> int:
+        """Linha (a partir de 0) que contém `offset`."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def line_text(self, offset: int) -> str:
+        """Texto da linha que contém `offset`, sem o '\\n'."""
+        line = self.line_at(offset)
+        end = self.line_starts[line + 1] - 1 if line + 1 < len(self.line_starts) else len(self.text)
+        return self.text[self.line_starts[line]:end]
+
+    def spans(self) -> Iterator[Tuple[int, int, str]]:
+        """(início, fim, tipo) de todos os spans, em ordem."""
+        for index, start in enumerate(self.starts):
+            end = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.text)
+            yield start, end, self.kinds[index]
+
+
+def is_text_kind(kind: str) -> bool:
+    return kind in TEXT_KINDS
+
+
+class _Builder:
+    """Acumula transições de tipo, juntando spans vizinhos do mesmo tipo."""
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.kinds: List[str] = []
+
+    def mark(self, offset: int, kind: str):
+        if self.kinds and self.kinds[-1] == kind:
+            return
+        if self.starts and self.starts[-1] == offset:
+            # Span vazio: troca o tipo (e junta com o anterior se igual)
+            self.starts.pop()
+            self.kinds.pop()
+            if self.kinds and self.kinds[-1] == kind:
+                return
+        self.starts.append(offset)
+        self.kinds.append(kind)
+
+
+def tokenize(text: str) -> SpanTable:
+    """Gera a tabela de spans em uma passada."""
+    out = _Builder()
+    n = len(text)
+    pos = 0
+    # Profundidade de chaves de cada ${...} aberto (vazia = código de topo)
+    interpolations: List[int] = []
+    # Strings abertas por baixo de cada interpolação: (aspas, raw)
+    strings: List[Tuple[str, bool]] = []
+
+    def kind(base: str) -> str:
+        return INTERPOLATION if interpolations else base
+
+    out.mark(0, CODE)
+    while pos < n:
+        if len(strings) > len(interpolations):
+            # Dentro de string
+            quote, raw = strings[-1]
+            match = _STRING_TOKENS[(quote, raw)].search(text, pos)
+            if not match:
+                pos = n
+                break
+            token = match.group()
+            if token.startswith('\\'):
+                pos = match.end()
+            elif token == '${':
+                out.mark(match.start(), INTERPOLATION)
+                interpolations.append(0)
+                pos = match.end()
+            elif token.startswith('$'):
+                ident = SIMPLE_INTERPOLATION.match(text, match.start())
+                out.mark(ident.start(), INTERPOLATION)
+                out.mark(ident.end(), kind(STRING))
+                pos = ident.end()
+            else:
+                # Fecha a string (ou linha acabou numa string simples sem fechar)
+                strings.pop()
+                pos = match.end()
+                out.mark(pos, kind(CODE))
+            continue
+
+        match = CODE_TOKEN.search(text, pos)
+        if not match:
+            break
+        token = match.group()
+        start = match.start()
+        if token == '{':
+            if interpolations:
+                interpolations[-1] += 1
+            pos = match.end()
+        elif token == '}':
+            pos = match.end()
+            if interpolations:
+                if interpolations[-1] == 0:
+                    interpolations.pop()
+                    out.mark(pos, kind(STRING))
+                else:
+                    interpolations[-1] -= 1
+        elif token == '//':
+            end = text.find('\n', start)
+            end = n if end == -1 else end
+            doc = text.startswith('///', start) and not text.startswith('////', start)
+            out.mark(start, kind(DOC_COMMENT if doc else LINE_COMMENT))
+            out.mark(end, kind(CODE))
+            pos = end
+        elif token == '/*':
+            # Comentários de bloco aninham em Dart
+            depth = 0
+            end = n
+            for block in BLOCK_TOKEN.finditer(text, start):
+                depth += 1 if block.group() == '/*' else -1
+                if depth == 0:
+                    end = block.end()
+                    break
+            doc = text.startswith('/**', start) and not text.startswith('/**/', start)
+            out.mark(start, kind(DOC_COMMENT if doc else BLOCK_COMMENT))
+            out.mark(end, kind(CODE))
+            pos = end
+        else:
+            raw = token.startswith('r')
+            if raw and start > 0 and IDENT_CHAR.match(text, start - 1):
+                # `r` é o fim de um identificador, não prefixo de raw string
+                raw = False
+                start += 1
+                token = token[1:]
+            out.mark(start, kind(STRING))
+            strings.append((token.lstrip('r'), raw))
+            pos = match.end()
+
+    return SpanTable(text, out.starts, out.kinds)
+
+
+# Cache por hash do conteúdo: reanalisar um arquivo igual não custa nada
+_CACHE: 'OrderedDict[str, SpanTable]' = OrderedDict()
+CACHE_SIZE = 256
+
+
+def spans_for(text: str) -> SpanTable:
+    """Tabela de spans de `text`, reaproveitada se o conteúdo já foi visto."""
+    key = hashlib.sha1(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+    table = _CACHE.get(key)
+    if table is None:
+        table = _CACHE[key] = tokenize(text)
+        if len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(key)
+    return table
+
+
+def main():
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            table = spans_for(f.read())
+        print(f"== {path} ({len(table)} spans)")
+        for start, end, kind in table.spans():
+            if kind != CODE:
+                line = table.line_at(start) + 1
+                print(f"{line:5d} {kind:14s} {table.text[start:end][:60]!r}")
+
+
+if __name__ == '__main__':
+    main()
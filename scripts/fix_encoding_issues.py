@@ -15,6 +15,8 @@ REGRAS DE CORRECAO:
 - Exemplo: " informacao'" -> " informação'"
 - NAO corrige: "informacaoDoSistema" (variavel camelCase)
 - NAO corrige: "numero.valor" (acesso a propriedade)
+- So corrige dentro de strings e comentarios (spans do dart_lexer.py),
+  nunca em codigo ou interpolacao ${...}
 ============================================================================
 """
 
@@ -26,6 +28,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 
+from dart_lexer import SpanTable, spans_for
+
 # Configuracoes
 SEARCH_PATH = r"D:\tagbean\frontend\lib"
 OUTPUT_FILE = r"D:\tagbean\frontend\RELATORIO_CORRECOES.md"
@@ -109,6 +113,10 @@ CORRECTIONS = {
     'â€¦': '…',
 }
 
+CORRECTIONS_PATTERN = re.compile(
+    '|'.join(re.escape(k) for k in sorted(CORRECTIONS, key=len, reverse=True))
+)
+
 # Caracteres que indicam que a palavra e texto (nao variavel)
 # Antes da palavra corrompida
 VALID_BEFORE = [
@@ -186,77 +194,50 @@ class EncodingFixer:
         
         return valid_before and valid_after
     
-    def is_inside_string(self, content: str, pos: int) -> bool:
+    def is_inside_string(self, table: SpanTable, start_pos: int, end_pos: int) -> bool:
         """
-        Verifica se a posicao esta dentro de uma string literal
-        Isso ajuda a identificar textos de UI
+        Verifica se o trecho esta dentro de uma string literal ou comentario
+        Consulta a tabela de spans do arquivo (dart_lexer) - O(log n)
         """
-        # Contar aspas antes da posicao
-        before = content[:pos]
-        
-        # Contar aspas simples nao escapadas
-        single_quotes = 0
-        i = 0
-        while i < len(before):
-            if before[i] == "'" and (i == 0 or before[i-1] != '\\'):
-                single_quotes += 1
-            i += 1
-        
-        # Contar aspas duplas nao escapadas
-        double_quotes = 0
-        i = 0
-        while i < len(before):
-            if before[i] == '"' and (i == 0 or before[i-1] != '\\'):
-                double_quotes += 1
-            i += 1
-        
-        # Se numero impar de aspas, estamos dentro de uma string
-        return (single_quotes % 2 == 1) or (double_quotes % 2 == 1)
+        return table.is_text(start_pos, end_pos)
     
-    def fix_line(self, line: str, line_number: int, file_path: str) -> Tuple[str, List[Dict]]:
+    def fix_line(self, line: str, line_number: int, file_path: str,
+                 table: Optional[SpanTable] = None, line_start: int = 0) -> Tuple[str, List[Dict]]:
         """
         Corrige uma linha, retornando a linha corrigida e lista de correcoes
+        Com a tabela de spans do arquivo, so corrige dentro de strings/comentarios
         """
         corrections = []
-        result = line
+        pieces = []
+        last = 0
         
-        for corrupted, correct in CORRECTIONS.items():
-            if corrupted not in result:
+        # Uma passada com todos os padroes (mais longos primeiro)
+        for match in CORRECTIONS_PATTERN.finditer(line):
+            pos, end_pos = match.span()
+            corrupted = match.group()
+            correct = CORRECTIONS[corrupted]
+            
+            # Verificar se esta em contexto de texto valido
+            in_text = table is None or self.is_inside_string(table, line_start + pos, line_start + end_pos)
+            if not (in_text and self.is_valid_text_context(line, pos, end_pos)):
+                # Pular - provavelmente e uma variavel
+                self.skipped_variables += 1
                 continue
             
-            # Encontrar todas as ocorrencias
-            start = 0
-            while True:
-                pos = result.find(corrupted, start)
-                if pos == -1:
-                    break
-                
-                end_pos = pos + len(corrupted)
-                
-                # Verificar se esta em contexto de texto valido
-                if self.is_valid_text_context(result, pos, end_pos):
-                    # Fazer a correcao
-                    old_text = result[max(0, pos-10):min(len(result), end_pos+10)]
-                    result = result[:pos] + correct + result[end_pos:]
-                    new_text = result[max(0, pos-10):min(len(result), pos+len(correct)+10)]
-                    
-                    corrections.append({
-                        'file': file_path,
-                        'line': line_number,
-                        'corrupted': corrupted,
-                        'correct': correct,
-                        'context_before': old_text,
-                        'context_after': new_text,
-                    })
-                    
-                    # Ajustar posicao para proxima busca
-                    start = pos + len(correct)
-                else:
-                    # Pular - provavelmente e uma variavel
-                    self.skipped_variables += 1
-                    start = end_pos
+            corrections.append({
+                'file': file_path,
+                'line': line_number,
+                'corrupted': corrupted,
+                'correct': correct,
+                'context_before': line[max(0, pos-10):end_pos+10],
+                'context_after': line[max(0, pos-10):pos] + correct + line[end_pos:end_pos+10],
+            })
+            pieces.append(line[last:pos])
+            pieces.append(correct)
+            last = end_pos
         
-        return result, corrections
+        pieces.append(line[last:])
+        return ''.join(pieces), corrections
     
     def fix_file(self, file_path: Path) -> bool:
         """
@@ -280,12 +261,13 @@ class EncodingFixer:
                 return False
             
             lines = content.split('\n')
+            table = spans_for(content)
             new_lines = []
             file_corrections = []
             modified = False
             
             for i, line in enumerate(lines, 1):
-                new_line, corrections = self.fix_line(line, i, str(file_path))
+                new_line, corrections = self.fix_line(line, i, str(file_path), table, table.offset(i - 1))
                 new_lines.append(new_line)
                 
                 if corrections:
@@ -15,6 +15,8 @@ import os
 import re
 from pathlib import Path
 
+from dart_lexer import spans_for
+
 SEARCH_PATH = r"D:\tagbean\frontend\lib"
 
 # Dicionário de palavras corrompidas -> palavras corretas
@@ -118,95 +120,37 @@ PALAVRAS = {
     'Ã´': 'ô',
 }
 
+# Todas as palavras numa regex só (palavras inteiras, mais longas primeiro)
+PADRAO_PALAVRAS = re.compile(
+    r'\b(?:' + '|'.join(re.escape(p) for p in sorted(PALAVRAS, key=len, reverse=True)) + r')\b'
+)
+
 def fix_content_safe(content):
     """
     Corrige o conteúdo de forma segura, alterando apenas:
-    - Texto dentro de aspas simples: 'texto'
-    - Texto dentro de aspas duplas: "texto"  
+    - Texto dentro de aspas simples/duplas/triplas (fora de ${...})
     - Comentários de linha: // comentário
     - Comentários de bloco: /* comentário */
     - Comentários de documentação: /// comentário
+    
+    O contexto de cada ocorrência vem da tabela de spans do dart_lexer.
     """
-    original_content = content
-    total_corrections = 0
+    table = spans_for(content)
+    pieces = []
+    last = 0
+    corrections_made = 0
     
-    for palavra_errada, palavra_correta in PALAVRAS.items():
-        if palavra_errada not in content:
+    for match in PADRAO_PALAVRAS.finditer(content):
+        start, end = match.span()
+        if not table.is_text(start, end):
             continue
-            
-        # ============================================
-        # 1. STRINGS COM ASPAS SIMPLES: 'texto'
-        # ============================================
-        def replace_in_single_quotes(match):
-            string_content = match.group(1)  # conteúdo entre as aspas
-            if palavra_errada in string_content:
-                # Substitui apenas palavras inteiras
-                new_content = re.sub(r'\b' + re.escape(palavra_errada) + r'\b', 
-                                   palavra_correta, string_content)
-                return f"'{new_content}'"
-            return match.group(0)
-        
-        content = re.sub(r"'([^']*)'", replace_in_single_quotes, content)
-        
-        # ============================================
-        # 2. STRINGS COM ASPAS DUPLAS: "texto"
-        # ============================================
-        def replace_in_double_quotes(match):
-            string_content = match.group(1)  # conteúdo entre as aspas
-            if palavra_errada in string_content:
-                # Substitui apenas palavras inteiras
-                new_content = re.sub(r'\b' + re.escape(palavra_errada) + r'\b', 
-                                   palavra_correta, string_content)
-                return f'"{new_content}"'
-            return match.group(0)
-        
-        content = re.sub(r'"([^"]*)"', replace_in_double_quotes, content)
-        
-        # ============================================
-        # 3. COMENTÁRIOS DE LINHA: // comentário
-        # ============================================
-        def replace_in_line_comment(match):
-            comment_content = match.group(1)  # conteúdo do comentário
-            if palavra_errada in comment_content:
-                new_content = re.sub(r'\b' + re.escape(palavra_errada) + r'\b', 
-                                   palavra_correta, comment_content)
-                return f'//{new_content}'
-            return match.group(0)
-        
-        content = re.sub(r'//(.*)$', replace_in_line_comment, content, flags=re.MULTILINE)
-        
-        # ============================================
-        # 4. COMENTÁRIOS DE DOCUMENTAÇÃO: /// comentário
-        # ============================================
-        def replace_in_doc_comment(match):
-            comment_content = match.group(1)  # conteúdo do comentário
-            if palavra_errada in comment_content:
-                new_content = re.sub(r'\b' + re.escape(palavra_errada) + r'\b', 
-                                   palavra_correta, comment_content)
-                return f'///{new_content}'
-            return match.group(0)
-        
-        content = re.sub(r'///(.*)$', replace_in_doc_comment, content, flags=re.MULTILINE)
-        
-        # ============================================
-        # 5. COMENTÁRIOS DE BLOCO: /* comentário */
-        # ============================================
-        def replace_in_block_comment(match):
-            comment_content = match.group(1)  # conteúdo do comentário
-            if palavra_errada in comment_content:
-                new_content = re.sub(r'\b' + re.escape(palavra_errada) + r'\b', 
-                                   palavra_correta, comment_content)
-                return f'/*{new_content}*/'
-            return match.group(0)
-        
-        content = re.sub(r'/\*(.*?)\*/', replace_in_block_comment, content, flags=re.DOTALL)
-    
-    # Contar correções feitas
-    corrections_made = len(original_content) - len(content) if original_content != content else 0
-    if original_content != content:
-        corrections_made = sum(1 for old, new in PALAVRAS.items() if old in original_content and new in content)
+        pieces.append(content[last:start])
+        pieces.append(PALAVRAS[match.group()])
+        last = end
+        corrections_made += 1
     
-    return content, corrections_made
+    pieces.append(content[last:])
+    return ''.join(pieces), corrections_made
 
 def fix_files():
     print("="*60)
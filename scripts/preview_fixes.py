@@ -5,6 +5,11 @@ import os
 import re
 import sys
 
+from dart_lexer import (
+    spans_for, is_text_kind, CODE, STRING, INTERPOLATION,
+    LINE_COMMENT, BLOCK_COMMENT, DOC_COMMENT
+)
+
 def create_mapping():
     """Cria mapeamento completo de correções de encoding"""
     return {
@@ -84,30 +89,19 @@ def create_mapping():
         'Versoes': 'Versões'
     }
 
-def is_in_safe_context(line, match_start):
+CONTEXT_LABELS = {
+    STRING: "string",
+    INTERPOLATION: "interpolação (CÓDIGO!)",
+    LINE_COMMENT: "comentário de linha",
+    BLOCK_COMMENT: "comentário de bloco",
+    DOC_COMMENT: "comentário de documentação",
+    CODE: "CÓDIGO (PERIGOSO!)",
+}
+
+def is_in_safe_context(table, offset):
     """Verifica se a mudança está em um contexto seguro (string ou comentário)"""
-    line_before_match = line[:match_start]
-    
-    # Verifica se está em string com aspas simples
-    single_quotes = line_before_match.count("'") - line_before_match.count("\\'")
-    if single_quotes % 2 == 1:
-        return True, "string (aspas simples)"
-    
-    # Verifica se está em string com aspas duplas  
-    double_quotes = line_before_match.count('"') - line_before_match.count('\\"')
-    if double_quotes % 2 == 1:
-        return True, "string (aspas duplas)"
-    
-    # Verifica se está em comentário de linha
-    if '//' in line_before_match:
-        return True, "comentário de linha"
-    
-    # Verifica se está em comentário de documentação
-    stripped = line.strip()
-    if stripped.startswith('///'):
-        return True, "comentário de documentação"
-    
-    return False, "CÓDIGO (PERIGOSO!)"
+    kind = table.kind_at(offset)
+    return is_text_kind(kind), CONTEXT_LABELS[kind]
 
 def preview_file_fixes(file_path, mapping):
     """Analisa um arquivo e mostra todas as mudanças que seriam feitas"""
@@ -118,8 +112,10 @@ def preview_file_fixes(file_path, mapping):
         return [], f"Erro ao ler arquivo: {e}"
     
     all_fixes = []
+    table = spans_for(''.join(lines))
     
     for line_num, line in enumerate(lines, 1):
+        line_start = table.offset(line_num - 1)
         for old_text, new_text in mapping.items():
             if old_text in line:
                 # Encontra todas as ocorrências na linha
@@ -129,7 +125,7 @@ def preview_file_fixes(file_path, mapping):
                     if pos == -1:
                         break
                     
-                    is_safe, context = is_in_safe_context(line, pos)
+                    is_safe, context = is_in_safe_context(table, line_start + pos)
                     
                     fix_info = {
                         'line_num': line_num,
@@ -6,6 +6,11 @@ import re
 import sys
 from datetime import datetime
 
+from dart_lexer import (
+    spans_for, is_text_kind, CODE, STRING, INTERPOLATION,
+    LINE_COMMENT, BLOCK_COMMENT, DOC_COMMENT
+)
+
 def create_mapping():
     """Cria mapeamento de correções básicas de encoding"""
     return {
@@ -74,30 +79,19 @@ def create_risky_words():
         'Ativacao': 'Ativação',     # Falta ç - real
     }
 
-def is_in_safe_context(line, match_start):
+CONTEXT_TYPES = {
+    STRING: "STRING",
+    INTERPOLATION: "INTERPOLACAO",
+    LINE_COMMENT: "COMENTARIO_LINHA",
+    BLOCK_COMMENT: "COMENTARIO_BLOCO",
+    DOC_COMMENT: "COMENTARIO_DOC",
+    CODE: "CODIGO",
+}
+
+def is_in_safe_context(table, offset):
     """Verifica se a mudança está em um contexto seguro"""
-    line_before_match = line[:match_start]
-    
-    # Verifica se está em string com aspas simples
-    single_quotes = line_before_match.count("'") - line_before_match.count("\\'")
-    if single_quotes % 2 == 1:
-        return True, "STRING_SIMPLES"
-    
-    # Verifica se está em string com aspas duplas  
-    double_quotes = line_before_match.count('"') - line_before_match.count('\\"')
-    if double_quotes % 2 == 1:
-        return True, "STRING_DUPLAS"
-    
-    # Verifica se está em comentário de linha
-    if '//' in line_before_match:
-        return True, "COMENTARIO_LINHA"
-    
-    # Verifica se está em comentário de documentação
-    stripped = line.strip()
-    if stripped.startswith('///'):
-        return True, "COMENTARIO_DOC"
-    
-    return False, "CODIGO"
+    kind = table.kind_at(offset)
+    return is_text_kind(kind), CONTEXT_TYPES[kind]
 
 def analyze_line_safety(word, line_content):
     """Analisa se uma palavra na linha é perigosa"""
@@ -154,8 +148,11 @@ def analyze_file_detailed(file_path):
     char_mapping = create_mapping()
     word_mapping = create_risky_words()
     
+    table = spans_for(''.join(lines))
+    
     for line_num, line in enumerate(lines, 1):
         line_clean = line.rstrip('\n\r')
+        line_start = table.offset(line_num - 1)
         
         # 1. Analisa caracteres corrompidos
         for old_char, new_char in char_mapping.items():
@@ -166,7 +163,7 @@ def analyze_file_detailed(file_path):
                     if pos == -1:
                         break
                     
-                    is_safe, context = is_in_safe_context(line_clean, pos)
+                    is_safe, context = is_in_safe_context(table, line_start + pos)
                     if is_safe:
                         fix_entry = {
                             'line_num': line_num,
@@ -189,7 +186,7 @@ def analyze_file_detailed(file_path):
                     if pos == -1:
                         break
                     
-                    is_safe_context, context = is_in_safe_context(line_clean, pos)
+                    is_safe_context, context = is_in_safe_context(table, line_start + pos)
                     
                     if is_safe_context:
                         safety_analysis = analyze_line_safety(old_word, line_clean)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Análise do lib/ em shards concorrentes (asyncio).
+
+Divide o lib/ em features/*, modules/*, core, shared, design_system, app e
+os arquivos soltos, roda um analyzer por shard com no máximo --jobs
+processos ao mesmo tempo e parseia o output de cada um conforme chega.
+Os issues são juntados na ordem dos shards, sem duplicatas, e salvos no
+formato texto do `flutter analyze` (serve de --analyze-file para o
+fix_flutter_issues.py). O relatório traz o tempo de cada shard.
+
+Uso:
+    python sharded_analysis.py --project-path . --jobs 8
+    python sharded_analysis.py --format machine -o analyze_sharded.txt
+    python fix_flutter_issues.py --analyze-file analyze_sharded.txt
+"""
+
+import os
+import sys
+import json
+import codecs
+import time
+import asyncio
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from fix_flutter_issues import (
+    AnalyzerParser, DartIssue, default_flutter_executable, normalize_path
+)
+
+# Diretórios cujos filhos viram shards próprios
+SPLIT_DIRS = ('features', 'modules')
+
+# Bytes por leitura do stdout do analyzer
+READ_CHUNK = 65536
+
+
+@dataclass
+class Shard:
+    name: str
+    # Caminhos relativos ao projeto passados ao analyzer
+    paths: List[str]
+
+
+@dataclass
+class ShardResult:
+    shard: Shard
+    issues: List[DartIssue] = field(default_factory=list)
+    seconds: float = 0.0
+    returncode: Optional[int] = None
+    error: Optional[str] = None
+
+
+def discover_shards(project_path: str, target: str = 'lib') -> List[Shard]:
+    """
+    Shards em ordem fixa: cada subdiretório de features/ e modules/, depois
+    os outros diretórios do target e por fim os arquivos .dart soltos.
+    """
+    base = os.path.join(project_path, target)
+    shards: List[Shard] = []
+    loose: List[str] = []
+
+    for entry in sorted(os.listdir(base)):
+        rel = f"{target}/{entry}"
+        full = os.path.join(base, entry)
+        if os.path.isdir(full) and entry in SPLIT_DIRS:
+            for child in sorted(os.listdir(full)):
+                child_rel = f"{rel}/{child}"
+                if os.path.isdir(os.path.join(full, child)):
+                    shards.append(Shard(child_rel[len(target) + 1:], [child_rel]))
+                elif child.endswith('.dart'):
+                    loose.append(child_rel)
+        elif os.path.isdir(full):
+            shards.append(Shard(entry, [rel]))
+        elif entry.endswith('.dart'):
+            loose.append(rel)
+
+    if loose:
+        shards.append(Shard('(arquivos soltos)', loose))
+    return shards
+
+
+def analyzer_command(executable: Optional[str] = None, output_format: str = 'auto') -> List[str]:
+    """Comando do analyzer sem alvo (os caminhos do shard vão no fim)."""
+    if output_format in ('machine', 'json'):
+        return ['dart', 'analyze', f'--format={output_format}']
+    return [executable or default_flutter_executable(), 'analyze', '--no-pub']
+
+
+async def analyze_shard(shard: Shard, command: List[str], project_path: str,
+                        output_format: str, semaphore: asyncio.Semaphore,
+                        timeout: float) -> ShardResult:
+    """Roda o analyzer num shard, parseando cada linha assim que chega."""
+    result = ShardResult(shard)
+    async with semaphore:
+        start = time.perf_counter()
+        parser = AnalyzerParser(output_format, project_root=project_path)
+        parser.begin()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command, *shard.paths,
+                cwd=project_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT
+            )
+        except OSError as e:
+            result.error = str(e)
+            result.seconds = time.perf_counter() - start
+            return result
+
+        async def consume():
+            # Leitura em blocos: `--format json` sai numa linha só, maior que o
+            # limite de linha do StreamReader (64 KiB). As linhas são remontadas aqui.
+            # Só o bloco novo é dividido; o início da linha aberta fica em
+            # pedaços e é juntado uma vez, quando o '\n' chega
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            partial: List[str] = []
+            while True:
+                chunk = await process.stdout.read(READ_CHUNK)
+                text = decoder.decode(chunk, final=not chunk)
+                if '\n' in text:
+                    first, *lines = text.split('\n')
+                    partial.append(first)
+                    parser.feed(''.join(partial))
+                    for line in lines[:-1]:
+                        parser.feed(line)
+                    partial = [lines[-1]]
+                elif text:
+                    partial.append(text)
+                if not chunk:
+                    break
+            if any(partial):
+                parser.feed(''.join(partial))
+            return await process.wait()
+
+        try:
+            result.returncode = await asyncio.wait_for(consume(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            result.error = f"timeout após {timeout:g}s"
+        except Exception as e:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            result.error = str(e)
+        try:
+            parser.finish()
+        except Exception as e:
+            result.error = result.error or f"output inválido: {e}"
+        result.issues = parser.issues
+        result.seconds = time.perf_counter() - start
+    return result
+
+
+async def run_shards(shards: List[Shard], command: List[str], project_path: str,
+                     output_format: str = 'auto', jobs: Optional[int] = None,
+                     timeout: float = 600) -> List[ShardResult]:
+    """Todos os shards com no máximo `jobs` analyzers simultâneos; resultado na ordem dos shards."""
+    semaphore = asyncio.Semaphore(jobs or os.cpu_count() or 1)
+    return list(await asyncio.gather(*(
+        analyze_shard(shard, command, project_path, output_format, semaphore, timeout)
+        for shard in shards
+    )))
+
+
+def merge_results(results: List[ShardResult]) -> Tuple[List[DartIssue], int]:
+    """
+    Junta os issues na ordem dos shards sem duplicatas.
+
+    O mesmo diagnóstico pode vir de dois shards quando um arquivo é
+    alcançado pelos dois (imports entre shards). Retorna (issues, duplicados).
+    """
+    seen: Set[tuple] = set()
+    merged: List[DartIssue] = []
+    duplicates = 0
+    for result in results:
+        for issue in result.issues:
+            key = (normalize_path(issue.file_path), issue.line, issue.column,
+                   issue.rule, issue.message)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            merged.append(issue)
+    return merged, duplicates
+
+
+def print_report(results: List[ShardResult], merged: List[DartIssue],
+                 duplicates: int, wall: float):
+    print(f"\n{'shard':35s} {'issues':>7s} {'tempo':>9s}")
+    print("-" * 55)
+    for result in sorted(results, key=lambda r: -r.seconds):
+        status = f"  [!] {result.error}" if result.error else ''
+        print(f"{result.shard.name:35s} {len(result.issues):7d} {result.seconds:8.2f}s{status}")
+    serial = sum(r.seconds for r in results)
+    print("-" * 55)
+    print(f"{'TOTAL':35s} {len(merged):7d} {wall:8.2f}s")
+    print(f"\nDuplicados removidos: {duplicates}")
+    print(f"Soma dos shards: {serial:.2f}s (paralelismo efetivo {serial / wall if wall else 0:.1f}x)")
+
+
+def save_report(path: str, results: List[ShardResult], merged: List[DartIssue],
+                duplicates: int, wall: float):
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'total_issues': len(merged),
+        'duplicates_removed': duplicates,
+        'wall_seconds': round(wall, 3),
+        'shards': [
+            {
+                'name': r.shard.name,
+                'paths': r.shard.paths,
+                'issues': len(r.issues),
+                'seconds': round(r.seconds, 3),
+                'returncode': r.returncode,
+                'error': r.error,
+            }
+            for r in results
+        ],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Análise do lib/ em shards concorrentes')
+    parser.add_argument('--project-path', default='.', help='Raiz do projeto (default: .)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Analyzers simultâneos (default: núcleos da CPU)')
+    parser.add_argument('--format', choices=AnalyzerParser.OUTPUT_FORMATS, default='auto',
+                        help='machine/json usam `dart analyze --format=...`')
+    parser.add_argument('--flutter-path', help='Executável do flutter (formato texto)')
+    parser.add_argument('--timeout', type=float, default=600, help='Timeout por shard em segundos')
+    parser.add_argument('-o', '--output', default='analyze_sharded.txt',
+                        help='Issues juntados, formato texto (default: analyze_sharded.txt)')
+    parser.add_argument('--report', default='relatorio_shards.json',
+                        help='Relatório com tempo por shard (default: relatorio_shards.json)')
+    args = parser.parse_args()
+
+    project_path = os.path.abspath(args.project_path)
+    shards = discover_shards(project_path)
+    command = analyzer_command(args.flutter_path, args.format)
+    print(f"{len(shards)} shards, até {args.jobs or os.cpu_count()} em paralelo: {' '.join(command)}")
+
+    start = time.perf_counter()
+    results = asyncio.run(run_shards(shards, command, project_path, args.format,
+                                     args.jobs or None, args.timeout))
+    wall = time.perf_counter() - start
+    merged, duplicates = merge_results(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        for issue in merged:
+            f.write(issue.raw_line + '\n')
+        f.write(f"\n{len(merged)} issues found.\n")
+    save_report(args.report, results, merged, duplicates, wall)
+
+    print_report(results, merged, duplicates, wall)
+    print(f"\nIssues salvos em {args.output}; relatório em {args.report}")
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
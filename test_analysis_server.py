@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Exercita o AnalysisServerClient contra o servidor falso (sem SDK do Flutter):
+# a análise inicial deve trazer o analyze_v2.txt e um lote de notify_changed
+# deve avançar para o analyze_v3.txt. Rodar da raiz do projeto (direto ou
+# com pytest).
+import logging
+import os
+import sys
+import tempfile
+from collections import Counter
+
+from fix_flutter_issues import AnalysisServerClient, AnalyzerParser, normalize_path
+
+
+def keys(issues):
+    return Counter((normalize_path(i.file_path), i.line, i.column, i.rule) for i in issues)
+
+
+def test_analysis_server_replays_snapshots():
+    # O log do fix_flutter_issues vai para um arquivo temporário, não para o
+    # flutter_fix. log versionado
+    root = logging.getLogger()
+    file_handlers = [h for h in root.handlers if isinstance(h, logging.FileHandler)]
+    fd, log_path = tempfile.mkstemp(suffix='.log')
+    os.close(fd)
+    temp_handler = logging.FileHandler(log_path, encoding='utf-8')
+    for handler in file_handlers:
+        root.removeHandler(handler)
+    root.addHandler(temp_handler)
+    try:
+        expected_v2 = AnalyzerParser().parse_file('analyze_v2.txt')
+        expected_v3 = AnalyzerParser().parse_file('analyze_v3.txt')
+        print(f"Gravados: analyze_v2 {len(expected_v2)} issues, analyze_v3 {len(expected_v3)} issues")
+
+        command = [sys.executable, 'fake_analysis_server.py', 'analyze_v2.txt', 'analyze_v3.txt']
+        with AnalysisServerClient('.', command, timeout=60) as client:
+            initial = client.analyze()
+            print(f"Análise inicial: {len(initial)} issues")
+            assert keys(initial) == keys(expected_v2), "análise inicial difere do analyze_v2.txt"
+
+            # Um lote de arquivos alterados = uma rodada de correções no servidor falso
+            changed = sorted({normalize_path(i.file_path) for i in expected_v2})[:20]
+            client.notify_changed(changed)
+            after = client.diagnostics()
+            print(f"Após notify_changed ({len(changed)} arquivos): {len(after)} issues")
+            assert keys(after) == keys(expected_v3), "diagnósticos após notify_changed diferem do analyze_v3.txt"
+    finally:
+        root.removeHandler(temp_handler)
+        temp_handler.close()
+        os.remove(log_path)
+        for handler in file_handlers:
+            root.addHandler(handler)
+
+
+if __name__ == '__main__':
+    test_analysis_server_replays_snapshots()
+    print("OK")
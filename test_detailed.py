@@ -2,6 +2,8 @@
 import re
 from pathlib import Path
 
+from fix_flutter_issues import read_analyzer_output
+
 # Lê o arquivo
 with open('analyze_with_deps.txt', 'r', encoding='utf-8') as f:
     content = f.read()
@@ -24,20 +26,8 @@ class DummyAnalyzer:
         self.pattern = r'^\s*(error|warning|info)\s+-\s+(.+?)\s+-\s+(.+?):(\d+):(\d+)\s+-\s+(\w+)'
     
     def parse_file(self, file_path):
-        # Copiar exatamente do script
-        encodings = ['utf-16', 'utf-16-le', 'utf-8', 'cp1252', 'latin-1']
-        content = None
-        for enc in encodings:
-            try:
-                with open(file_path, 'r', encoding=enc) as f:
-                    content = f.read()
-                if '\x00' not in content:
-                    break
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-        if content is None:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+        # Mesma leitura do script (encoding detectado pelos bytes iniciais)
+        content = read_analyzer_output(file_path)
         
         # Agora vê o tamanho do conteúdo
         print(f"Conteúdo lido com sucesso: {len(content)} caracteres")